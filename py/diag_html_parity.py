@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+diag_html_parity.py
+Diagnostic: run the static-page parsers with both HTML backends (lxml fast
+path and BeautifulSoup) over saved or live pages, check the outputs are
+identical, and time each backend.
+
+Kinds:
+  rtspt        rtspt results page                 (parse_rtspt_page)
+  leone        Leone compiled results page        (parse_leone_compiled)
+  leone-meet   Leone meet page, compiled link     (find_leone_compiled_link)
+  fr-splits    FlashResults section splits page   (parse_fr_splits_page)
+  fr-compiled  FlashResults compiled event page   (parse_fr_compiled_page)
+  logos        any page, <img> logo scan          (extract_logos)
+
+Usage:
+  python3 diag_html_parity.py --kind fr-splits data/pages/026-1-01.htm
+  python3 diag_html_parity.py --kind rtspt --url "https://www.rtspt.com/events/mw/2026-Indoor/..."
+  python3 diag_html_parity.py --kind leone --repeat 20 pages/*.htm
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+
+from pace_html import BACKENDS
+
+PAGE_URL = "https://example.invalid/page.htm"
+
+
+def parser_for(kind: str, url: str) -> Callable[[str, Any], Any]:
+    import pace_scraper as ps
+
+    return {
+        "rtspt": lambda html, h: ps.parse_rtspt_page(html, h),
+        "leone": lambda html, h: ps.parse_leone_compiled(html, h),
+        "leone-meet": lambda html, h: ps.find_leone_compiled_link(html, url, h),
+        "fr-splits": lambda html, h: ps.parse_fr_splits_page(html, h),
+        "fr-compiled": lambda html, h: ps.parse_fr_compiled_page(html, url, h),
+        "logos": lambda html, h: ps.extract_logos(html, "", "", h),
+    }[kind]
+
+
+def load_pages(args: argparse.Namespace) -> List[Tuple[str, str]]:
+    pages = []
+    for path in args.files:
+        p = pathlib.Path(path)
+        pages.append((str(p), p.read_text(encoding="utf-8", errors="replace")))
+    for url in args.url or []:
+        import requests
+        r = requests.get(url, timeout=30)
+        r.raise_for_status()
+        pages.append((url, r.text))
+    return pages
+
+
+def run(kind: str, pages: List[Tuple[str, str]], repeat: int) -> bool:
+    ok = True
+    totals: Dict[str, float] = {name: 0.0 for name in BACKENDS}
+    for label, html in pages:
+        fn = parser_for(kind, label if "://" in label else PAGE_URL)
+        outputs = {}
+        for name, backend in BACKENDS.items():
+            started = time.perf_counter()
+            for _ in range(repeat):
+                out = fn(html, backend)
+            elapsed = (time.perf_counter() - started) / repeat
+            totals[name] += elapsed
+            outputs[name] = json.dumps(out, sort_keys=True, ensure_ascii=False)
+        same = len(set(outputs.values())) == 1
+        ok = ok and same
+        print(f"[{'OK' if same else 'DIFF'}] {label} ({len(html) // 1024} KiB)")
+        if not same:
+            a, b = outputs["lxml"], outputs["bs4"]
+            at = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+            print(f"       lxml: ...{a[max(0, at - 80):at + 80]}")
+            print(f"       bs4:  ...{b[max(0, at - 80):at + 80]}")
+    print()
+    for name, secs in totals.items():
+        print(f"{name:<5} {secs * 1000:9.2f} ms per pass over {len(pages)} page(s)")
+    if totals["lxml"] > 0:
+        print(f"speedup {totals['bs4'] / totals['lxml']:.1f}x")
+    return ok
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare lxml and BeautifulSoup parser backends")
+    ap.add_argument("--kind", required=True,
+                    choices=["rtspt", "leone", "leone-meet", "fr-splits", "fr-compiled", "logos"])
+    ap.add_argument("--url", action="append", help="Fetch a live page (repeatable)")
+    ap.add_argument("--repeat", type=int, default=5, help="Parses per page per backend for timing")
+    ap.add_argument("files", nargs="*", help="Saved HTML pages")
+    args = ap.parse_args()
+
+    pages = load_pages(args)
+    if not pages:
+        ap.error("give saved pages and/or --url")
+    sys.exit(0 if run(args.kind, pages, max(1, args.repeat)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+pace_archive.py
+Optional raw response archive for the scraper, with offline replay.
+
+When PACE_ARCHIVE points at a directory, every response a provider capture
+reads is stored there before it is parsed: static pages (FlashResults, rtspt,
+Leone, logo SVGs), pttiming RTDB JSON, and every request of a Playwright page
+routed through apply_resource_policy (documents, scripts, intercepted XHRs).
+
+  <dir>/objects/ab/abcdef....gz   gzipped body, named by sha256 of the raw body
+  <dir>/index.jsonl               one WARC-like record per response
+
+Identical bodies (JS bundles, unchanged result pages) are stored once. With
+PACE_ARCHIVE_MODE=replay the same fetch points are served from the archive
+instead of the network, newest record per request winning; a request with no
+record raises ArchiveMiss (plain HTTP) or is aborted (browser). Streaming
+channels (Firestore listen, used by milesplit_live) are never archived, so
+milesplit captures cannot be replayed.
+
+With PACE_REPLAY_SERVER set to a pace_replay.py server URL, the same fetch
+points are sent to that local server instead (which serves an archive over
+HTTP with configurable latency), so scrape throughput can be benchmarked
+with real sockets and no network.
+
+All three variables are inherited by subprocesses, like PACE_TIMING_LOG.
+
+Index line: {"ts", "key", "method", "url", "status", "headers", "sha256",
+             "size", "provider", "capture"}
+
+Usage:
+  python pace_scraper.py --url "..." --archive data/_archive                  # record
+  python pace_scraper.py --url "..." --archive data/_archive --replay --outdir data_replay
+  python pace_archive.py data/_archive stats
+  python pace_archive.py data/_archive rescrape --outdir data_replay          # re-parse all offline
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import pathlib
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+
+import pace_hosts
+from pace_providers import classify_url
+
+ENV_DIR = "PACE_ARCHIVE"
+ENV_MODE = "PACE_ARCHIVE_MODE"
+ENV_SERVER = "PACE_REPLAY_SERVER"
+
+# Set by the replay server on every response: "hit" or "miss"
+ARCHIVE_HEADER = "X-Pace-Archive"
+
+INDEX_FILE = "index.jsonl"
+
+# Response headers that describe the wire transfer, not the stored body
+DROP_HEADERS = frozenset(["content-encoding", "content-length", "transfer-encoding", "connection"])
+
+# Long-lived streaming requests that cannot be fetched whole
+ARCHIVE_SKIP = ("/Listen/channel",)
+
+
+class ArchiveMiss(LookupError):
+    """Replay mode and no archived response for the request."""
+
+
+def request_key(url: str, method: str = "GET", post_data: Optional[bytes] = None) -> str:
+    key = f"{method.upper()} {url.split('#', 1)[0]}"
+    if post_data:
+        key += f" body={hashlib.sha256(post_data).hexdigest()[:16]}"
+    return key
+
+
+class Archive:
+    """Content-addressed response store. Safe to share across threads."""
+
+    def __init__(self, root: pathlib.Path, replay: bool = False):
+        self.root = pathlib.Path(root)
+        self.replay = replay
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _object_path(self, sha: str) -> pathlib.Path:
+        return self.root / "objects" / sha[:2] / f"{sha}.gz"
+
+    def put(self, url: str, body: bytes, status: int = 200, headers: Optional[Dict[str, str]] = None,
+            method: str = "GET", post_data: Optional[bytes] = None) -> str:
+        """Store one response; returns the body's sha256."""
+        sha = hashlib.sha256(body).hexdigest()
+        path = self._object_path(sha)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with gzip.open(tmp, "wb", compresslevel=6) as f:
+                f.write(body)
+            tmp.replace(path)
+        rec = {
+            "ts": time.time(),
+            "key": request_key(url, method, post_data),
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": {k.lower(): v for k, v in (headers or {}).items() if k.lower() not in DROP_HEADERS},
+            "sha256": sha,
+            "size": len(body),
+            "provider": classify_url(_capture) if _capture else "",
+            "capture": _capture,
+        }
+        line = json.dumps(rec, ensure_ascii=False) + "\n"
+        with self._lock:
+            with open(self.root / INDEX_FILE, "a", encoding="utf-8") as f:
+                f.write(line)
+            if self._index is not None:
+                self._index[rec["key"]] = rec
+        return sha
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        try:
+            f = open(self.root / INDEX_FILE, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def captures(self, providers: Optional[List[str]] = None) -> List[str]:
+        """Distinct capture targets in recording order (space-separated URLs for meet captures)."""
+        seen: List[str] = []
+        for r in self.records():
+            c = r.get("capture")
+            if c and c not in seen and (not providers or r.get("provider") in providers):
+                seen.append(c)
+        return seen
+
+    def lookup(self, url: str, method: str = "GET",
+               post_data: Optional[bytes] = None) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """Newest archived (status, headers, body) for a request, or None."""
+        with self._lock:
+            if self._index is None:
+                self._index = {rec["key"]: rec for rec in self.records()}
+            rec = self._index.get(request_key(url, method, post_data))
+        if rec is None:
+            return None
+        with gzip.open(self._object_path(rec["sha256"]), "rb") as f:
+            return rec["status"], rec["headers"], f.read()
+
+
+# ---------------- process-wide switch ----------------
+
+_archives: Dict[Tuple[str, bool], Archive] = {}
+_archives_lock = threading.Lock()
+_capture = ""
+
+
+def enable(path: pathlib.Path, replay: bool = False) -> None:
+    """Turn archiving (or replay) on for this process and any subprocess it starts."""
+    path.mkdir(parents=True, exist_ok=True)
+    os.environ[ENV_DIR] = str(path.resolve())
+    os.environ[ENV_MODE] = "replay" if replay else "record"
+
+
+def current() -> Optional[Archive]:
+    root = os.environ.get(ENV_DIR)
+    if not root:
+        return None
+    replay = os.environ.get(ENV_MODE, "record") == "replay"
+    with _archives_lock:
+        arc = _archives.get((root, replay))
+        if arc is None:
+            arc = _archives[(root, replay)] = Archive(pathlib.Path(root), replay)
+        return arc
+
+
+def replay_server() -> Optional[str]:
+    return os.environ.get(ENV_SERVER) or None
+
+
+def use_replay_server(base_url: str) -> None:
+    """Send every fetch point to a pace_replay.py server (this process and its subprocesses)."""
+    os.environ[ENV_SERVER] = base_url.rstrip("/")
+
+
+def server_url(server: str, url: str, method: str = "GET") -> str:
+    return f"{server}/fetch?{urlencode({'url': url, 'method': method.upper()})}"
+
+
+def set_capture(urls: str) -> None:
+    """Tag following records with the scrape target(s) they belong to (space-separated URLs)."""
+    global _capture
+    _capture = urls
+
+
+# ---------------- fetch wrappers ----------------
+
+def http_get(url: str, timeout: float = 30, **kwargs: Any) -> Any:
+    """
+    requests.get through the archive: recorded when on, served from it in
+    replay. Live requests are paced per host (pace_hosts).
+    """
+    import requests
+
+    server = replay_server()
+    if server:
+        resp = requests.get(server_url(server, url), timeout=timeout)
+        if resp.headers.get(ARCHIVE_HEADER) == "miss":
+            raise ArchiveMiss(url)
+        resp.url = url
+        return resp
+    arc = current()
+    if arc is not None and arc.replay:
+        hit = arc.lookup(url)
+        if hit is None:
+            raise ArchiveMiss(url)
+        status, headers, body = hit
+        resp = requests.models.Response()
+        resp.status_code = status
+        resp.headers = requests.structures.CaseInsensitiveDict(headers)
+        resp._content = body
+        resp.url = url
+        resp.reason = ""
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        return resp
+    resp = pace_hosts.guarded(url, lambda: requests.get(url, timeout=timeout, **kwargs),
+                              lambda r: (r.status_code, r.headers))
+    if arc is not None:
+        arc.put(url, resp.content, resp.status_code, dict(resp.headers))
+    return resp
+
+
+def urlopen_bytes(req: Any, timeout: float = 30) -> bytes:
+    """urllib.request.urlopen(req).read() through the archive, paced like http_get."""
+    import urllib.error
+    import urllib.request
+
+    url = req.full_url if isinstance(req, urllib.request.Request) else req
+    server = replay_server()
+    if server:
+        try:
+            with urllib.request.urlopen(server_url(server, url), timeout=timeout) as resp:
+                return resp.read()
+        except urllib.error.HTTPError as e:
+            if e.headers.get(ARCHIVE_HEADER) == "miss":
+                raise ArchiveMiss(url) from None
+            raise
+    arc = current()
+    if arc is not None and arc.replay:
+        hit = arc.lookup(url)
+        if hit is None:
+            raise ArchiveMiss(url)
+        return hit[2]
+
+    def _open() -> Tuple[int, Dict[str, str], bytes]:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status, dict(resp.headers), resp.read()
+
+    status, headers, body = pace_hosts.guarded(url, _open, lambda r: (r[0], r[1]))
+    if arc is not None:
+        arc.put(url, body, status, headers)
+    return body
+
+
+async def route_request(route: Any, arc: Optional[Archive]) -> None:
+    """Serve one Playwright request from the replay server or archive, or fetch and archive it."""
+    req = route.request
+    post_data = req.post_data_buffer
+    server = replay_server()
+    if server:
+        try:
+            resp = await route.fetch(url=server_url(server, req.url, req.method))
+        except Exception:
+            await route.abort()
+            return
+        if resp.headers.get(ARCHIVE_HEADER.lower()) == "miss":
+            await route.abort()
+            return
+        await route.fulfill(response=resp)
+        return
+    if arc is None:
+        await route.continue_()
+        return
+    if arc.replay:
+        hit = arc.lookup(req.url, req.method, post_data)
+        if hit is None:
+            await route.abort()
+            return
+        status, headers, body = hit
+        await route.fulfill(status=status, headers=headers, body=body)
+        return
+    if any(s in req.url for s in ARCHIVE_SKIP):
+        await route.continue_()
+        return
+    try:
+        resp = await route.fetch()
+        body = await resp.body()
+    except Exception:
+        await route.abort()
+        return
+    arc.put(req.url, body, resp.status, resp.headers, req.method, post_data)
+    await route.fulfill(response=resp, body=body)
+
+
+# ---------------- CLI ----------------
+
+def print_stats(arc: Archive) -> None:
+    records = list(arc.records())
+    objects = {r["sha256"]: r["size"] for r in records}
+    on_disk = sum(p.stat().st_size for p in (arc.root / "objects").glob("*/*.gz"))
+    by_provider: Dict[str, List[Dict[str, Any]]] = {}
+    for r in records:
+        by_provider.setdefault(r.get("provider") or "-", []).append(r)
+
+    print(f"{len(records)} response(s), {len({r['key'] for r in records})} distinct request(s), "
+          f"{len({r['capture'] for r in records if r.get('capture')})} capture(s)")
+    raw = sum(objects.values())
+    print(f"{len(objects)} object(s): {raw / 1e6:.1f} MB raw, {on_disk / 1e6:.1f} MB on disk")
+    fmt = "{:<22} {:>9} {:>11}"
+    print()
+    print(fmt.format("PROVIDER", "RESPONSES", "MB"))
+    for provider, recs in sorted(by_provider.items()):
+        print(fmt.format(provider, len(recs), f"{sum(r['size'] for r in recs) / 1e6:.2f}"))
+
+
+def rescrape(arc: Archive, outdir: pathlib.Path, providers: Optional[List[str]] = None) -> int:
+    """Replay every archived capture through the current parsers into outdir."""
+    enable(arc.root, replay=True)
+    import pace_scraper
+
+    captures = arc.captures(providers)
+    failed = 0
+    for i, capture in enumerate(captures, 1):
+        print(f"[archive] replay {i}/{len(captures)}: {capture}")
+        try:
+            pace_scraper.scrape_urls(capture.split(), outdir, force=True)
+        except Exception as e:
+            failed += 1
+            print(f"[archive] replay failed: {type(e).__name__}: {e}")
+    print(f"[archive] replayed {len(captures) - failed}/{len(captures)} capture(s) into {outdir}")
+    return failed
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Raw response archive: stats and offline re-parse")
+    ap.add_argument("archive", help="Archive directory")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="Record/object counts and sizes per provider")
+    rs = sub.add_parser("rescrape", help="Re-run every archived capture offline")
+    rs.add_argument("--outdir", required=True, help="Where to write the re-parsed bundles")
+    rs.add_argument("--provider", action="append", help="Only captures of this provider (repeatable)")
+    args = ap.parse_args()
+
+    arc = Archive(pathlib.Path(args.archive))
+    if args.cmd == "stats":
+        print_stats(arc)
+    elif args.cmd == "rescrape":
+        outdir = pathlib.Path(args.outdir)
+        outdir.mkdir(parents=True, exist_ok=True)
+        sys.exit(1 if rescrape(arc, outdir, args.provider) else 0)
+
+
+if __name__ == "__main__":
+    main()
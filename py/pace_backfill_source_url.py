@@ -4,13 +4,14 @@ pace_backfill_source_url.py
 Reconstruct and backfill source_url for all existing events in Supabase.
 
 Strategy:
-  - legacy_spa events (numeric source_id): read py/data/{id}/ind_res_list.json,
-    extract _source.mi (meet_id), look up domain from known meet_id->domain map,
+  - legacy_spa events (numeric source_id): scan py/data/{id}/ind_res_list.json once,
+    extract _source.mi (meet_id), look up its host in pace_providers.KNOWN_MEET_HOSTS,
     reconstruct https://{domain}/meets/{meet_id}/events/{source_id}.
     Relay/DMR events lack mi — infer meet_id from event name (conference prefix).
   - trackscoreboard_html events (source_id like "458_12_final"):
-    parse meet_id + event_id + round, map to domain.
+    parse meet_id + event_id + round, map to host via the same registry.
   - XC events not in py/data/: skip with a warning.
+  - All URLs are collected in memory and applied as chunked upserts on id.
 
 Usage:
   python3 py/pace_backfill_source_url.py [--data-root py/data] [--dry-run]
@@ -22,11 +23,14 @@ import os
 import pathlib
 import re
 import sys
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from dotenv import load_dotenv
 from supabase import create_client
 
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+from pace_providers import known_meet_url
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL") or os.getenv("VITE_SUPABASE_URL")
@@ -38,21 +42,6 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 sb = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-# ── meet_id → (domain, protocol) ──────────────────────────────────────────────
-# Confirmed via _source.mi field in cached ind_res_list.json.
-MEET_ID_TO_DOMAIN: dict = {
-    60709: ("live.athletictiming.net",     "https"),  # GNAC
-    61469: ("snapresults.snaptiming.com",  "https"),  # CIAA
-    61289: ("live.dcracetiming.com",       "https"),  # SIAC
-    61291: ("live.xpresstiming.com",       "https"),  # Gulf South
-    54381: ("live.jdlfasttrack.com",       "https"),  # Conference Carolinas
-    60633: ("blueridgetiming.live",        "https"),  # MEAC
-    59934: ("live.herostiming.com",        "https"),  # NSIC
-    62216: ("live.rapidresultstiming.com", "https"),  # RMAC
-    62261: ("live.fstiming.com",           "https"),  # GLIAC
-    62706: ("live.athletic.net",           "https"),  # G-MAC
-}
-
 # Conference name keywords → meet_id (for relay events that lack mi in cache)
 CONF_NAME_TO_MEET_ID: dict = {
     "gnac":                 60709,
@@ -67,23 +56,14 @@ CONF_NAME_TO_MEET_ID: dict = {
     "g-mac":                62706,
 }
 
-# TrackScoreboard HTML: source_id pattern "458_12_final" → meet_id → domain
-TRACKSCOREBOARD_MEET_DOMAIN: dict = {
-    "458": ("lancer.trackscoreboard.com", "https"),  # NE10
-    "895": ("live.halfmiletiming.com",    "http"),   # Peach Belt Indoor
-}
-
 # XC events only in PACE-stable (no py/data/ cache — skip)
 XC_SOURCE_IDS = {"2148769", "2149044", "2149045", "2151152", "2151153"}
 
 
-def get_meet_id_from_cache(source_id: str, data_root: pathlib.Path) -> Optional[int]:
-    """Extract meet_id from cached ind_res_list.json for a legacy_spa event."""
-    p = data_root / source_id / "ind_res_list.json"
-    if not p.exists():
-        return None
+def _read_meet_id(path: pathlib.Path) -> Optional[int]:
+    """Extract _source.mi (meet_id) from one cached ind_res_list.json."""
     try:
-        d = json.loads(p.read_text())
+        d = json.loads(path.read_text())
         src = d.get("_source", d) if isinstance(d, dict) else {}
         if not isinstance(src, dict):
             return None
@@ -93,6 +73,20 @@ def get_meet_id_from_cache(source_id: str, data_root: pathlib.Path) -> Optional[
         return None
 
 
+def load_meet_ids_from_cache(source_ids: Iterable[str],
+                             data_root: pathlib.Path) -> Dict[str, int]:
+    """Scan the cache once for the given legacy_spa ids; returns source_id -> meet_id."""
+    meet_ids: Dict[str, int] = {}
+    for sid in set(source_ids):
+        p = data_root / sid / "ind_res_list.json"
+        if not p.exists():
+            continue
+        mi = _read_meet_id(p)
+        if mi is not None:
+            meet_ids[sid] = mi
+    return meet_ids
+
+
 def get_meet_id_from_name(event_name: str) -> Optional[int]:
     """Infer meet_id from conference keyword in event name (for relay events)."""
     name_l = event_name.lower()
@@ -103,20 +97,19 @@ def get_meet_id_from_name(event_name: str) -> Optional[int]:
 
 
 def reconstruct_url_legacy_spa(
-    source_id: str, event_name: str, data_root: pathlib.Path
+    source_id: str, event_name: str, cached_meet_ids: Dict[str, int]
 ) -> Optional[str]:
     """Reconstruct URL for a legacy_spa event."""
-    meet_id = get_meet_id_from_cache(source_id, data_root)
+    meet_id = cached_meet_ids.get(source_id)
     if meet_id is None:
         meet_id = get_meet_id_from_name(event_name)
     if meet_id is None:
         return None
-    entry = MEET_ID_TO_DOMAIN.get(meet_id)
-    if entry is None:
+    base = known_meet_url("legacy_spa", meet_id)
+    if base is None:
         print(f"  [warn] Unknown meet_id {meet_id} for event {source_id}")
         return None
-    domain, proto = entry
-    return f"{proto}://{domain}/meets/{meet_id}/events/{source_id}"
+    return f"{base}/events/{source_id}"
 
 
 # Pattern: {meet_id}_{event_id}_{round}
@@ -129,14 +122,28 @@ def reconstruct_url_trackscoreboard(source_id: str) -> Optional[str]:
     if not m:
         return None
     meet_id, event_id, round_seg = m.group(1), m.group(2), m.group(3)
-    entry = TRACKSCOREBOARD_MEET_DOMAIN.get(meet_id)
-    if entry is None:
+    base = known_meet_url("trackscoreboard_html", meet_id)
+    if base is None:
         print(f"  [warn] Unknown trackscoreboard meet_id {meet_id} for {source_id}")
         return None
-    domain, proto = entry
     if round_seg:
-        return f"{proto}://{domain}/meets/{meet_id}/events/{event_id}/{round_seg}"
-    return f"{proto}://{domain}/meets/{meet_id}/events/{event_id}"
+        return f"{base}/events/{event_id}/{round_seg}"
+    return f"{base}/events/{event_id}"
+
+
+# Rows per upsert request when applying updates
+UPSERT_CHUNK = 500
+
+
+def apply_updates(rows: List[Dict[str, Any]]) -> None:
+    """Apply source_url updates as chunked set-based upserts keyed on id.
+
+    Each row carries the event's existing NOT NULL columns so the upsert's
+    insert path is valid; on conflict only identical values plus source_url
+    are written.
+    """
+    for i in range(0, len(rows), UPSERT_CHUNK):
+        sb.table("events").upsert(rows[i:i + UPSERT_CHUNK], on_conflict="id").execute()
 
 
 def main():
@@ -148,15 +155,27 @@ def main():
     data_root = pathlib.Path(args.data_root)
 
     try:
-        events = sb.table("events").select("id,source_id,name,source_url,provider").execute().data
+        events = sb.table("events").select(
+            "id,source_id,name,gender,distance,source_url,provider"
+        ).execute().data
     except Exception:
         # Column may not exist yet (migration not applied) — select without it
-        events = sb.table("events").select("id,source_id,name,provider").execute().data
+        events = sb.table("events").select("id,source_id,name,gender,distance,provider").execute().data
         for ev in events:
             ev.setdefault("source_url", None)
     print(f"Found {len(events)} events in Supabase\n")
 
-    updated = skipped = failed = 0
+    pending = [
+        ev for ev in events
+        if not ev.get("source_url") and ev["source_id"] not in XC_SOURCE_IDS
+    ]
+    cached_meet_ids = load_meet_ids_from_cache(
+        (ev["source_id"] for ev in pending if not _TS_PATTERN.match(ev["source_id"])),
+        data_root,
+    )
+
+    updates: List[Dict[str, Any]] = []
+    skipped = failed = 0
 
     for ev in sorted(events, key=lambda e: e["name"]):
         sid = ev["source_id"]
@@ -176,7 +195,7 @@ def main():
         if _TS_PATTERN.match(sid):
             url = reconstruct_url_trackscoreboard(sid)
         else:
-            url = reconstruct_url_legacy_spa(sid, name, data_root)
+            url = reconstruct_url_legacy_spa(sid, name, cached_meet_ids)
 
         if not url:
             print(f"  [fail] {sid:25} no URL for: {name[:50]}")
@@ -185,14 +204,19 @@ def main():
 
         tag = "[dry] " if args.dry_run else ""
         print(f"  {tag}{sid:25} → {url}")
-
-        if not args.dry_run:
-            sb.table("events").update({"source_url": url}).eq("id", ev["id"]).execute()
-            updated += 1
-        else:
-            updated += 1
-
-    print(f"\nDone. {'Would update' if args.dry_run else 'Updated'}: {updated}  "
+        updates.append({
+            "id": ev["id"],
+            "source_id": sid,
+            "name": name,
+            "gender": ev["gender"],
+            "distance": ev["distance"],
+            "source_url": url,
+        })
+
+    if updates and not args.dry_run:
+        apply_updates(updates)
+
+    print(f"\nDone. {'Would update' if args.dry_run else 'Updated'}: {len(updates)}  "
           f"Skipped: {skipped}  Failed: {failed}")
 
 
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+pace_catalogue.py
+Plan a whole season from a meet catalogue in one command.
+
+Reads a CSV catalogue (division, conference, url, meet_name, date, season,
+location, notes; '#' lines ignored — see docs/meets/2026_indoor.csv),
+discovers every meet concurrently with at most --per-host discoveries against
+one timing host at a time, and merges the distance events into a single
+deduplicated event plan. A meet listed twice (e.g. a D1/D2 shared meet) is
+discovered once; an event reachable from two meets is planned once, keyed by
+the scrape bundle it would produce.
+
+The plan can be written as JSON, enqueued as scrape jobs into pace_jobs, or
+run straight through the stage-pipelined scheduler.
+
+Usage:
+  python pace_catalogue.py --catalogue ../docs/meets/2026_indoor.csv --out data/plan.json
+  python pace_catalogue.py --catalogue ../docs/meets/2026_indoor.csv --division D1 \\
+      --enqueue --db data/pace_jobs.sqlite
+  python pace_catalogue.py --catalogue ../docs/meets/2026_indoor.csv --run --data-root data
+"""
+
+import argparse
+import csv
+import datetime as dt
+import json
+import pathlib
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+PY_DIR = pathlib.Path(__file__).parent
+sys.path.insert(0, str(PY_DIR))
+
+import pace_hosts
+from pace_providers import classify_url, url_host
+
+DEFAULT_WORKERS = 8
+DEFAULT_PER_HOST = 2
+
+CATALOGUE_FIELDS = ("division", "conference", "url", "meet_name", "date", "season", "location", "notes")
+
+
+# ---------------- catalogue ----------------
+
+def load_catalogue(path: pathlib.Path) -> List[Dict[str, str]]:
+    """Read catalogue rows, skipping comments and rows without a URL."""
+    lines = [
+        line for line in path.read_text(encoding="utf-8").splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+    meets = []
+    for row in csv.DictReader(lines):
+        meet = {k: (row.get(k) or "").strip() for k in CATALOGUE_FIELDS}
+        if not meet["url"]:
+            continue
+        meet["season"] = meet["season"] or "indoor"
+        meets.append(meet)
+    return meets
+
+
+def extra_meta_for(meet: Dict[str, str]) -> Dict[str, str]:
+    return {
+        "meet_name": meet["meet_name"],
+        "date": meet["date"],
+        "season": meet["season"],
+        "location": meet["location"],
+    }
+
+
+def dedupe_meets(meets: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """Collapse rows sharing a URL; divisions are merged, the first row's metadata wins."""
+    by_url: Dict[str, Dict[str, Any]] = {}
+    for meet in meets:
+        key = meet["url"].rstrip("/")
+        if key in by_url:
+            divisions = by_url[key]["divisions"]
+            if meet["division"] and meet["division"] not in divisions:
+                divisions.append(meet["division"])
+            continue
+        by_url[key] = {**meet, "divisions": [meet["division"]] if meet["division"] else []}
+    return list(by_url.values())
+
+
+# ---------------- discovery ----------------
+
+class HostLimiter:
+    """One semaphore per timing host, created on first use."""
+
+    def __init__(self, per_host: int):
+        self.per_host = max(1, per_host)
+        self._sems: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def slot(self, url: str) -> threading.Semaphore:
+        host = url_host(url)
+        with self._lock:
+            if host not in self._sems:
+                self._sems[host] = threading.Semaphore(self.per_host)
+            return self._sems[host]
+
+
+def discover_all(meets: List[Dict[str, Any]], data_root: pathlib.Path,
+                 workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST,
+                 max_age_s: Optional[float] = None) -> List[Tuple[Dict[str, Any], list, str]]:
+    """Discover meets concurrently; returns (meet, events, error) in catalogue order."""
+    from pace_discover import DISCOVER_TTL_S, discover_meet
+
+    limiter = HostLimiter(per_host)
+    ttl = DISCOVER_TTL_S if max_age_s is None else max_age_s
+
+    def _one(meet: Dict[str, Any]) -> Tuple[Dict[str, Any], list, str]:
+        with limiter.slot(meet["url"]):
+            try:
+                events = discover_meet(meet["url"], data_root / "_discover", ttl, scrape_root=data_root)
+            except (Exception, SystemExit) as e:
+                return meet, [], f"{type(e).__name__}: {e}"
+        if not events:
+            return meet, [], "no events discovered"
+        return meet, events, ""
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(_one, meets))
+
+
+# ---------------- plan ----------------
+
+def _bundle_key(event: dict) -> str:
+    """Scrape bundle directory the event would land in (falls back to its href)."""
+    try:
+        from pace_scraper import event_id_from_url
+        return event_id_from_url(event["href"])
+    except Exception:
+        return event["href"].split("#", 1)[0].rstrip("/")
+
+
+def build_plan(discovered: List[Tuple[Dict[str, Any], list, str]]) -> Dict[str, Any]:
+    """Merge per-meet discoveries into one plan of unique distance events."""
+    plan_meets = []
+    items = []
+    seen: Dict[str, str] = {}
+    for meet, events, error in discovered:
+        distance = [e for e in events if e["category"] == "distance"]
+        added = 0
+        for event in distance:
+            key = _bundle_key(event)
+            if key in seen:
+                continue
+            seen[key] = meet["url"]
+            items.append({
+                "meet_url": meet["url"],
+                "provider": classify_url(event["href"]),
+                "event": event,
+                "extra_meta": extra_meta_for(meet),
+            })
+            added += 1
+        plan_meets.append({
+            "url": meet["url"],
+            "meet_name": meet["meet_name"],
+            "divisions": meet["divisions"],
+            "provider": classify_url(meet["url"]),
+            "events": len(events),
+            "distance_events": len(distance),
+            "planned": added,
+            "error": error,
+        })
+    return {
+        "generated_at": dt.datetime.now().isoformat(timespec="seconds"),
+        "meets": plan_meets,
+        "events": items,
+    }
+
+
+def print_plan(plan: Dict[str, Any]) -> None:
+    fmt = "{:<8}  {:<22}  {:>6}  {:>6}  {:>7}  {}"
+    print(fmt.format("DIV", "PROVIDER", "EVENTS", "DIST", "PLANNED", "MEET"))
+    print("-" * 110)
+    for m in plan["meets"]:
+        print(fmt.format(
+            "/".join(m["divisions"]) or "-",
+            m["provider"],
+            m["events"],
+            m["distance_events"],
+            m["planned"],
+            m["meet_name"] or m["url"],
+        ))
+        if m["error"]:
+            print(f"{'':>10}[FAIL] {m['error']}")
+    failed = sum(1 for m in plan["meets"] if m["error"])
+    print(f"\n{len(plan['events'])} event(s) planned from {len(plan['meets'])} meet(s), {failed} failed")
+
+
+def enqueue_plan(plan: Dict[str, Any], db_path: pathlib.Path) -> int:
+    """Queue every planned event as a pace_jobs scrape job; returns how many were new."""
+    from pace_jobs import JobQueue
+
+    queue = JobQueue(db_path)
+    return sum(
+        queue.enqueue(item["meet_url"], "scrape", item["event"]["id"],
+                      {"event": item["event"], "extra_meta": item["extra_meta"]})
+        for item in plan["events"]
+    )
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Discover a meet catalogue and build one event plan")
+    ap.add_argument("--catalogue", required=True, help="Catalogue CSV (see docs/meets/)")
+    ap.add_argument("--division", action="append", help="Only these divisions (repeatable, e.g. D1)")
+    ap.add_argument("--data-root", default="data", help="Root data directory")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent discoveries")
+    ap.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST,
+                    help=f"Concurrent discoveries per timing host (default {DEFAULT_PER_HOST})")
+    ap.add_argument("--rediscover", action="store_true", help="Ignore the discovery cache TTL")
+    ap.add_argument("--out", help="Write the plan JSON here")
+    ap.add_argument("--enqueue", action="store_true", help="Queue planned events into pace_jobs")
+    ap.add_argument("--db", default="data/pace_jobs.sqlite", help="pace_jobs database for --enqueue")
+    ap.add_argument("--run", action="store_true", help="Run the plan through the stage pipeline")
+    args = ap.parse_args()
+
+    meets = load_catalogue(pathlib.Path(args.catalogue))
+    if args.division:
+        wanted = {d.upper() for d in args.division}
+        meets = [m for m in meets if m["division"].upper() in wanted]
+    meets = dedupe_meets(meets)
+    if not meets:
+        print("[catalogue] no meets selected")
+        sys.exit(1)
+
+    data_root = pathlib.Path(args.data_root)
+    data_root.mkdir(parents=True, exist_ok=True)
+    pace_hosts.enable_default(data_root)
+    print(f"[catalogue] discovering {len(meets)} meet(s) "
+          f"({args.workers} workers, {args.per_host} per host)")
+    discovered = discover_all(meets, data_root, args.workers, args.per_host,
+                              max_age_s=0 if args.rediscover else None)
+    plan = build_plan(discovered)
+    print()
+    print_plan(plan)
+
+    if args.out:
+        out = pathlib.Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(plan, indent=2), encoding="utf-8")
+        print(f"[catalogue] plan written to {out}")
+    if args.enqueue:
+        added = enqueue_plan(plan, pathlib.Path(args.db))
+        print(f"[catalogue] {added} new scrape job(s) queued in {args.db}")
+    if args.run:
+        from pace_pipeline import Pipeline
+
+        results = Pipeline(data_root).run(
+            [{"event": item["event"], "extra_meta": item["extra_meta"]} for item in plan["events"]]
+        )
+        ok = sum(1 for v in results.values() if v)
+        print(f"[catalogue] {ok}/{len(results)} event(s) ingested")
+        if ok < len(results):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+pace_classify.py
+Event-name classification and distance labels shared by discovery,
+normalization and upload.
+
+classify_event() runs a single compiled regex over the name: one zero-width
+lookahead alternation of every rule, so tokens may overlap and finditer stops
+(in C) only where some token starts; m.lastgroup names the rule. Tokens from
+different dimensions never start at the same position with these rules, so
+one pass gives the same answer as searching each pattern separately:
+
+  category: combined > distance > sprint > field (first kind found anywhere)
+  distance: leftmost distance token, canonicalized ("5K" -> "5000m")
+  gender:   Women if any women token, else Men if any men token
+  round:    leftmost round token (prelim/heat/semi -> Prelim, else Final)
+
+Usage:
+  python pace_classify.py "Women's 5000 Meter Run" "Men 4x800 Relay Prelims"
+"""
+
+import functools
+import re
+import sys
+from typing import Dict, Optional
+
+# ---- Rules table (alternatives are tried in order at each position) ----
+
+CATEGORY_RULES = (
+    ("combined", r"\b(?:Pent|Hept|Decath|Pentathlon|Heptathlon|Decathlon)\b"),
+    ("distance", r"(?:800|1500|Mile|1 Mile|3000|5000|5K|10000|10K|DMR|4x800|4x1600)"),
+    ("sprint", r"\b(?:60|100|110|200|400|60H|100H|110H|400H)\s*m?\b"),
+    ("field", r"\b(?:High Jump|Long Jump|Triple Jump|Pole Vault|Shot Put|Discus|Hammer|Javelin|"
+              r"Weight Throw|Pentathlon|Heptathlon|Decathlon)\b"),
+)
+GENDER_RULES = (
+    ("Women", r"\bWomen'?s?\b|Girls|\bW\b"),
+    ("Men", r"\bMen'?s?\b|Boys|\bM\b"),
+)
+ROUND_RULE = r"\b(?:Prelim|Preliminary|Prelims|Final|Finals|Heat|Semis|Semi.Final)\b"
+
+# Distance token (lowercased) -> canonical discovery label
+DISTANCE_LABELS = {
+    "mile": "Mile", "1 mile": "Mile",
+    "5k": "5000m", "10k": "10000m",
+    "800": "800m", "1500": "1500m", "3000": "3000m", "5000": "5000m", "10000": "10000m",
+}
+
+# Loose distance strings (metadata, CLI args) -> upload's canonical distance
+DISTANCE_NORMALIZE_MAP = {
+    "800": "800m", "800M": "800m",
+    "1500": "1500m", "1500M": "1500m",
+    "mile": "Mile", "MILE": "Mile",
+    "3000": "3000m", "3000M": "3000m",
+    "5000": "5000m", "5,000": "5000m", "5000M": "5000m",
+    "10000": "10,000m", "10,000": "10,000m", "10000m": "10,000m", "10000M": "10,000m",
+    "5k": "5K",
+    "8k": "8K",
+    "10k": "10K",
+}
+
+
+# First characters of every rule above; lets the engine skip other positions
+# before trying the full alternation. Extend it when adding a rule.
+_TOKEN_START = "[1-68BDFGHJLMPSTW]"
+
+
+def _build_classifier() -> "re.Pattern[str]":
+    rules = list(CATEGORY_RULES) + [(f"gender_{g}", pat) for g, pat in GENDER_RULES] + [("round", ROUND_RULE)]
+    alts = "|".join(f"(?P<{kind}>{pat})" for kind, pat in rules)
+    return re.compile(f"(?={_TOKEN_START})(?=(?:{alts}))", re.IGNORECASE)
+
+
+CLASSIFIER_RE = _build_classifier()
+_CATEGORY_ORDER = [kind for kind, _ in CATEGORY_RULES]
+
+
+def normalize_distance(distance: str) -> str:
+    """Normalize distance string to canonical form."""
+    return DISTANCE_NORMALIZE_MAP.get(distance, distance)
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify(name: str) -> tuple:
+    seen = set()
+    distance: Optional[str] = None
+    round_token: Optional[str] = None
+
+    for m in CLASSIFIER_RE.finditer(name):
+        kind = m.lastgroup
+        seen.add(kind)
+        if kind == "distance" and distance is None:
+            distance = m.group(kind)
+        elif kind == "round" and round_token is None:
+            round_token = m.group(kind)
+
+    category = next((k for k in _CATEGORY_ORDER if k in seen), "other")
+    dist_label = ""
+    if category == "distance" and distance:
+        dist_label = DISTANCE_LABELS.get(distance.lower(), distance)
+    gender = "Women" if "gender_Women" in seen else "Men" if "gender_Men" in seen else "Unknown"
+    round_ = "Final"
+    if round_token:
+        t = round_token.lower()
+        if "prelim" in t or "heat" in t or "semi" in t:
+            round_ = "Prelim"
+    return category, dist_label, gender, round_
+
+
+def classify_event(name: str) -> Dict[str, str]:
+    """Return category, gender, distance, round for an event name."""
+    category, distance, gender, round_ = _classify(name)
+    return {"category": category, "distance": distance, "gender": gender, "round": round_}
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python pace_classify.py <event name> [...]")
+        sys.exit(1)
+    for name in sys.argv[1:]:
+        info = classify_event(name)
+        print(f"{info['category']:<9} {info['gender']:<8} {info['distance'] or '-':<8} {info['round']:<7} {name}")
+
+
+if __name__ == "__main__":
+    main()
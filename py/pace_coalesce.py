@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+pace_coalesce.py
+Request coalescing for fetches that many callers may ask for at once.
+
+A Coalescer runs fn() once per key: concurrent callers with the same key wait
+for the in-flight call and share its result, and successful results are
+remembered so later callers within the same run get them without fetching
+again. Keys should be normalized fetch targets (pace_providers.fetch_target),
+so every pttiming event of one meet maps to the same key.
+
+Exceptions are re-raised to every waiter of that call; they and falsy
+results (None/False, the failure values of _pt_fetch and scrape_stage) are
+never remembered, so a retry fetches again.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class Coalescer:
+    """
+    Share in-flight and recently completed calls by key.
+
+    ttl_s=None remembers results for the life of the process (one run),
+    ttl_s=0 only shares in-flight calls.
+    """
+
+    def __init__(self, ttl_s: Optional[float] = None):
+        self.ttl_s = ttl_s
+        self._inflight: Dict[str, _Flight] = {}
+        self._done: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "joined": 0, "reused": 0}
+
+    def _fresh(self, key: str) -> Optional[Tuple[float, Any]]:
+        entry = self._done.get(key)
+        if entry is None:
+            return None
+        if self.ttl_s is not None and time.monotonic() - entry[0] >= self.ttl_s:
+            del self._done[key]
+            return None
+        return entry
+
+    def run(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._fresh(key)
+            if entry is not None:
+                self.stats["reused"] += 1
+                return entry[1]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.stats["calls"] += 1
+            else:
+                self.stats["joined"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+                if flight.error is None and flight.result not in (None, False) and self.ttl_s != 0:
+                    self._done[key] = (time.monotonic(), flight.result)
+            flight.done.set()
+        return flight.result
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            self._done.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop remembered results (start of a new run, e.g. each watch poll)."""
+        with self._lock:
+            self._done.clear()
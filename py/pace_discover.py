@@ -10,97 +10,45 @@ Usage:
 
 Output: table of events with columns:
   EVENT_ID | TYPE | NAME | GENDER | DISTANCE | CATEGORY | ROUND
+
+Known gap: events are always read from the rendered page. The SPA's
+event-list JSON (pick_event_list_json) is only hashed to revalidate the
+discover_meet cache, never parsed, so a first discovery or any change to
+the list boots Chromium. pace_watch polls with max_age_s=0, and during a
+live meet the list changes on most polls.
 """
 
 import argparse
 import asyncio
+import hashlib
 import json
+import pathlib
 import re
 import sys
-from typing import Optional
-
-
-# ---- Classification patterns ----
-
-DISTANCE_RE = re.compile(r'(800|1500|Mile|1 Mile|3000|5000|5K|10000|10K|DMR|4x800|4x1600)', re.IGNORECASE)
-GENDER_PATTERNS = {
-    'Women': re.compile(r"\bWomen'?s?\b|Girls|\bW\b", re.IGNORECASE),
-    'Men': re.compile(r"\bMen'?s?\b|Boys|\bM\b", re.IGNORECASE),
-}
-ROUND_RE = re.compile(r'\b(Prelim|Preliminary|Prelims|Final|Finals|Heat|Semis|Semi.Final)\b', re.IGNORECASE)
-
-COMBINED_RE = re.compile(r'\b(Pent|Hept|Decath|Pentathlon|Heptathlon|Decathlon)\b', re.IGNORECASE)
-SPRINT_RE = re.compile(r'\b(60|100|110|200|400|60H|100H|110H|400H)\s*m?\b', re.IGNORECASE)
-FIELD_RE = re.compile(
-    r'\b(High Jump|Long Jump|Triple Jump|Pole Vault|Shot Put|Discus|Hammer|Javelin|Weight Throw|'
-    r'Pentathlon|Heptathlon|Decathlon)\b',
-    re.IGNORECASE,
-)
-
-
-def classify_event(name: str) -> dict:
-    """Return category, gender, distance, round for an event name."""
-    category = "other"
-    distance = ""
-    gender = "Unknown"
-    round_ = "Final"
-
-    # Category — exclude multi-event components (Pent 800m, Hept 60m, etc.)
-    if COMBINED_RE.search(name):
-        category = "combined"
-    elif DISTANCE_RE.search(name):
-        category = "distance"
-        m = DISTANCE_RE.search(name)
-        distance = m.group(0) if m else ""
-        # Normalize distance labels to canonical form
-        _d = distance.lower()
-        if _d in ("mile", "1 mile"):
-            distance = "Mile"
-        elif _d in ("5k",):
-            distance = "5000m"
-        elif _d in ("10k",):
-            distance = "10000m"
-        elif _d in ("800",):
-            distance = "800m"
-        elif _d in ("1500",):
-            distance = "1500m"
-        elif _d in ("3000",):
-            distance = "3000m"
-        elif _d in ("5000",):
-            distance = "5000m"
-        elif _d in ("10000",):
-            distance = "10000m"
-    elif SPRINT_RE.search(name):
-        category = "sprint"
-    elif FIELD_RE.search(name):
-        category = "field"
-
-    # Gender
-    for g, pat in GENDER_PATTERNS.items():
-        if pat.search(name):
-            gender = g
-            break
-
-    # Round (prelim/final)
-    m = ROUND_RE.search(name)
-    if m:
-        token = m.group(0).lower()
-        if "prelim" in token or "heat" in token or "semi" in token:
-            round_ = "Prelim"
-        else:
-            round_ = "Final"
+import time
+from typing import List, Optional, Tuple
+
 
-    return {"category": category, "distance": distance, "gender": gender, "round": round_}
+# Event-name classification lives in pace_classify (shared with normalize/upload)
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+from pace_classify import classify_event
 
 
-async def discover_events(url: str) -> list:
+async def discover_events(url: str, json_sink: Optional[list] = None,
+                          logo_sink: Optional[dict] = None) -> list:
     """Use Playwright to open meet page and extract all event links.
 
     AthleticLIVE SPAs filter events by day/session using <button class="btn-secondary">
     elements. This function clicks each inactive day button to reveal events hidden
     behind the default view (e.g. 3000m events on Day 2).
+
+    If `json_sink` is given, every JSON XHR/fetch response the SPA loads is
+    appended to it as (url, body_text). If `logo_sink` is given, team logos
+    shown on the meet page ({team: svg url}, as in the event capture) are
+    added to it for every day view.
     """
     from playwright.async_api import async_playwright
+    from pace_scraper import apply_resource_policy, extract_logos
 
     raw_links: list = []
     seen_hrefs: set = set()
@@ -108,6 +56,20 @@ async def discover_events(url: str) -> list:
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
         page = await browser.new_page()
+        await apply_resource_policy(page)
+
+        async def on_response(resp):
+            try:
+                if resp.request.resource_type not in ("xhr", "fetch"):
+                    return
+                if "json" not in resp.headers.get("content-type", ""):
+                    return
+                json_sink.append((resp.url, await resp.text()))
+            except Exception:
+                pass
+
+        if json_sink is not None:
+            page.on("response", on_response)
         await page.goto(url, wait_until="domcontentloaded", timeout=60000)
         await page.wait_for_timeout(3000)
 
@@ -134,6 +96,12 @@ async def discover_events(url: str) -> list:
                     seen_hrefs.add(href)
                     raw_links.append(item)
                     added += 1
+            if logo_sink is not None:
+                try:
+                    for team, src in extract_logos(await page.content(), "team-images", ".svg").items():
+                        logo_sink.setdefault(team, src)
+                except Exception:
+                    pass
             return added
 
         # Collect from the default (Day 1) view
@@ -185,6 +153,7 @@ async def discover_events(url: str) -> list:
         # Take index [1] to skip status badge; fall back to [0]
         label_parts = [p.strip() for p in r["label"].split("|")]
         label = label_parts[1] if len(label_parts) > 1 else label_parts[0]
+        status = label_parts[0] if len(label_parts) > 1 else ""
 
         info = classify_event(label)
         # URL-encoded round takes precedence over text-classified round
@@ -198,6 +167,7 @@ async def discover_events(url: str) -> list:
             "distance": info["distance"],
             "category": info["category"],
             "round": effective_round,
+            "status": status,
             "href": href,
         })
 
@@ -225,11 +195,6 @@ def discover_flashresults(index_url: str) -> list:
     soup = BeautifulSoup(resp.text, "lxml")
 
     # Import event_id_from_url from pace_scraper to ensure consistent IDs
-    import sys as _sys
-    import pathlib as _pathlib
-    _py_dir = _pathlib.Path(__file__).parent
-    if str(_py_dir) not in _sys.path:
-        _sys.path.insert(0, str(_py_dir))
     try:
         from pace_scraper import event_id_from_url as _eid_fn
     except ImportError:
@@ -302,8 +267,6 @@ def discover_flashresults(index_url: str) -> list:
 async def discover_trackscoreboard(url: str) -> list:
     """Use Playwright to discover events on a rt.trackscoreboard.com meet page."""
     from playwright.async_api import async_playwright
-    import sys as _sys
-    import pathlib as _pathlib
 
     # Ensure /events suffix
     events_url = url.rstrip("/")
@@ -311,14 +274,12 @@ async def discover_trackscoreboard(url: str) -> list:
         events_url += "/events"
 
     # Import event_id_from_url for consistent IDs
-    _py_dir = _pathlib.Path(__file__).parent
-    if str(_py_dir) not in _sys.path:
-        _sys.path.insert(0, str(_py_dir))
     try:
         from pace_scraper import event_id_from_url as _eid_fn
     except ImportError:
         def _eid_fn(u):  # type: ignore[misc]
             return u.rstrip("/").split("/")[-1]
+    from pace_scraper import apply_resource_policy
 
     events: list = []
     seen_hrefs: set = set()
@@ -326,6 +287,7 @@ async def discover_trackscoreboard(url: str) -> list:
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True, args=["--no-sandbox"])
         ctx = await browser.new_context()
+        await apply_resource_policy(ctx)
         page = await ctx.new_page()
         print(f"[ts-discover] {events_url}")
         await page.goto(events_url, wait_until="networkidle", timeout=30000)
@@ -379,19 +341,184 @@ async def discover_trackscoreboard(url: str) -> list:
     return events
 
 
-def discover_meet(url: str) -> list:
+# ---- Discovery cache ----
+# One JSON file per meet URL: {"url", "fetched_at", "events", "probe"}.
+# "probe" is a cheap HTTP resource whose body changes whenever the event list
+# does (the SPA's own event-list JSON, or the static index page); once the TTL
+# expires, an unchanged probe body revalidates the cached list without a browser.
+# The probe is only hashed, never parsed: the event list itself always comes
+# from rendering the meet page, so a first discovery or a changed probe still
+# boots Chromium.
+
+DISCOVER_TTL_S = 6 * 3600
+
+
+def _cache_file(cache_dir: pathlib.Path, url: str) -> pathlib.Path:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", url.split("://", 1)[-1]).strip("_")[:80]
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:10]
+    return cache_dir / f"{slug}_{digest}.json"
+
+
+def _load_cache(path: pathlib.Path) -> Optional[dict]:
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        return entry if isinstance(entry, dict) and isinstance(entry.get("events"), list) else None
+    except Exception:
+        return None
+
+
+def _save_cache(path: pathlib.Path, entry: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(entry, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _fetch_text(url: str) -> Optional[str]:
+    import urllib.request as _req
+    try:
+        req = _req.Request(url, headers={"User-Agent": "Mozilla/5.0"})
+        with _req.urlopen(req, timeout=20) as resp:
+            return resp.read().decode("utf-8", errors="replace")
+    except Exception as e:
+        print(f"[discover] probe fetch failed {url}: {e}")
+        return None
+
+
+def pick_event_list_json(responses: List[Tuple[str, str]], events: list) -> Optional[dict]:
+    """
+    Among JSON responses seen while rendering a meet page, pick the one that
+    mentions the most discovered event ids (the SPA's event-list endpoint).
+    Needs to cover at least half the events to be trusted as a probe. Only its
+    URL and body hash are kept, for cache revalidation.
+    """
+    ids = {str(e["id"]) for e in events if e.get("id")}
+    best, best_hits = None, 0
+    for resp_url, body in responses:
+        hits = sum(1 for i in ids if i in body)
+        if hits > best_hits:
+            best, best_hits = (resp_url, body), hits
+    if best is None or best_hits * 2 < len(ids):
+        return None
+    return {"url": best[0], "sha256": _sha256(best[1])}
+
+
+def persist_discovered_payloads(responses: List[Tuple[str, str]], events: list,
+                                scrape_root: pathlib.Path,
+                                logos: Optional[dict] = None) -> int:
+    """
+    Write split_report / ind_res_list JSON the meet page already loaded into the
+    scrape cache, so those events need no browser at scrape time. A response is
+    assigned to the event whose id appears as a token in its URL; only events
+    with both payloads and no existing bundle are written. Returns the count.
+
+    Each bundle gets the meet page's logos of teams named in its results. A
+    bundle left without any is marked logos_pending, so the scrape stage
+    still captures the event page for them (see pace_scraper.is_cached).
+    """
+    from pace_scraper import (
+        _is_legacy_reslist, _is_legacy_split, _looks_like_legacy_json,
+        event_id_from_url, is_cached, write_event_bundle,
+    )
+
+    by_id = {str(e["id"]): e for e in events if e.get("id")}
+    payloads: dict = {}
+    for resp_url, body in responses:
+        if not _looks_like_legacy_json(resp_url):
+            continue
+        tokens = set(re.split(r"[/?&=._-]+", resp_url))
+        matches = [i for i in by_id if i in tokens]
+        if len(matches) != 1:
+            continue
+        try:
+            data = json.loads(body)
+        except ValueError:
+            continue
+        slot = payloads.setdefault(matches[0], {})
+        if _is_legacy_split(resp_url):
+            slot.setdefault("split_report", data)
+        elif _is_legacy_reslist(resp_url):
+            slot.setdefault("ind_res_list", data)
+
+    written = 0
+    for event_key, slot in payloads.items():
+        if "split_report" not in slot or "ind_res_list" not in slot:
+            continue
+        eid = event_id_from_url(by_id[event_key]["href"])
+        if is_cached(scrape_root / eid):
+            continue
+        names = json.dumps(slot["ind_res_list"], ensure_ascii=False)
+        event_logos = {team: src for team, src in (logos or {}).items() if team and team in names}
+        write_event_bundle(scrape_root, eid, slot["split_report"], slot["ind_res_list"], event_logos,
+                           logos_pending=not event_logos)
+        written += 1
+    if written:
+        print(f"[discover] prefilled scrape cache for {written} event(s) from page XHRs")
+    return written
+
+
+def discover_meet(url: str, cache_dir: Optional[pathlib.Path] = None,
+                  max_age_s: float = DISCOVER_TTL_S,
+                  scrape_root: Optional[pathlib.Path] = None) -> list:
     """Provider-aware meet discovery dispatcher.
 
-    Calls discover_flashresults() for flashresults.com URLs,
-    calls discover_trackscoreboard() for rt.trackscoreboard.com URLs,
-    otherwise falls back to the Playwright-based discover_events().
+    Classifies the URL through the shared provider registry:
+    flashresults -> discover_flashresults(),
+    rt.trackscoreboard.com -> discover_trackscoreboard(),
+    otherwise the Playwright-based discover_events().
+
+    With `cache_dir`, results are cached per meet URL: a cached list younger
+    than `max_age_s` is returned as-is, an older one is revalidated through
+    its probe URL (plain HTTP), and only a miss or a changed probe renders the
+    meet page again. This is a cache with probe-based revalidation, not
+    API-based discovery: event lists are always built from the rendered
+    page. With `scrape_root`, result JSON the rendered page loaded is
+    persisted there as scrape bundles (see persist_discovered_payloads).
     """
     import asyncio
-    if "flashresults.com" in url.lower():
-        return discover_flashresults(url)
-    if "rt.trackscoreboard.com" in url.lower():
-        return asyncio.run(discover_trackscoreboard(url))
-    return asyncio.run(discover_events(url))
+    from pace_providers import classify_url, url_host
+
+    cache_path = _cache_file(cache_dir, url) if cache_dir is not None else None
+    entry = _load_cache(cache_path) if cache_path is not None else None
+    if entry is not None:
+        age = time.time() - float(entry.get("fetched_at", 0))
+        if age < max_age_s:
+            print(f"[discover] cache hit ({age:.0f}s old): {len(entry['events'])} events")
+            return entry["events"]
+        probe = entry.get("probe")
+        if probe:
+            body = _fetch_text(probe["url"])
+            if body is not None and _sha256(body) == probe["sha256"]:
+                print(f"[discover] probe unchanged, reusing {len(entry['events'])} cached events")
+                entry["fetched_at"] = time.time()
+                _save_cache(cache_path, entry)
+                return entry["events"]
+
+    provider = classify_url(url)
+    probe = None
+    if provider == "flashresults":
+        events = discover_flashresults(url)
+        body = _fetch_text(url) if cache_path is not None else None
+        probe = {"url": url, "sha256": _sha256(body)} if body is not None else None
+    elif provider == "trackscoreboard_html" and url_host(url) == "rt.trackscoreboard.com":
+        events = asyncio.run(discover_trackscoreboard(url))
+    else:
+        responses: List[Tuple[str, str]] = []
+        logos: dict = {}
+        events = asyncio.run(discover_events(
+            url, json_sink=responses, logo_sink=logos if scrape_root is not None else None,
+        ))
+        probe = pick_event_list_json(responses, events)
+        if probe:
+            print(f"[discover] event-list JSON: {probe['url']}")
+        if scrape_root is not None:
+            persist_discovered_payloads(responses, events, scrape_root, logos)
+
+    if cache_path is not None and events:
+        _save_cache(cache_path, {"url": url, "fetched_at": time.time(), "events": events, "probe": probe})
+    return events
 
 
 def print_table(events: list, distance_only: bool) -> None:
@@ -420,9 +547,14 @@ def main():
     ap.add_argument("--url", required=True, help="Meet URL")
     ap.add_argument("--distance-only", action="store_true", help="Only show distance events")
     ap.add_argument("--json", dest="as_json", action="store_true", help="Output as JSON")
+    ap.add_argument("--cache-dir", default="data/_discover", help="Discovery cache directory")
+    ap.add_argument("--max-age", type=float, default=DISCOVER_TTL_S,
+                    help=f"Reuse cached discovery younger than this many seconds (default {DISCOVER_TTL_S})")
+    ap.add_argument("--no-cache", action="store_true", help="Always render the meet page")
     args = ap.parse_args()
 
-    events = asyncio.run(discover_events(args.url))
+    cache_dir = None if args.no_cache else pathlib.Path(args.cache_dir)
+    events = discover_meet(args.url, cache_dir, args.max_age)
 
     if args.as_json:
         print(json.dumps(events, indent=2))
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+pace_hosts.py
+Per-host request pacing and circuit breaking for the scrapers' fetches.
+
+Each timing host gets a token bucket whose rate adapts to how it responds:
+
+  - 429 / 5xx / connection errors halve the rate,
+  - fast successes add RATE_STEP req/s back, up to MAX_RATE,
+  - successes slower than SLOW_S trim the rate by 10%.
+
+After BREAK_AFTER consecutive failures (or a 429 with Retry-After) the host's
+circuit opens: fetches raise HostUnavailable until the cooldown has passed
+(doubling on every re-open, capped at MAX_COOLDOWN_S), then requests are let
+through again and the first success closes it.
+
+When PACE_HOST_STATE names a SQLite database, the whole per-host state (bucket,
+adapted rate and breaker) lives there and is updated in one transaction per
+request, so every process started by a run (scraper subprocesses, discovery
+threads, queue workers) draws from the same bucket: N concurrent scrapers
+still send at most the host's rate between them. pace_jobs points it at its
+queue DB; pace_ingest_meet, pace_catalogue, pace_watch and the pipeline use
+<data-root>/_hosts.sqlite unless it is already set.
+
+A scraper that stops because a circuit is open exits with
+EXIT_HOST_UNAVAILABLE and, when PACE_HOST_REPORT names a file, writes the
+host and retry time there (see write_report / read_report), so the caller
+can defer whichever host it was.
+
+Usage:
+  python pace_hosts.py data/pace_jobs.sqlite           # show known hosts
+  python pace_hosts.py data/pace_jobs.sqlite --reset live.herostiming.com
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import sqlite3
+import sys
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Optional, Tuple, TypeVar
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+
+from pace_providers import url_host
+
+ENV_STATE = "PACE_HOST_STATE"
+ENV_REPORT = "PACE_HOST_REPORT"
+DEFAULT_STATE_FILE = "_hosts.sqlite"
+
+DEFAULT_RATE = 4.0     # requests/s a host starts at
+MIN_RATE = 0.25
+MAX_RATE = 20.0
+RATE_STEP = 0.5
+BURST = 4              # bucket size
+SLOW_S = 5.0           # successes slower than this count as strain
+BREAK_AFTER = 5        # consecutive failures that open the circuit
+BASE_COOLDOWN_S = 30.0
+MAX_COOLDOWN_S = 900.0
+
+# Scraper exit status when a host's circuit is open (EX_TEMPFAIL)
+EXIT_HOST_UNAVAILABLE = 75
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    host       TEXT PRIMARY KEY,
+    rate       REAL NOT NULL,
+    failures   INTEGER NOT NULL,
+    cooldown   REAL NOT NULL,
+    open_until REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    tokens     REAL NOT NULL,
+    filled_at  REAL NOT NULL
+);
+"""
+
+STATE_FIELDS = ("rate", "failures", "cooldown", "open_until", "tokens", "filled_at")
+
+T = TypeVar("T")
+
+
+class HostUnavailable(Exception):
+    """The host's circuit is open; retry after `retry_at` (unix time)."""
+
+    def __init__(self, host: str, retry_at: float):
+        super().__init__(f"{host} circuit open, retry in {max(0.0, retry_at - time.time()):.0f}s")
+        self.host = host
+        self.retry_at = retry_at
+
+
+def is_failure(status: Optional[int]) -> bool:
+    """Responses that mean the host is struggling or pushing back (None = no response)."""
+    return status is None or status == 429 or status >= 500
+
+
+def retry_after_s(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    value = (headers or {}).get("Retry-After") or (headers or {}).get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------------- state ----------------
+
+def new_state() -> Dict[str, float]:
+    return {"rate": DEFAULT_RATE, "failures": 0, "cooldown": BASE_COOLDOWN_S,
+            "open_until": 0.0, "tokens": float(BURST), "filled_at": time.time()}
+
+
+class HostStore:
+    """hosts table in a SQLite file. Safe to share across threads (one connection each)."""
+
+    def __init__(self, db_path: pathlib.Path):
+        self.db_path = pathlib.Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, host: str) -> Optional[sqlite3.Row]:
+        return self._conn().execute("SELECT * FROM hosts WHERE host = ?", (host,)).fetchone()
+
+    def update(self, host: str, fn: Callable[[Dict[str, float]], T]) -> T:
+        """Apply fn to the host's state dict and store the result, in one write transaction."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT * FROM hosts WHERE host = ?", (host,)).fetchone()
+            state = {k: row[k] for k in STATE_FIELDS} if row is not None else new_state()
+            result = fn(state)
+            conn.execute(
+                f"INSERT OR REPLACE INTO hosts (host, {', '.join(STATE_FIELDS)}, updated_at) "
+                f"VALUES (?, {', '.join('?' * len(STATE_FIELDS))}, ?)",
+                (host, *(state[k] for k in STATE_FIELDS), time.time()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def all(self) -> list:
+        return self._conn().execute("SELECT * FROM hosts ORDER BY host").fetchall()
+
+    def reset(self, host: str) -> None:
+        self._conn().execute("DELETE FROM hosts WHERE host = ?", (host,))
+
+
+# ---------------- per-host gate ----------------
+
+class HostGate:
+    """Token bucket + circuit breaker for one host, shared through the store when there is one."""
+
+    def __init__(self, host: str, store: Optional[HostStore] = None):
+        self.host = host
+        self.store = store
+        self._state = new_state()
+        self._lock = threading.Lock()
+
+    def _update(self, fn: Callable[[Dict[str, float]], T]) -> T:
+        with self._lock:
+            if self.store is None:
+                return fn(self._state)
+            return self.store.update(self.host, fn)
+
+    def open_until(self) -> float:
+        if self.store is None:
+            return self._state["open_until"]
+        row = self.store.load(self.host)
+        return row["open_until"] if row is not None else 0.0
+
+    def check(self) -> None:
+        """Raise HostUnavailable while the circuit is open."""
+        until = self.open_until()
+        if until > time.time():
+            _note_trip(self.host, until)
+            raise HostUnavailable(self.host, until)
+
+    def reserve(self) -> float:
+        """Take one token; returns how long to wait before sending (raises if open)."""
+        def _take(s: Dict[str, float]) -> Tuple[float, float]:
+            now = time.time()
+            if s["open_until"] > now:
+                return -1.0, s["open_until"]
+            s["tokens"] = min(float(BURST), s["tokens"] + max(0.0, now - s["filled_at"]) * s["rate"])
+            s["filled_at"] = now
+            s["tokens"] -= 1
+            return (0.0 if s["tokens"] >= 0 else -s["tokens"] / s["rate"]), 0.0
+
+        wait, until = self._update(_take)
+        if wait < 0:
+            _note_trip(self.host, until)
+            raise HostUnavailable(self.host, until)
+        return wait
+
+    def acquire(self) -> None:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, status: Optional[int], elapsed_s: float,
+               headers: Optional[Mapping[str, str]] = None) -> None:
+        """Feed one outcome back: adapts the rate and trips/clears the breaker."""
+        retry_after = retry_after_s(headers) if status == 429 else None
+
+        def _apply(s: Dict[str, float]) -> Tuple[Optional[float], int]:
+            if is_failure(status):
+                s["rate"] = max(MIN_RATE, s["rate"] / 2)
+                s["failures"] += 1
+                pause = retry_after
+                if pause is None and s["failures"] >= BREAK_AFTER:
+                    pause = s["cooldown"]
+                    s["cooldown"] = min(MAX_COOLDOWN_S, s["cooldown"] * 2)
+                if pause:
+                    s["open_until"] = max(s["open_until"], time.time() + pause)
+                return pause, int(s["failures"])
+            s["failures"] = 0
+            s["cooldown"] = BASE_COOLDOWN_S
+            if elapsed_s > SLOW_S:
+                s["rate"] = max(MIN_RATE, s["rate"] * 0.9)
+            else:
+                s["rate"] = min(MAX_RATE, s["rate"] + RATE_STEP)
+            return None, 0
+
+        pause, failures = self._update(_apply)
+        if pause:
+            _note_trip(self.host, time.time() + pause)
+            print(f"[hosts] {self.host}: circuit open for {pause:.0f}s "
+                  f"({failures} failure(s), status {status})")
+
+
+# ---------------- process-wide registry ----------------
+
+_gates: Dict[Tuple[str, str], HostGate] = {}
+_gates_lock = threading.Lock()
+_stores: Dict[str, HostStore] = {}
+
+# Circuits this process ran into: host -> (noticed_at, open_until)
+_tripped: Dict[str, Tuple[float, float]] = {}
+
+
+def enable(db_path: pathlib.Path) -> None:
+    """Share host state through db_path for this process and any subprocess it starts."""
+    os.environ[ENV_STATE] = str(pathlib.Path(db_path).resolve())
+
+
+def enable_default(data_root: pathlib.Path) -> None:
+    """enable() <data-root>/_hosts.sqlite unless a caller already chose a state DB."""
+    if not os.environ.get(ENV_STATE):
+        enable(pathlib.Path(data_root) / DEFAULT_STATE_FILE)
+
+
+def _store() -> Optional[HostStore]:
+    path = os.environ.get(ENV_STATE)
+    if not path:
+        return None
+    if path not in _stores:
+        _stores[path] = HostStore(pathlib.Path(path))
+    return _stores[path]
+
+
+def _note_trip(host: str, open_until: float) -> None:
+    with _gates_lock:
+        _tripped[host] = (time.time(), open_until)
+
+
+def tripped_since(since: float) -> Optional[HostUnavailable]:
+    """
+    The circuit this process ran into after `since` (unix time) that is still
+    open, if any. Browser captures abort requests to an open host rather than
+    failing, so this is how a scrape finds out which host (API or page) cut it short.
+    """
+    now = time.time()
+    with _gates_lock:
+        hits = [(until, host) for host, (at, until) in _tripped.items() if at >= since and until > now]
+    if not hits:
+        return None
+    until, host = max(hits)
+    return HostUnavailable(host, until)
+
+
+def write_report(err: HostUnavailable) -> None:
+    """Tell the parent which host stopped this scraper (no-op unless PACE_HOST_REPORT is set)."""
+    path = os.environ.get(ENV_REPORT)
+    if path:
+        pathlib.Path(path).write_text(json.dumps({"host": err.host, "retry_at": err.retry_at}))
+
+
+def read_report(path: pathlib.Path) -> Optional[HostUnavailable]:
+    try:
+        data = json.loads(pathlib.Path(path).read_text() or "null")
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or not data.get("host"):
+        return None
+    return HostUnavailable(data["host"], float(data.get("retry_at") or 0.0))
+
+
+def gate(url: str) -> HostGate:
+    host = url_host(url)
+    store = _store()
+    key = (str(store.db_path) if store else "", host)
+    with _gates_lock:
+        g = _gates.get(key)
+        if g is None:
+            g = _gates[key] = HostGate(host, store)
+        return g
+
+
+def check(url: str) -> None:
+    """Raise HostUnavailable if the URL's host circuit is open."""
+    gate(url).check()
+
+
+def retry_at(url: str) -> float:
+    """When the URL's host circuit closes (0 if closed)."""
+    until = gate(url).open_until()
+    return until if until > time.time() else 0.0
+
+
+def guarded(url: str, fetch: Callable[[], T],
+            outcome: Callable[[T], Tuple[int, Mapping[str, str]]]) -> T:
+    """
+    Run one HTTP fetch under the host's pacing and breaker. `outcome` maps the
+    result to (status, headers); exceptions count as failures unless they carry
+    a non-failure HTTP status (urllib's HTTPError.code).
+    """
+    g = gate(url)
+    g.acquire()
+    started = time.monotonic()
+    try:
+        result = fetch()
+    except Exception as e:
+        g.record(getattr(e, "code", None), time.monotonic() - started, getattr(e, "headers", None))
+        raise
+    status, headers = outcome(result)
+    g.record(status, time.monotonic() - started, headers)
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Show or reset shared per-host health")
+    ap.add_argument("db", help="SQLite file holding the hosts table (e.g. the pace_jobs DB)")
+    ap.add_argument("--reset", action="append", help="Forget a host's state (repeatable)")
+    args = ap.parse_args()
+
+    store = HostStore(pathlib.Path(args.db))
+    for host in args.reset or []:
+        store.reset(host)
+        print(f"[hosts] reset {host}")
+    now = time.time()
+    fmt = "{:<40} {:>7} {:>8} {:>9}  {}"
+    print(fmt.format("HOST", "RATE/S", "FAILURES", "COOLDOWN", "CIRCUIT"))
+    for row in store.all():
+        state = f"open {row['open_until'] - now:.0f}s" if row["open_until"] > now else "closed"
+        print(fmt.format(row["host"], f"{row['rate']:.2f}", row["failures"], f"{row['cooldown']:.0f}s", state))
+
+
+if __name__ == "__main__":
+    main()
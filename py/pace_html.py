@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+pace_html.py
+HTML parsing backends for the static-page scrapers (FlashResults, rtspt,
+Leone) and the logo scans in the Playwright captures.
+
+The scrapers need only a handful of operations on a parsed page: find
+elements, rows/cells of a table, attributes and text. Two backends implement
+them with identical results:
+
+  lxml  lxml.html trees walked directly (no per-node Python objects)
+  bs4   BeautifulSoup on the lxml parser (the original implementation)
+
+Both build the tree with libxml2's HTML parser, and text() matches
+BeautifulSoup's get_text(sep, strip=True), so swapping backends does not
+change scraper output (see diag_html_parity.py). lxml is used when
+importable; PACE_HTML_BACKEND=bs4|lxml forces one.
+"""
+
+import os
+from typing import Any, Iterable, List, Optional
+
+ENV_BACKEND = "PACE_HTML_BACKEND"
+
+# Elements whose strings BeautifulSoup's get_text() leaves out
+_NON_TEXT_TAGS = frozenset(["script", "style", "template"])
+
+
+class LxmlBackend:
+    name = "lxml"
+
+    @staticmethod
+    def parse(html: str) -> Any:
+        import lxml.html
+        from lxml.etree import ParserError
+
+        try:
+            return lxml.html.document_fromstring(html)
+        except ValueError:
+            # str input with an XML encoding declaration
+            return lxml.html.document_fromstring(html.encode("utf-8"))
+        except ParserError:
+            # empty document
+            return lxml.html.document_fromstring("<html></html>")
+
+    @staticmethod
+    def find_all(node: Any, *tags: str) -> List[Any]:
+        return list(node.iterdescendants(*tags))
+
+    @staticmethod
+    def find_first(node: Any, tag: str) -> Optional[Any]:
+        return next(node.iterdescendants(tag), None)
+
+    @staticmethod
+    def find_next(node: Any, tag: str) -> Optional[Any]:
+        """First `tag` element after `node` in document order (its own descendants included)."""
+        found = node.xpath(f"(descendant::{tag} | following::{tag})[1]")
+        return found[0] if found else None
+
+    @staticmethod
+    def rows(table: Any) -> List[Any]:
+        return list(table.iterdescendants("tr"))
+
+    @staticmethod
+    def cells(row: Any, tags: Iterable[str] = ("td", "th")) -> List[Any]:
+        return list(row.iterdescendants(*tags))
+
+    @staticmethod
+    def header_cells(table: Any) -> List[Any]:
+        return table.xpath(".//th[ancestor::tr]")
+
+    @staticmethod
+    def attr(node: Any, name: str, default: str = "") -> str:
+        value = node.get(name)
+        return default if value is None else value
+
+    @staticmethod
+    def text(node: Any, sep: str = " ") -> str:
+        parts: List[str] = []
+
+        def _walk(el: Any) -> None:
+            if isinstance(el.tag, str) and el.tag not in _NON_TEXT_TAGS:
+                if el.text:
+                    s = el.text.strip()
+                    if s:
+                        parts.append(s)
+                for child in el:
+                    _walk(child)
+            # Tails belong to the parent's text, even after comments/scripts
+            if el is not node and el.tail:
+                s = el.tail.strip()
+                if s:
+                    parts.append(s)
+
+        _walk(node)
+        return sep.join(parts)
+
+
+class SoupBackend:
+    name = "bs4"
+
+    @staticmethod
+    def parse(html: str) -> Any:
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, "lxml")
+
+    @staticmethod
+    def find_all(node: Any, *tags: str) -> List[Any]:
+        return node.find_all(list(tags))
+
+    @staticmethod
+    def find_first(node: Any, tag: str) -> Optional[Any]:
+        return node.find(tag)
+
+    @staticmethod
+    def find_next(node: Any, tag: str) -> Optional[Any]:
+        return node.find_next(tag)
+
+    @staticmethod
+    def rows(table: Any) -> List[Any]:
+        return table.select("tr")
+
+    @staticmethod
+    def cells(row: Any, tags: Iterable[str] = ("td", "th")) -> List[Any]:
+        return row.find_all(list(tags))
+
+    @staticmethod
+    def header_cells(table: Any) -> List[Any]:
+        return table.select("tr th")
+
+    @staticmethod
+    def attr(node: Any, name: str, default: str = "") -> str:
+        value = node.get(name)
+        return default if value is None else value
+
+    @staticmethod
+    def text(node: Any, sep: str = " ") -> str:
+        return node.get_text(sep, strip=True)
+
+
+BACKENDS = {LxmlBackend.name: LxmlBackend, SoupBackend.name: SoupBackend}
+
+
+def html_backend(name: Optional[str] = None) -> Any:
+    """Backend by name, $PACE_HTML_BACKEND, or lxml when installed (else bs4)."""
+    name = name or os.getenv(ENV_BACKEND, "")
+    if name:
+        if name not in BACKENDS:
+            raise ValueError(f"unknown HTML backend {name!r} (choose from {', '.join(BACKENDS)})")
+        return BACKENDS[name]
+    try:
+        import lxml.html  # noqa: F401
+        return LxmlBackend
+    except ImportError:
+        return SoupBackend
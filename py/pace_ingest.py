@@ -15,6 +15,10 @@ import pathlib
 import subprocess
 import sys
 
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+from pace_providers import classify_url
+from pace_timing import enable as enable_timing, span
+
 
 def parse_urls_from_file(path: pathlib.Path) -> list[str]:
     """Extract URLs from a race_input.txt-style file."""
@@ -26,18 +30,20 @@ def parse_urls_from_file(path: pathlib.Path) -> list[str]:
     return urls
 
 
-def run_step(label: str, cmd: list[str]) -> bool:
-    """Run a subprocess, print output, return success."""
+def run_step(label: str, cmd: list[str], stage: str = "step", **tags) -> bool:
+    """Run a subprocess, print output, return success (timed as one span)."""
     print(f"\n{'='*60}")
     print(f"  {label}")
     print(f"{'='*60}\n")
-    result = subprocess.run(cmd, capture_output=False)
-    return result.returncode == 0
+    with span(stage, **tags) as rec:
+        rec["ok"] = subprocess.run(cmd, capture_output=False).returncode == 0
+    return rec["ok"]
 
 
 def ingest_url(url: str, data_root: pathlib.Path, force_upload: bool, headful: bool) -> bool:
     """Full pipeline for one URL."""
     py_dir = pathlib.Path(__file__).parent
+    provider = classify_url(url)
 
     # Step 1: Scrape
     scrape_cmd = [
@@ -48,7 +54,7 @@ def ingest_url(url: str, data_root: pathlib.Path, force_upload: bool, headful: b
     if headful:
         scrape_cmd.append("--headful")
 
-    if not run_step(f"SCRAPE: {url}", scrape_cmd):
+    if not run_step(f"SCRAPE: {url}", scrape_cmd, "scrape", provider=provider, url=url):
         print(f"[FAIL] Scraping failed for {url}")
         return False
 
@@ -58,7 +64,7 @@ def ingest_url(url: str, data_root: pathlib.Path, force_upload: bool, headful: b
         "--root", str(data_root),
         "--force",
     ]
-    if not run_step("NORMALIZE", norm_cmd):
+    if not run_step("NORMALIZE", norm_cmd, "normalize", provider=provider):
         print(f"[FAIL] Normalization failed")
         return False
 
@@ -71,7 +77,8 @@ def ingest_url(url: str, data_root: pathlib.Path, force_upload: bool, headful: b
     all_valid = True
     for nf in normalized_files:
         validate_cmd = [sys.executable, str(py_dir / "pace_validate.py"), str(nf)]
-        if not run_step(f"VALIDATE: {nf.parent.name}", validate_cmd):
+        if not run_step(f"VALIDATE: {nf.parent.name}", validate_cmd, "validate",
+                        provider=provider, event_id=nf.parent.name):
             all_valid = False
             print(f"[FAIL] Validation failed for {nf}")
 
@@ -85,7 +92,8 @@ def ingest_url(url: str, data_root: pathlib.Path, force_upload: bool, headful: b
     # Step 4: Upload
     for nf in normalized_files:
         upload_cmd = [sys.executable, str(py_dir / "pace_upload.py"), str(nf)]
-        if not run_step(f"UPLOAD: {nf.parent.name}", upload_cmd):
+        if not run_step(f"UPLOAD: {nf.parent.name}", upload_cmd, "upload",
+                        provider=provider, event_id=nf.parent.name):
             print(f"[FAIL] Upload failed for {nf}")
             return False
 
@@ -100,8 +108,13 @@ def main():
     ap.add_argument("--data-root", default="data", help="Root data directory")
     ap.add_argument("--force-upload", action="store_true", help="Upload even if validation fails")
     ap.add_argument("--headful", action="store_true", help="Visible browser for debugging")
+    ap.add_argument("--timing-log", default="",
+                    help="Append per-stage timing spans (JSON lines) here; report with pace_timing.py")
     args = ap.parse_args()
 
+    if args.timing_log:
+        enable_timing(pathlib.Path(args.timing_log))
+
     urls = list(args.urls)
     if args.from_file:
         urls.extend(parse_urls_from_file(pathlib.Path(args.from_file)))
@@ -12,31 +12,83 @@ Usage:
 
   # With metadata
   python pace_ingest_meet.py --url "..." --auto --meet-name "2026 RMAC Indoor Championships" --date "2026-02-28" --season indoor
+
+  # Overlap scrape / normalize / upload across events
+  python pace_ingest_meet.py --url "..." --auto --pipeline
+
+Without --pipeline every selected event is scraped, normalized and validated
+first; the meet's teams and athletes are then resolved in one bulk pass
+(pace_upload.resolve_entities) before the events are uploaded.
 """
 
 import argparse
 import asyncio
-import json
+import os
 import pathlib
 import subprocess
 import sys
+import tempfile
+import time
+from typing import Optional
 
 
-def run_step(label: str, cmd: list) -> bool:
-    """Run a subprocess step, return success."""
+PY_DIR = pathlib.Path(__file__).parent
+sys.path.insert(0, str(PY_DIR))
+
+import pace_hosts
+from pace_coalesce import Coalescer
+from pace_hosts import HostUnavailable
+from pace_providers import classify_url, fetch_target
+from pace_timing import enable as enable_timing, span
+
+# Scrapes done this run, keyed by fetch target: all pttiming events of a meet
+# share one scraper run, and concurrent pipeline/job workers wait for it.
+SCRAPES = Coalescer()
+
+
+def start_run() -> None:
+    """Forget what the previous run cached: scrapes and resolved team/athlete ids."""
+    SCRAPES.clear()
+    upload = sys.modules.get("pace_upload")
+    if upload is not None:  # only imported once something was uploaded
+        upload.ENTITIES.clear()
+
+
+def print_header(label: str) -> None:
     print(f"\n{'='*60}")
     print(f"  {label}")
     print(f"{'='*60}\n")
+
+
+def run_step(label: str, cmd: list) -> bool:
+    """Run a subprocess step, return success."""
+    print_header(label)
     result = subprocess.run(cmd, capture_output=False)
     return result.returncode == 0
 
 
-def ingest_event(event: dict, data_root: pathlib.Path, extra_meta: dict) -> bool:
-    """Run the full pipeline for one event."""
-    py_dir = pathlib.Path(__file__).parent
-    href = event["href"]
-    event_id = event["id"]
+def run_scraper(label: str, cmd: list, href: str) -> bool:
+    """
+    run_step for pace_scraper.py. A scraper stopped by an open circuit raises
+    HostUnavailable here for the host it reported (the page's or an API host
+    behind it), so callers can defer rather than count a failure.
+    """
+    fd, report = tempfile.mkstemp(prefix="pace_host_", suffix=".json")
+    os.close(fd)
+    try:
+        print_header(label)
+        result = subprocess.run(cmd, capture_output=False,
+                                env={**os.environ, pace_hosts.ENV_REPORT: report})
+        if result.returncode == pace_hosts.EXIT_HOST_UNAVAILABLE:
+            raise pace_hosts.read_report(pathlib.Path(report)) or HostUnavailable(
+                pace_hosts.url_host(href), time.time() + pace_hosts.BASE_COOLDOWN_S)
+        return result.returncode == 0
+    finally:
+        os.unlink(report)
 
+
+def build_event_meta(event: dict, extra_meta: dict) -> dict:
+    """Build the upload metadata for one discovered event."""
     # Build event name: meet name prefix + event name
     meet_prefix = extra_meta.get("meet_name", "")
     event_name = event["name"]
@@ -49,74 +101,194 @@ def ingest_event(event: dict, data_root: pathlib.Path, extra_meta: dict) -> bool
     if event.get("round") == "Prelim" and "prelim" not in full_name.lower():
         full_name = full_name.rstrip() + " Prelims"
 
-    event_meta = {
+    return {
         "name": full_name,
         "distance": event["distance"] or event["category"],
         "gender": event["gender"],
         "season": extra_meta.get("season", "indoor"),
         "date": extra_meta.get("date", ""),
         "location": extra_meta.get("location", ""),
-        "source_url": href,
+        "source_url": event["href"],
     }
-    meta_json = json.dumps(event_meta)
 
-    # Step 1: Scrape
-    if not run_step(f"SCRAPE: {href}", [
-        sys.executable, str(py_dir / "pace_scraper.py"),
-        "--url", href, "--outdir", str(data_root),
-    ]):
-        print(f"[FAIL] Scraping failed for {href}")
-        return False
 
-    # Step 2: Normalize
-    normalize_cmd = [
-        sys.executable, str(py_dir / "pace_normalize.py"),
-        "--root", str(data_root), "--force",
+def find_event_dir(data_root: pathlib.Path, event: dict) -> Optional[pathlib.Path]:
+    """Locate the scraped bundle directory for a discovered event."""
+    # Primary: direct path by discover event_id
+    candidates = [data_root / event["id"]]
+    # Secondary: derive the scraper output dir from the URL (handles TrackScoreboard
+    # and other providers where event_id_from_url differs from discover's event_id)
+    try:
+        from pace_scraper import event_id_from_url as _scraper_eid
+        candidates.append(data_root / _scraper_eid(event["href"]))
+    except Exception:
+        pass
+    for d in candidates:
+        if (d / "split_report.json").exists() or (d / "ind_res_list.json").exists():
+            return d
+    return None
+
+
+def scrape_stage(href: str, data_root: pathlib.Path, refresh: bool = False) -> bool:
+    """
+    Scrape one event URL into data_root (subprocess keeps Playwright isolated).
+
+    Coalesced per run by fetch target: a target already scraped successfully
+    (or in flight on another thread) is not fetched again. Raises
+    HostUnavailable when a host's circuit stopped the scraper.
+    """
+    cmd = [
+        sys.executable, str(PY_DIR / "pace_scraper.py"),
+        "--url", href, "--outdir", str(data_root),
     ]
-    if event_meta.get("distance"):
-        normalize_cmd += ["--distance", event_meta["distance"]]
-    if event_meta.get("season"):
-        normalize_cmd += ["--season", event_meta["season"]]
-    if not run_step("NORMALIZE", normalize_cmd):
-        print("[FAIL] Normalization failed")
-        return False
+    if refresh:
+        cmd.append("--refresh")
 
-    # Step 3: Find normalized file and validate
-    # Primary: direct path by discover event_id
-    normalized_file = data_root / event_id / "pace_normalized.json"
-    if not normalized_file.exists():
-        # Secondary: derive the scraper output dir from the URL (handles TrackScoreboard
-        # and other providers where event_id_from_url differs from discover's event_id)
-        try:
-            sys.path.insert(0, str(py_dir))
-            from pace_scraper import event_id_from_url as _scraper_eid
-            scraper_eid = _scraper_eid(href)
-            alt_file = data_root / scraper_eid / "pace_normalized.json"
-            if alt_file.exists():
-                normalized_file = alt_file
-        except Exception:
-            pass
-    if not normalized_file.exists():
-        print(f"[FAIL] No pace_normalized.json found for event {event_id}")
-        return False
+    def _run() -> bool:
+        with span("scrape", provider=classify_url(href), url=href) as rec:
+            rec["ok"] = run_scraper(f"SCRAPE: {href}", cmd, href)
+        return rec["ok"]
+
+    key = f"{fetch_target(href)}|{data_root.resolve()}|{'refresh' if refresh else ''}"
+    return SCRAPES.run(key, _run)
+
+
+def scrape_meet_stage(hrefs: list, data_root: pathlib.Path) -> bool:
+    """Scrape several events of one meet in a single scraper run (shared browser page)."""
+    with span("scrape.meet", provider=classify_url(hrefs[0]), events=len(hrefs)) as rec:
+        rec["ok"] = run_scraper(f"SCRAPE: {len(hrefs)} events", [
+            sys.executable, str(PY_DIR / "pace_scraper.py"),
+            "--url", *hrefs, "--outdir", str(data_root),
+        ], hrefs[0])
+    return rec["ok"]
+
+
+def normalize_stage(event_dir: pathlib.Path, event_meta: dict) -> Optional[dict]:
+    """Normalize one event's bundle; returns the pace.v1 dict (also written to disk)."""
+    from pace_normalize import distance_str_to_meters, normalize_distance, normalize_event_dir
+
+    distance = normalize_distance(event_meta.get("distance") or "")
+    race_m = distance_str_to_meters(distance) if distance else None
+    return normalize_event_dir(event_dir, race_m, event_meta.get("season") or None)
 
-    if not run_step(f"VALIDATE: {event_id}", [
-        sys.executable, str(py_dir / "pace_validate.py"), str(normalized_file),
-    ]):
-        print(f"[WARN] Validation failed for {event_id} — skipping upload")
+
+def validate_stage(norm: dict, event_dir: pathlib.Path) -> bool:
+    """Validate an in-memory pace.v1 dict and print the report."""
+    from pace_validate import format_report, validate_pace_v1
+
+    passed, report = format_report(
+        norm, validate_pace_v1(norm), event_dir / "pace_normalized.json"
+    )
+    print(report)
+    return passed
+
+
+def resolve_stage(events: list) -> bool:
+    """
+    Resolve the teams and athletes of several events (a meet) in one bulk pass.
+    `events` holds (norm, event_meta) pairs; events upload_event would skip as
+    out of scope are left out so they create no team/athlete rows.
+    """
+    try:
+        from pace_upload import in_scope, resolve_entities
+        norms = [norm for norm, event_meta in events if in_scope(event_meta)]
+        athletes = sum(len(n.get("athletes", [])) for n in norms)
+        print_header(f"RESOLVE: {athletes} athlete entries in {len(norms)} event(s)")
+        with span("resolve", events=len(norms), athletes=athletes) as rec:
+            rec["entities"] = len(resolve_entities(norms))
+    except (Exception, SystemExit) as e:
+        # Each upload resolves its own event instead
+        print(f"[resolve] error: {type(e).__name__}: {e}")
         return False
+    print(f"[resolve] {rec['entities']} distinct athlete(s)")
+    return True
+
 
-    # Step 4: Upload with metadata
-    if not run_step(f"UPLOAD: {event_id}", [
-        sys.executable, str(py_dir / "pace_upload.py"),
-        str(normalized_file), "--meta", meta_json,
-    ]):
-        print(f"[FAIL] Upload failed for {event_id}")
+def upload_stage(norm: dict, event_meta: dict) -> bool:
+    """Upload an in-memory pace.v1 dict with its event metadata."""
+    try:
+        from pace_upload import upload_event
+        upload_event(norm, event_meta)
+    except (Exception, SystemExit) as e:
+        print(f"[upload] error: {type(e).__name__}: {e}")
         return False
+    return True
+
 
+def _event_tags(event_dir: pathlib.Path, event_meta: dict) -> dict:
+    return {"provider": classify_url(event_meta.get("source_url") or ""), "event_id": event_dir.name}
+
+
+def prepare_event_dir(event_dir: pathlib.Path, event_meta: dict) -> Optional[dict]:
+    """Normalize -> validate one scraped event; returns the pace.v1 dict if it may be uploaded."""
+    tags = _event_tags(event_dir, event_meta)
+
+    print_header(f"NORMALIZE: {event_dir.name}")
+    with span("normalize", **tags) as rec:
+        norm = normalize_stage(event_dir, event_meta)
+        rec["ok"] = norm is not None
+    if norm is None:
+        print(f"[FAIL] Normalization failed for {event_dir.name}")
+        return None
+
+    print_header(f"VALIDATE: {event_dir.name}")
+    with span("validate", **tags) as rec:
+        rec["ok"] = validate_stage(norm, event_dir)
+    if not rec["ok"]:
+        print(f"[WARN] Validation failed for {event_dir.name} — skipping upload")
+        return None
+    return norm
+
+
+def upload_event_dir(event_dir: pathlib.Path, norm: dict, event_meta: dict) -> bool:
+    """Upload one prepared event (teams/athletes come from the run's id cache when resolved)."""
+    print_header(f"UPLOAD: {event_dir.name}")
+    with span("upload", athletes=len(norm.get("athletes", [])), **_event_tags(event_dir, event_meta)) as rec:
+        rec["ok"] = upload_stage(norm, event_meta)
+    if not rec["ok"]:
+        print(f"[FAIL] Upload failed for {event_dir.name}")
+        return False
     return True
 
 
+def process_event_dir(event_dir: pathlib.Path, event_meta: dict) -> bool:
+    """Normalize -> validate -> upload one scraped event, parsing its JSON once."""
+    norm = prepare_event_dir(event_dir, event_meta)
+    return norm is not None and upload_event_dir(event_dir, norm, event_meta)
+
+
+def prepare_event(event: dict, data_root: pathlib.Path, extra_meta: dict,
+                  scrape: bool = True) -> Optional[tuple]:
+    """Scrape -> normalize -> validate one event; returns (event_dir, event_meta, norm) or None."""
+    href = event["href"]
+    event_meta = build_event_meta(event, extra_meta)
+
+    # Step 1: Scrape
+    try:
+        scraped = not scrape or scrape_stage(href, data_root)
+    except HostUnavailable as e:
+        print(f"[FAIL] {e}; not scraping {href}")
+        return None
+    if not scraped:
+        print(f"[FAIL] Scraping failed for {href}")
+        return None
+
+    # Steps 2-3: normalize and validate in-process on the same dict
+    event_dir = find_event_dir(data_root, event)
+    if event_dir is None:
+        print(f"[FAIL] No scraped bundle found for event {event['id']}")
+        return None
+    norm = prepare_event_dir(event_dir, event_meta)
+    return None if norm is None else (event_dir, event_meta, norm)
+
+
+def ingest_event(event: dict, data_root: pathlib.Path, extra_meta: dict,
+                 scrape: bool = True) -> bool:
+    """Run the full pipeline for one event (scrape=False if already scraped in a batch)."""
+    prepared = prepare_event(event, data_root, extra_meta, scrape)
+    return prepared is not None and upload_event_dir(*prepared)
+
+
 def main():
     ap = argparse.ArgumentParser(description="Meet-level batch ingest pipeline")
     ap.add_argument("--url", required=True, help="Meet URL")
@@ -126,8 +298,26 @@ def main():
     ap.add_argument("--season", default="indoor", choices=["indoor", "outdoor", "xc"], help="Season")
     ap.add_argument("--location", default="", help="Meet location")
     ap.add_argument("--data-root", default="data", help="Root data directory")
+    ap.add_argument("--pipeline", action="store_true",
+                    help="Overlap stages across events (per-stage worker pools, see pace_pipeline.py)")
+    ap.add_argument("--timing-log", default="",
+                    help="Append per-stage timing spans (JSON lines) here; report with pace_timing.py")
+    ap.add_argument("--rediscover", action="store_true",
+                    help="Ignore the discovery cache TTL (the cached list is still reused if unchanged)")
+    ap.add_argument("--archive", default="",
+                    help="Store the scrapers' raw responses in this directory (see pace_archive.py)")
     args = ap.parse_args()
 
+    if args.timing_log:
+        enable_timing(pathlib.Path(args.timing_log))
+    if args.archive:
+        from pace_archive import enable as enable_archive
+        enable_archive(pathlib.Path(args.archive))
+
+    data_root = pathlib.Path(args.data_root)
+    data_root.mkdir(parents=True, exist_ok=True)
+    pace_hosts.enable_default(data_root)
+
     # Import discovery logic
     import importlib.util
     spec = importlib.util.spec_from_file_location(
@@ -137,7 +327,13 @@ def main():
     spec.loader.exec_module(discover_mod)
 
     print(f"\nDiscovering events at: {args.url}")
-    events = discover_mod.discover_meet(args.url)
+    with span("discover", provider=classify_url(args.url), url=args.url) as rec:
+        events = discover_mod.discover_meet(
+            args.url, data_root / "_discover",
+            0 if args.rediscover else discover_mod.DISCOVER_TTL_S,
+            scrape_root=data_root,
+        )
+        rec["events"] = len(events)
 
     if not events:
         print("No events found on this meet page.")
@@ -177,15 +373,37 @@ def main():
         "location": args.location,
     }
 
-    data_root = pathlib.Path(args.data_root)
-    data_root.mkdir(parents=True, exist_ok=True)
+    # TrackScoreboard SSR meets: capture all events in one page up front
+    ts_hrefs = [e["href"] for e in selected if classify_url(e["href"]) == "trackscoreboard_html"]
+    prescraped = set()
+    try:
+        if len(ts_hrefs) > 1 and scrape_meet_stage(ts_hrefs, data_root):
+            prescraped = set(ts_hrefs)
+    except HostUnavailable as e:
+        print(f"[WARN] {e}; meet capture skipped")
 
     print(f"\nIngesting {len(selected)} event(s)...\n")
     results = []
-    for event in selected:
-        print(f"\n--- {event['id']}: {event['name']} ---")
-        ok = ingest_event(event, data_root, extra_meta)
-        results.append((event["id"], event["name"], ok))
+    if args.pipeline:
+        from pace_pipeline import Pipeline
+        outcome = Pipeline(data_root).run([
+            {"event": e, "extra_meta": extra_meta, "scraped": e["href"] in prescraped}
+            for e in selected
+        ])
+        results = [(e["id"], e["name"], outcome.get(e["id"], False)) for e in selected]
+    else:
+        prepared = {}
+        for event in selected:
+            print(f"\n--- {event['id']}: {event['name']} ---")
+            done = prepare_event(event, data_root, extra_meta, scrape=event["href"] not in prescraped)
+            if done is not None:
+                prepared[event["id"]] = done
+        # One lookup pass for the whole meet; uploads then hit the id cache
+        if prepared:
+            resolve_stage([(norm, event_meta) for _, event_meta, norm in prepared.values()])
+        for event in selected:
+            ok = event["id"] in prepared and upload_event_dir(*prepared[event["id"]])
+            results.append((event["id"], event["name"], ok))
 
     # Summary
     print(f"\n{'='*60}")
@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+pace_jobs.py
+Persistent (SQLite) job queue for batch meet ingests.
+
+Every unit of work is a (meet_url, event_id, stage) row with a state, attempt
+count and JSON payload. Stages chain by enqueuing their successor:
+
+  discover (per meet) -> scrape -> normalize (+validate) -> upload (per event)
+
+Enqueueing is idempotent (UNIQUE on meet/event/stage), and each stage's
+output is checkpointed on disk (scraped bundle, pace_normalized.json) before
+the job is marked done, so an interrupted or partially failed run resumes
+exactly where it stopped. Each claimed job records its owner (host:pid) and a
+heartbeat the owning run refreshes; at the next start, jobs left 'running' by
+a run that died (owner gone or heartbeat stale) are reset to 'pending', while
+those of another live run are left alone.
+
+trackscoreboard_html scrape jobs of one meet share a single browser capture:
+the first one to run scrapes every pending sibling of its meet at once, and
+the others find their bundles already on disk.
+
+Host health (pace_hosts) is kept in the same database. A discover/scrape job
+whose host circuit is open is deferred until the cooldown ends rather than
+failed: the attempt is handed back and the job is not claimed before then
+(up to MAX_DEFERRALS times).
+
+Usage:
+  python pace_jobs.py add --url "https://live.xpresstiming.com/meets/60861" \\
+      --meet-name "2026 AAC Indoor Championships" --date 2026-02-27 --season indoor
+  python pace_jobs.py run --workers 4
+  python pace_jobs.py status
+  python pace_jobs.py retry-failed
+"""
+
+import argparse
+import datetime as dt
+import json
+import os
+import pathlib
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PY_DIR = pathlib.Path(__file__).parent
+sys.path.insert(0, str(PY_DIR))
+
+import pace_hosts
+from pace_coalesce import Coalescer
+from pace_hosts import HostUnavailable
+from pace_providers import classify_url
+
+DEFAULT_DB = "data/pace_jobs.sqlite"
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_ATTEMPTS = 3
+MAX_DEFERRALS = 20
+HEARTBEAT_S = 30      # how often a run refreshes its running jobs
+STALE_AFTER_S = 180   # running jobs with an older heartbeat belong to a dead run
+
+STAGES = ("discover", "scrape", "normalize", "upload")
+NEXT_STAGE = {"discover": None, "scrape": "normalize", "normalize": "upload", "upload": None}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    meet_url     TEXT NOT NULL,
+    event_id     TEXT NOT NULL DEFAULT '',
+    stage        TEXT NOT NULL,
+    state        TEXT NOT NULL DEFAULT 'pending',
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    payload      TEXT NOT NULL DEFAULT '{}',
+    error        TEXT NOT NULL DEFAULT '',
+    updated_at   TEXT NOT NULL,
+    not_before   REAL NOT NULL DEFAULT 0,
+    deferrals    INTEGER NOT NULL DEFAULT 0,
+    owner        TEXT NOT NULL DEFAULT '',
+    heartbeat    REAL NOT NULL DEFAULT 0,
+    UNIQUE (meet_url, event_id, stage)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+"""
+
+# This process, as recorded in jobs.owner
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+# Meet-level trackscoreboard_html captures done this run, keyed by meet + data root
+MEET_SCRAPES = Coalescer()
+
+
+class PermanentJobError(Exception):
+    """A failure that retrying cannot fix (e.g. validation errors)."""
+
+
+def _now() -> str:
+    return dt.datetime.now().isoformat(timespec="seconds")
+
+
+def _owner_alive(owner: str) -> Optional[bool]:
+    """Whether a job owner's process still runs; None if it is on another host."""
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return None
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobQueue:
+    """SQLite-backed job queue. Safe to share across threads (one connection each)."""
+
+    def __init__(self, db_path: pathlib.Path):
+        self.db_path = pathlib.Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, meet_url: str, stage: str, event_id: str = "",
+                payload: Optional[dict] = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> bool:
+        """Add a job unless (meet_url, event_id, stage) already exists. Returns True if added."""
+        cur = self._conn().execute(
+            "INSERT OR IGNORE INTO jobs (meet_url, event_id, stage, max_attempts, payload, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (meet_url, event_id, stage, max_attempts, json.dumps(payload or {}), _now()),
+        )
+        return cur.rowcount > 0
+
+    def claim(self, stages: Optional[List[str]] = None) -> Optional[sqlite3.Row]:
+        """Atomically move the oldest due pending job (optionally of given stages) to running."""
+        conn = self._conn()
+        where = "state = 'pending' AND not_before <= ?"
+        args: List[Any] = [time.time()]
+        if stages:
+            where += f" AND stage IN ({','.join('?' * len(stages))})"
+            args.extend(stages)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(f"SELECT * FROM jobs WHERE {where} ORDER BY id LIMIT 1", args).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET state = 'running', attempts = attempts + 1, owner = ?, heartbeat = ?, "
+                    "updated_at = ? WHERE id = ?",
+                    (OWNER, time.time(), _now(), row["id"]),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        return conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+
+    def complete(self, job_id: int) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET state = 'done', error = '', updated_at = ? WHERE id = ?", (_now(), job_id)
+        )
+
+    def fail(self, job_id: int, error: str, permanent: bool = False) -> str:
+        """Record a failure; the job goes back to pending until its attempts run out."""
+        conn = self._conn()
+        row = conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        state = "failed" if permanent or row["attempts"] >= row["max_attempts"] else "pending"
+        conn.execute(
+            "UPDATE jobs SET state = ?, error = ?, updated_at = ? WHERE id = ?",
+            (state, error[:2000], _now(), job_id),
+        )
+        return state
+
+    def defer(self, job_id: int, until: float, reason: str) -> str:
+        """
+        Put a job back to pending without using up an attempt, not to be claimed
+        before `until` (unix time). Fails it once MAX_DEFERRALS is reached.
+        """
+        conn = self._conn()
+        row = conn.execute("SELECT deferrals FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row["deferrals"] >= MAX_DEFERRALS:
+            conn.execute(
+                "UPDATE jobs SET state = 'failed', error = ?, updated_at = ? WHERE id = ?",
+                (f"deferred {MAX_DEFERRALS} times: {reason}"[:2000], _now(), job_id),
+            )
+            return "failed"
+        conn.execute(
+            "UPDATE jobs SET state = 'pending', attempts = MAX(0, attempts - 1), "
+            "deferrals = deferrals + 1, not_before = ?, error = ?, updated_at = ? WHERE id = ?",
+            (until, reason[:2000], _now(), job_id),
+        )
+        return "pending"
+
+    def heartbeat(self) -> None:
+        """Mark this process's running jobs as still being worked on."""
+        self._conn().execute(
+            "UPDATE jobs SET heartbeat = ? WHERE state = 'running' AND owner = ?", (time.time(), OWNER)
+        )
+
+    def reset_running(self) -> int:
+        """
+        Jobs left 'running' by an interrupted run go back to pending. A job is
+        only taken over when its heartbeat is older than STALE_AFTER_S or its
+        owner process (on this host) is gone; another live run's jobs stay.
+        """
+        conn = self._conn()
+        cutoff = time.time() - STALE_AFTER_S
+        stale = [
+            row["id"] for row in conn.execute("SELECT id, owner, heartbeat FROM jobs WHERE state = 'running'")
+            if row["owner"] != OWNER and (row["heartbeat"] < cutoff or _owner_alive(row["owner"]) is False)
+        ]
+        for job_id in stale:
+            conn.execute(
+                "UPDATE jobs SET state = 'pending', updated_at = ? WHERE id = ? AND state = 'running'",
+                (_now(), job_id),
+            )
+        return len(stale)
+
+    def jobs(self, meet_url: str, stage: str, states: Tuple[str, ...] = ("pending", "running")) -> List[sqlite3.Row]:
+        """Jobs of one meet and stage in the given states."""
+        return self._conn().execute(
+            f"SELECT * FROM jobs WHERE meet_url = ? AND stage = ? AND state IN ({','.join('?' * len(states))}) "
+            "ORDER BY id",
+            (meet_url, stage, *states),
+        ).fetchall()
+
+    def retry_failed(self) -> int:
+        cur = self._conn().execute(
+            "UPDATE jobs SET state = 'pending', attempts = 0, deferrals = 0, not_before = 0, updated_at = ? "
+            "WHERE state = 'failed'", (_now(),)
+        )
+        return cur.rowcount
+
+    def active_count(self) -> int:
+        row = self._conn().execute(
+            "SELECT COUNT(*) FROM jobs WHERE state IN ('pending', 'running')"
+        ).fetchone()
+        return row[0]
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """{stage: {state: n}}"""
+        out: Dict[str, Dict[str, int]] = {}
+        for row in self._conn().execute("SELECT stage, state, COUNT(*) n FROM jobs GROUP BY stage, state"):
+            out.setdefault(row["stage"], {})[row["state"]] = row["n"]
+        return out
+
+    def deferred(self) -> List[sqlite3.Row]:
+        """Pending jobs waiting out a host cooldown."""
+        return self._conn().execute(
+            "SELECT * FROM jobs WHERE state = 'pending' AND not_before > ? ORDER BY not_before",
+            (time.time(),),
+        ).fetchall()
+
+    def failed(self) -> List[sqlite3.Row]:
+        return self._conn().execute(
+            "SELECT * FROM jobs WHERE state = 'failed' ORDER BY meet_url, event_id, stage"
+        ).fetchall()
+
+
+# ---------------- stage handlers ----------------
+# handler(queue, job, payload, data_root) -> None; raise on failure.
+# Each handler enqueues the next stage only after its own output is on disk.
+
+def _enqueue_next(queue: JobQueue, job: sqlite3.Row, payload: dict) -> None:
+    nxt = NEXT_STAGE[job["stage"]]
+    if nxt:
+        queue.enqueue(job["meet_url"], nxt, job["event_id"], payload)
+
+
+def handle_discover(queue: JobQueue, job: sqlite3.Row, payload: dict, data_root: pathlib.Path) -> None:
+    from pace_discover import discover_meet
+
+    pace_hosts.check(job["meet_url"])
+    started = time.time()
+    try:
+        events = [
+            e for e in discover_meet(job["meet_url"], data_root / "_discover", scrape_root=data_root)
+            if e["category"] == "distance"
+        ]
+    except Exception:
+        # Discovery aborts requests to broken hosts (often the API behind the page)
+        tripped = pace_hosts.tripped_since(started)
+        if tripped is not None:
+            raise tripped from None
+        raise
+    if not events:
+        tripped = pace_hosts.tripped_since(started)
+        if tripped is not None:
+            raise tripped
+        raise RuntimeError("no distance events discovered")
+    added = 0
+    for event in events:
+        added += queue.enqueue(
+            job["meet_url"], "scrape", event["id"],
+            {"event": event, "extra_meta": payload.get("extra_meta", {})},
+        )
+    print(f"[jobs] {job['meet_url']}: {len(events)} distance event(s), {added} new")
+
+
+def _scrape_meet_batch(queue: JobQueue, job: sqlite3.Row, data_root: pathlib.Path) -> None:
+    """Capture all not-yet-scraped trackscoreboard_html scrape jobs of the job's meet in one page."""
+    from pace_ingest_meet import find_event_dir, scrape_meet_stage
+
+    hrefs = []
+    for sibling in queue.jobs(job["meet_url"], "scrape"):
+        event = json.loads(sibling["payload"]).get("event") or {}
+        if classify_url(event.get("href", "")) == "trackscoreboard_html" \
+                and find_event_dir(data_root, event) is None:
+            hrefs.append(event["href"])
+    if len(hrefs) > 1:
+        # Sibling jobs on other worker threads wait for this capture instead of opening their own
+        MEET_SCRAPES.run(f"{job['meet_url']}|{data_root.resolve()}",
+                         lambda: scrape_meet_stage(hrefs, data_root))
+
+
+def handle_scrape(queue: JobQueue, job: sqlite3.Row, payload: dict, data_root: pathlib.Path) -> None:
+    from pace_ingest_meet import find_event_dir, scrape_stage
+
+    event = payload["event"]
+    pace_hosts.check(event["href"])
+    if classify_url(event["href"]) == "trackscoreboard_html":
+        _scrape_meet_batch(queue, job, data_root)
+        if find_event_dir(data_root, event) is not None:
+            _enqueue_next(queue, job, payload)
+            return
+    # Raises HostUnavailable for whichever host stopped the scraper (page or API)
+    if not scrape_stage(event["href"], data_root):
+        raise RuntimeError(f"scrape failed: {event['href']}")
+    if find_event_dir(data_root, event) is None:
+        raise RuntimeError(f"no scraped bundle for {event['id']}")
+    _enqueue_next(queue, job, payload)
+
+
+def handle_normalize(queue: JobQueue, job: sqlite3.Row, payload: dict, data_root: pathlib.Path) -> None:
+    from pace_ingest_meet import build_event_meta, find_event_dir, normalize_stage, validate_stage
+
+    event = payload["event"]
+    event_dir = find_event_dir(data_root, event)
+    if event_dir is None:
+        raise RuntimeError(f"no scraped bundle for {event['id']}")
+    norm = normalize_stage(event_dir, build_event_meta(event, payload.get("extra_meta", {})))
+    if norm is None:
+        raise RuntimeError(f"normalization failed for {event_dir.name}")
+    if not validate_stage(norm, event_dir):
+        raise PermanentJobError(f"validation failed for {event_dir.name}")
+    _enqueue_next(queue, job, payload)
+
+
+def handle_upload(queue: JobQueue, job: sqlite3.Row, payload: dict, data_root: pathlib.Path) -> None:
+    from pace_ingest_meet import build_event_meta, find_event_dir, upload_stage
+
+    event = payload["event"]
+    event_dir = find_event_dir(data_root, event)
+    norm_path = event_dir / "pace_normalized.json" if event_dir else None
+    if norm_path is None or not norm_path.exists():
+        raise RuntimeError(f"no pace_normalized.json for {event['id']}")
+    norm = json.loads(norm_path.read_text(encoding="utf-8"))
+    if not upload_stage(norm, build_event_meta(event, payload.get("extra_meta", {}))):
+        raise RuntimeError(f"upload failed for {event_dir.name}")
+
+
+STAGE_HANDLERS: Dict[str, Callable[[JobQueue, sqlite3.Row, dict, pathlib.Path], None]] = {
+    "discover": handle_discover,
+    "scrape": handle_scrape,
+    "normalize": handle_normalize,
+    "upload": handle_upload,
+}
+
+
+def run_job(queue: JobQueue, job: sqlite3.Row, data_root: pathlib.Path) -> bool:
+    """Run one claimed job through its stage handler and record the outcome."""
+    label = f"{job['stage']} {job['event_id'] or job['meet_url']} (attempt {job['attempts']})"
+    print(f"[jobs] start {label}")
+    try:
+        STAGE_HANDLERS[job["stage"]](queue, job, json.loads(job["payload"]), data_root)
+    except HostUnavailable as e:
+        state = queue.defer(job["id"], e.retry_at, f"{type(e).__name__}: {e}")
+        print(f"[jobs] {'deferred' if state == 'pending' else 'failed'} {label}: {e}")
+        return False
+    except PermanentJobError as e:
+        queue.fail(job["id"], str(e), permanent=True)
+        print(f"[jobs] failed {label}: {e}")
+        return False
+    except (Exception, SystemExit) as e:
+        state = queue.fail(job["id"], f"{type(e).__name__}: {e}")
+        print(f"[jobs] {'retry' if state == 'pending' else 'failed'} {label}: {e}")
+        return False
+    queue.complete(job["id"])
+    print(f"[jobs] done {label}")
+    return True
+
+
+def run_queue(queue: JobQueue, data_root: pathlib.Path, workers: int = DEFAULT_WORKERS,
+              poll_s: float = 1.0) -> None:
+    """Drain the queue with a pool of worker threads; returns when nothing is pending or running."""
+    # Scraper subprocesses inherit this and share host health with the queue
+    pace_hosts.enable(queue.db_path)
+    reset = queue.reset_running()
+    if reset:
+        print(f"[jobs] resumed {reset} interrupted job(s)")
+
+    def _worker() -> None:
+        while True:
+            job = queue.claim()
+            if job is None:
+                # Another worker may still enqueue follow-up stages
+                if queue.active_count() == 0:
+                    return
+                time.sleep(poll_s)
+                continue
+            run_job(queue, job, data_root)
+
+    stop = threading.Event()
+
+    def _heartbeat() -> None:
+        # Keeps this run's jobs from looking abandoned, and takes over those of runs that died
+        while not stop.wait(HEARTBEAT_S):
+            queue.heartbeat()
+            taken = queue.reset_running()
+            if taken:
+                print(f"[jobs] took over {taken} job(s) of a stopped run")
+
+    beat = threading.Thread(target=_heartbeat, daemon=True)
+    beat.start()
+    threads = [threading.Thread(target=_worker, daemon=True) for _ in range(max(1, workers))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop.set()
+    beat.join()
+
+
+def print_status(queue: JobQueue) -> None:
+    counts = queue.counts()
+    states = ("pending", "running", "done", "failed")
+    fmt = "{:<10}" + "{:>9}" * len(states)
+    print(fmt.format("STAGE", *states))
+    print("-" * (10 + 9 * len(states)))
+    for stage in STAGES:
+        row = counts.get(stage, {})
+        print(fmt.format(stage, *(row.get(s, 0) for s in states)))
+    deferred = queue.deferred()
+    if deferred:
+        now = time.time()
+        print(f"\nDeferred ({len(deferred)}):")
+        for job in deferred:
+            print(f"  {job['stage']:<10} {job['event_id'] or '-':>14}  {job['meet_url']}"
+                  f"  (in {job['not_before'] - now:.0f}s, deferral {job['deferrals']})")
+    failed = queue.failed()
+    if failed:
+        print(f"\nFailed ({len(failed)}):")
+        for job in failed:
+            print(f"  {job['stage']:<10} {job['event_id'] or '-':>14}  {job['meet_url']}")
+            print(f"             {job['error']}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Persistent job queue for batch meet ingests")
+    ap.add_argument("--db", default=DEFAULT_DB, help=f"Queue database (default {DEFAULT_DB})")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    add = sub.add_parser("add", help="Enqueue a meet (discover job)")
+    add.add_argument("--url", required=True, help="Meet URL")
+    add.add_argument("--meet-name", default="", help="Meet name prefix for event names")
+    add.add_argument("--date", default="", help="Event date (YYYY-MM-DD)")
+    add.add_argument("--season", default="indoor", choices=["indoor", "outdoor", "xc"], help="Season")
+    add.add_argument("--location", default="", help="Meet location")
+    add.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+
+    run = sub.add_parser("run", help="Work through pending jobs")
+    run.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    run.add_argument("--data-root", default="data", help="Root data directory")
+
+    sub.add_parser("status", help="Show job counts and failures")
+    sub.add_parser("retry-failed", help="Reset failed jobs to pending")
+    args = ap.parse_args()
+
+    queue = JobQueue(pathlib.Path(args.db))
+
+    if args.cmd == "add":
+        extra_meta = {
+            "meet_name": args.meet_name,
+            "date": args.date,
+            "season": args.season,
+            "location": args.location,
+        }
+        added = queue.enqueue(args.url, "discover", payload={"extra_meta": extra_meta},
+                              max_attempts=args.max_attempts)
+        print(f"[jobs] {'queued' if added else 'already queued'}: {args.url}")
+    elif args.cmd == "run":
+        data_root = pathlib.Path(args.data_root)
+        data_root.mkdir(parents=True, exist_ok=True)
+        run_queue(queue, data_root, args.workers)
+        print_status(queue)
+        sys.exit(1 if queue.failed() else 0)
+    elif args.cmd == "status":
+        print_status(queue)
+    elif args.cmd == "retry-failed":
+        print(f"[jobs] {queue.retry_failed()} job(s) reset to pending")
+
+
+if __name__ == "__main__":
+    main()
@@ -60,23 +60,7 @@ import pathlib
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
-
-DISTANCE_NORMALIZE_MAP = {
-    "800": "800m", "800M": "800m",
-    "1500": "1500m", "1500M": "1500m",
-    "mile": "Mile", "MILE": "Mile",
-    "3000": "3000m", "3000M": "3000m",
-    "5000": "5000m", "5,000": "5000m", "5000M": "5000m",
-    "10000": "10,000m", "10,000": "10,000m", "10000m": "10,000m", "10000M": "10,000m",
-    "5k": "5K",
-    "8k": "8K",
-    "10k": "10K",
-}
-
-
-def normalize_distance(distance: str) -> str:
-    """Normalize distance string to canonical form."""
-    return DISTANCE_NORMALIZE_MAP.get(distance, distance)
+from pace_classify import normalize_distance
 
 
 # ---------- small helpers ----------
@@ -752,6 +736,30 @@ def normalize_event(event_id: str,
     }
 
 
+def normalize_event_dir(event_dir: pathlib.Path,
+                        race_m: Optional[float] = None,
+                        season: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Normalize one cached event directory and write its pace_normalized.json.
+    Returns the pace.v1 dict so callers can hand it straight to validation and
+    upload, or None if the directory has no raw bundle.
+    """
+    sr = load_json(event_dir / "split_report.json")
+    ir = load_json(event_dir / "ind_res_list.json")
+    if sr is None and ir is None:
+        return None
+
+    norm = normalize_event(event_dir.name, sr, ir)
+
+    # Post-process: add distance_m if race distance is known
+    if race_m:
+        add_distance_m(norm, race_m, season)
+
+    out_path = event_dir / "pace_normalized.json"
+    out_path.write_text(json.dumps(norm, ensure_ascii=False, indent=2), encoding="utf-8")
+    return norm
+
+
 # ---------- CLI ----------
 
 def main():
@@ -789,6 +797,7 @@ def main():
         print("[info] no event directories found; nothing to normalize.")
         raise SystemExit(0)
 
+    race_m = distance_str_to_meters(args.distance) if args.distance else None
     for d in sorted(event_dirs):
         event_id = d.name
         out_path = d / "pace_normalized.json"
@@ -796,21 +805,9 @@ def main():
             print(f"[skip] {event_id}: pace_normalized.json already exists")
             continue
 
-        sr = load_json(d / "split_report.json")
-        ir = load_json(d / "ind_res_list.json")
-
-        if sr is None and ir is None:
+        if normalize_event_dir(d, race_m, args.season) is None:
             print(f"[skip] {event_id}: missing both split_report.json and ind_res_list.json")
             continue
-
-        norm = normalize_event(event_id, sr, ir)
-
-        # Post-process: add distance_m if race distance is known
-        race_m = distance_str_to_meters(args.distance) if args.distance else None
-        if race_m:
-            add_distance_m(norm, race_m, args.season)
-
-        out_path.write_text(json.dumps(norm, ensure_ascii=False, indent=2), encoding="utf-8")
         print(f"[ok] {event_id}: wrote {out_path}")
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+pace_pipeline.py
+Stage-pipelined scheduler for meet ingests.
+
+Instead of running scrape -> normalize -> validate -> upload to completion for
+one event before starting the next, each stage gets its own bounded worker
+pool and events flow between them through bounded queues:
+
+  browser scrape pool --\\
+                         >-- normalize(+validate) pool --> upload pool
+  http scrape pool -----/
+
+Scrapes are routed by provider (Playwright providers vs plain HTTP), so
+network-bound scraping, CPU-bound normalization and remote uploads overlap.
+A full downstream queue blocks its producers (backpressure), keeping memory
+flat and the slowest stage saturated. Total batch time approaches the
+slowest stage's total rather than the sum of all stages.
+
+Used by pace_ingest_meet.py --pipeline and pace_catalogue.py --run.
+"""
+
+import pathlib
+import queue
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+PY_DIR = pathlib.Path(__file__).parent
+sys.path.insert(0, str(PY_DIR))
+
+import pace_hosts
+from pace_providers import classify_url, is_browser_provider
+from pace_timing import span
+
+DEFAULT_POOLS = {
+    "browser": 2,    # Playwright captures (memory-heavy)
+    "http": 6,       # plain HTTP / Firebase REST
+    "normalize": 2,  # CPU-bound normalize + validate
+    "upload": 4,     # Supabase round-trips
+}
+DEFAULT_QUEUE_SIZE = 8
+
+_STOP = object()
+
+
+class Pipeline:
+    """
+    Run events through scrape -> normalize -> upload with one pool per stage.
+
+    Each item is a dict with "event" (a discovered event) and "extra_meta";
+    set "scraped": True to skip the scrape stage for bundles already on disk.
+    """
+
+    def __init__(self, data_root: pathlib.Path,
+                 pools: Optional[Dict[str, int]] = None,
+                 queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.data_root = data_root
+        # Scrape workers run in parallel subprocesses: share per-host pacing and breakers
+        pace_hosts.enable_default(data_root)
+        self.pools = {**DEFAULT_POOLS, **(pools or {})}
+        self.queues: Dict[str, "queue.Queue[Any]"] = {
+            name: queue.Queue(maxsize=queue_size) for name in self.pools
+        }
+        self.results: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    # ---- bookkeeping ----
+
+    def _fail(self, item: Dict[str, Any], stage: str, error: str) -> None:
+        print(f"[FAIL] {stage} {item['event']['id']}: {error}")
+        with self._lock:
+            self.results[item["event"]["id"]] = False
+
+    # ---- stage bodies ----
+
+    @staticmethod
+    def _tags(item: Dict[str, Any]) -> Dict[str, str]:
+        return {"provider": classify_url(item["event"]["href"]), "event_id": item["event_dir"].name}
+
+    def _scrape(self, item: Dict[str, Any]) -> Optional[str]:
+        from pace_ingest_meet import find_event_dir, scrape_stage
+
+        event = item["event"]
+        if not scrape_stage(event["href"], self.data_root):
+            return "scrape failed"
+        event_dir = find_event_dir(self.data_root, event)
+        if event_dir is None:
+            return "no scraped bundle found"
+        item["event_dir"] = event_dir
+        return None
+
+    def _normalize(self, item: Dict[str, Any]) -> Optional[str]:
+        from pace_ingest_meet import build_event_meta, find_event_dir, normalize_stage, validate_stage
+
+        event_dir = item.get("event_dir") or find_event_dir(self.data_root, item["event"])
+        if event_dir is None:
+            return "no scraped bundle found"
+        item["event_dir"] = event_dir
+        item["event_meta"] = build_event_meta(item["event"], item.get("extra_meta", {}))
+        tags = self._tags(item)
+        with span("normalize", **tags) as rec:
+            norm = normalize_stage(event_dir, item["event_meta"])
+            rec["ok"] = norm is not None
+        if norm is None:
+            return "normalization failed"
+        with span("validate", **tags) as rec:
+            rec["ok"] = validate_stage(norm, event_dir)
+        if not rec["ok"]:
+            return "validation failed"
+        item["norm"] = norm
+        return None
+
+    def _upload(self, item: Dict[str, Any]) -> Optional[str]:
+        from pace_ingest_meet import upload_stage
+
+        norm = item.pop("norm")
+        with span("upload", athletes=len(norm.get("athletes", [])), **self._tags(item)) as rec:
+            rec["ok"] = upload_stage(norm, item["event_meta"])
+        if not rec["ok"]:
+            return "upload failed"
+        with self._lock:
+            self.results[item["event"]["id"]] = True
+        return None
+
+    # ---- workers ----
+
+    def _worker(self, stage: str, body: Callable[[Dict[str, Any]], Optional[str]],
+                downstream: Optional[str]) -> None:
+        inbox = self.queues[stage]
+        while True:
+            item = inbox.get()
+            if item is _STOP:
+                return
+            try:
+                error = body(item)
+            except (Exception, SystemExit) as e:
+                error = f"{type(e).__name__}: {e}"
+            if error:
+                self._fail(item, stage, error)
+                continue
+            if downstream:
+                # Blocks while the next stage is saturated
+                self.queues[downstream].put(item)
+
+    def _start(self, stage: str, body: Callable[[Dict[str, Any]], Optional[str]],
+               downstream: Optional[str]) -> List[threading.Thread]:
+        threads = [
+            threading.Thread(target=self._worker, args=(stage, body, downstream),
+                             name=f"{stage}-{i}", daemon=True)
+            for i in range(max(1, self.pools[stage]))
+        ]
+        for t in threads:
+            t.start()
+        return threads
+
+    def _drain(self, stages: List[str], threads: List[threading.Thread]) -> None:
+        for stage in stages:
+            for _ in range(max(1, self.pools[stage])):
+                self.queues[stage].put(_STOP)
+        for t in threads:
+            t.join()
+
+    def run(self, items: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Process all items; returns {event_id: success}."""
+        scrapers = self._start("browser", self._scrape, "normalize") + \
+            self._start("http", self._scrape, "normalize")
+        normalizers = self._start("normalize", self._normalize, "upload")
+        uploaders = self._start("upload", self._upload, None)
+
+        for item in items:
+            if item.get("scraped"):
+                self.queues["normalize"].put(item)
+                continue
+            provider = classify_url(item["event"]["href"])
+            self.queues["browser" if is_browser_provider(provider) else "http"].put(item)
+
+        # Shut stages down front to back so in-flight items reach the end
+        self._drain(["browser", "http"], scrapers)
+        self._drain(["normalize"], normalizers)
+        self._drain(["upload"], uploaders)
+        return self.results
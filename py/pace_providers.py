@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+pace_providers.py
+Provider registry shared by the scraper, discovery, and backfill.
+
+URLs are classified by parsed hostname through a dict lookup (walking up to
+parent domains, so www./subdomains resolve), plus a few path rules for hosts
+that serve more than one provider.
+
+Usage:
+  python pace_providers.py "https://live.xpresstiming.com/meets/60861" [...]
+"""
+
+import re
+import sys
+from typing import Callable, Dict, List, Optional
+from urllib.parse import ParseResult, urlparse, urlunparse
+
+
+# AthleticLIVE white-label SPAs (split_report / ind_res_list XHRs)
+LEGACY_SPA_HOSTS = (
+    "live.xpresstiming.com",
+    "results.adkinstrak.com",
+    "live.deltatiming.com",
+    "live.rapidresultstiming.com",
+    "live.athletictiming.net",
+    "live.jdlfasttrack.com",
+    "live.timinginc.com",
+    "blueridgetiming.live",
+    "live.fstiming.com",
+    "live.herostiming.com",
+    "live.athletic.net",
+    "live.dcracetiming.com",
+    "snapresults.snaptiming.com",
+    "armorytrack.live",
+    "results.lakeshoreathleticservices.com",
+)
+
+# TrackScoreboard Angular SSR deployments (data in the DOM)
+TRACKSCOREBOARD_HTML_HOSTS = (
+    "rt.trackscoreboard.com",
+    "lancer.trackscoreboard.com",
+    "live.halfmiletiming.com",
+)
+
+# hostname (or parent domain) -> provider
+PROVIDER_HOSTS: Dict[str, str] = {h: "legacy_spa" for h in LEGACY_SPA_HOSTS}
+PROVIDER_HOSTS.update({h: "trackscoreboard_html" for h in TRACKSCOREBOARD_HTML_HOSTS})
+PROVIDER_HOSTS.update({
+    "rtspt.com": "rtspt_html",
+    "live.pttiming.com": "pttiming",
+    "milesplit.live": "milesplit_live",
+    "flashresults.com": "flashresults",
+})
+
+# Hosts serving several providers: hostname -> rule(lowercased path) -> provider
+PATH_RULES: Dict[str, Callable[[str], str]] = {
+    # Leone serves compiled XC pages and a pttiming-style Firebase live page
+    "results.leonetiming.com": lambda path: "leone_xc" if "xc.html" in path else "pttiming",
+}
+
+# Vendor families identified by a hostname keyword rather than an exact host
+HOST_KEYWORDS = (
+    ("athleticlive", "legacy_spa"),
+)
+
+# Hosts that only answer over plain http (default is https)
+HOST_SCHEMES: Dict[str, str] = {
+    "live.halfmiletiming.com": "http",
+}
+
+# Known meets per provider: meet_id -> host.
+# legacy_spa ids confirmed via _source.mi in cached ind_res_list.json.
+KNOWN_MEET_HOSTS: Dict[str, Dict[str, str]] = {
+    "legacy_spa": {
+        "60709": "live.athletictiming.net",      # GNAC
+        "61469": "snapresults.snaptiming.com",   # CIAA
+        "61289": "live.dcracetiming.com",        # SIAC
+        "61291": "live.xpresstiming.com",        # Gulf South
+        "54381": "live.jdlfasttrack.com",        # Conference Carolinas
+        "60633": "blueridgetiming.live",         # MEAC
+        "59934": "live.herostiming.com",         # NSIC
+        "62216": "live.rapidresultstiming.com",  # RMAC
+        "62261": "live.fstiming.com",            # GLIAC
+        "62706": "live.athletic.net",            # G-MAC
+    },
+    "trackscoreboard_html": {
+        "458": "lancer.trackscoreboard.com",     # NE10
+        "895": "live.halfmiletiming.com",        # Peach Belt Indoor
+    },
+}
+
+# Providers whose capture needs a browser (Playwright); the rest are plain HTTP
+BROWSER_PROVIDERS = frozenset([
+    "legacy_spa", "trackscoreboard", "trackscoreboard_html", "milesplit_live",
+])
+
+
+def parse_url(url: str) -> ParseResult:
+    """urlparse that tolerates scheme-less URLs like 'live.pttiming.com/?mid=1'."""
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    return urlparse(url)
+
+
+def url_host(url: str) -> str:
+    """Lowercased hostname of a URL ('' if none)."""
+    return (parse_url(url).hostname or "").lower()
+
+
+def _host_candidates(host: str) -> List[str]:
+    """'a.b.example.com' -> ['a.b.example.com', 'b.example.com', 'example.com']."""
+    labels = host.split(".")
+    return [".".join(labels[i:]) for i in range(max(len(labels) - 1, 1))]
+
+
+def classify_url(url: str) -> str:
+    """Return the provider name for a URL, or 'unknown'."""
+    parsed = parse_url(url)
+    host = (parsed.hostname or "").lower()
+    path = parsed.path.lower()
+    for h in _host_candidates(host):
+        rule = PATH_RULES.get(h)
+        if rule is not None:
+            return rule(path)
+        provider = PROVIDER_HOSTS.get(h)
+        if provider is not None:
+            return provider
+    for keyword, provider in HOST_KEYWORDS:
+        if keyword in host:
+            return provider
+    return "unknown"
+
+
+def fetch_target(url: str) -> str:
+    """
+    Normalized key for what scraping `url` actually downloads.
+
+    Every pttiming link of a meet resolves to the same Firebase meet tree, so
+    they share one key per mid; other URLs are keyed by themselves with the
+    scheme/host lowercased, fragment and trailing slash dropped.
+    """
+    parsed = parse_url(url)
+    host = (parsed.hostname or "").lower()
+    if classify_url(url) == "pttiming":
+        mid = re.search(r"mid=(\d+)", parsed.query, re.IGNORECASE)
+        if mid:
+            return f"pttiming:{host}:{mid.group(1)}"
+    path = parsed.path.rstrip("/") or "/"
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), path, parsed.params, parsed.query, ""))
+
+
+def is_browser_provider(provider: str) -> bool:
+    return provider in BROWSER_PROVIDERS
+
+
+def host_scheme(host: str) -> str:
+    return HOST_SCHEMES.get(host, "https")
+
+
+def known_meet_url(provider: str, meet_id: object) -> Optional[str]:
+    """Base meet URL (…/meets/{id}) for a known meet of a provider, if registered."""
+    host = KNOWN_MEET_HOSTS.get(provider, {}).get(str(meet_id))
+    if host is None:
+        return None
+    return f"{host_scheme(host)}://{host}/meets/{meet_id}"
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python pace_providers.py <url> [...]")
+        sys.exit(1)
+    for url in sys.argv[1:]:
+        print(f"{classify_url(url):<22} {url}")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,7 +24,8 @@ import json
 import os
 import pathlib
 import sys
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List
 
 from dotenv import load_dotenv
 from supabase import create_client
@@ -35,18 +36,48 @@ from pace_normalize import add_distance_m, distance_str_to_meters, load_json, pa
 from pace_upload import upload_event
 
 
-def fetch_event_metadata(sb) -> Dict[str, Dict[str, str]]:
-    """Fetch all events from Supabase, keyed by source_id."""
-    result = sb.table("events").select("source_id,distance,season,name,gender,date").execute()
-    meta = {}
-    for row in result.data:
-        meta[row["source_id"]] = {
-            "distance": row.get("distance", ""),
-            "season": row.get("season", ""),
-            "name": row.get("name", ""),
-            "gender": row.get("gender", "Men"),
-            "date": row.get("date", ""),
-        }
+# PostgREST caps un-ranged selects (1000 rows by default), so page explicitly.
+META_PAGE_SIZE = 1000
+META_COLUMNS = "source_id,distance,season,name,gender,date"
+
+
+def _fetch_event_page(sb, start: int, page_size: int) -> List[Dict[str, Any]]:
+    """Fetch one page of event metadata rows (ordered by id for stable paging)."""
+    result = (
+        sb.table("events")
+        .select(META_COLUMNS)
+        .order("id")
+        .range(start, start + page_size - 1)
+        .execute()
+    )
+    return result.data or []
+
+
+def fetch_event_metadata(sb, page_size: int = META_PAGE_SIZE,
+                         workers: int = 4) -> Dict[str, Dict[str, str]]:
+    """Fetch all events from Supabase, keyed by source_id.
+
+    Reads the exact row count first, then fetches every page concurrently and
+    folds rows into the map as each page arrives.
+    """
+    head = sb.table("events").select("source_id", count="exact").limit(1).execute()
+    total = head.count or 0
+    starts = list(range(0, total, page_size))
+
+    meta: Dict[str, Dict[str, str]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(starts) or 1))) as pool:
+        futures = [pool.submit(_fetch_event_page, sb, start, page_size) for start in starts]
+        for fut in as_completed(futures):
+            for row in fut.result():
+                meta[row["source_id"]] = {
+                    "distance": row.get("distance", ""),
+                    "season": row.get("season", ""),
+                    "name": row.get("name", ""),
+                    "gender": row.get("gender", "Men"),
+                    "date": row.get("date", ""),
+                }
+    if len(meta) < total:
+        print(f"[warn] expected {total} events, fetched {len(meta)}")
     return meta
 
 
@@ -105,6 +136,7 @@ def main():
     ap.add_argument("--batch", type=int, default=0, help="Batch number (1-based, 0=all)")
     ap.add_argument("--total-batches", type=int, default=1, help="Total number of batches")
     ap.add_argument("--dry-run", action="store_true", help="Preview only, no upload")
+    ap.add_argument("--meta-workers", type=int, default=4, help="Concurrent page fetches for event metadata")
     args = ap.parse_args()
 
     load_dotenv(pathlib.Path(__file__).parent / ".env")
@@ -120,7 +152,7 @@ def main():
 
     # Fetch event metadata from Supabase
     print("[info] Fetching event metadata from Supabase...")
-    all_meta = fetch_event_metadata(sb)
+    all_meta = fetch_event_metadata(sb, workers=args.meta_workers)
     print(f"[info] Found {len(all_meta)} events in database")
 
     # Collect event directories
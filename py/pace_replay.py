@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+pace_replay.py
+Offline replay harness: a local HTTP server that serves a pace_archive
+directory (AthleticLIVE XHRs, trackscoreboard pages, pttiming RTDB JSON,
+FlashResults HTML, ... as recorded) with configurable latency, and a
+benchmark that replays every archived capture through the real scraper
+against it.
+
+Scrapers are pointed at the server through PACE_REPLAY_SERVER (see
+pace_archive): plain HTTP fetches and the Playwright request router ask
+GET /fetch?url=<original>&method=<m> (POST bodies are forwarded) and get
+the archived status, headers and body back, after the configured delay.
+Responses carry X-Pace-Archive: hit|miss; misses are 404s.
+
+Usage:
+  # record once (network), then serve it
+  python pace_scraper.py --url "..." --archive data/_archive
+  python pace_replay.py serve data/_archive --port 8765 --latency-ms 80 --jitter-ms 40
+  PACE_REPLAY_SERVER=http://127.0.0.1:8765 python pace_scraper.py --url "..." --outdir /tmp/replay --force
+
+  # throughput for several concurrency settings, no network needed
+  python pace_replay.py bench data/_archive --workers 1,2,4,8 --latency-ms 80
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+PY_DIR = pathlib.Path(__file__).parent
+sys.path.insert(0, str(PY_DIR))
+
+from pace_archive import ARCHIVE_HEADER, ENV_SERVER, Archive
+from pace_timing import ENV_LOG, load_spans, percentile
+
+DEFAULT_PORT = 8765
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Serves archived responses; latency/jitter in ms, bandwidth in KiB/s (0 = unlimited)."""
+
+    daemon_threads = True
+
+    def __init__(self, archive: Archive, port: int = DEFAULT_PORT, latency_ms: float = 0,
+                 jitter_ms: float = 0, kib_per_s: float = 0, host: str = "127.0.0.1"):
+        super().__init__((host, port), _ReplayHandler)
+        self.archive = archive
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.kib_per_s = kib_per_s
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "bytes": 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def delay_s(self, size: int) -> float:
+        ms = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if self.kib_per_s:
+            ms += size / 1024 / self.kib_per_s * 1000
+        return ms / 1000
+
+    def count(self, hit: bool, size: int) -> None:
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["hits" if hit else "misses"] += 1
+            self.stats["bytes"] += size
+
+    def start(self) -> threading.Thread:
+        t = threading.Thread(target=self.serve_forever, name="replay-server", daemon=True)
+        t.start()
+        return t
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    server: ReplayServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, headers: Dict[str, str], body: bytes, hit: bool) -> None:
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header(ARCHIVE_HEADER, "hit" if hit else "miss")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _serve(self) -> None:
+        parsed = urlparse(self.path)
+        if parsed.path == "/_stats":
+            self._send(200, {"content-type": "application/json"},
+                       json.dumps(self.server.stats).encode(), True)
+            return
+        if parsed.path != "/fetch":
+            self._send(404, {}, b"", False)
+            return
+        qs = parse_qs(parsed.query)
+        url = (qs.get("url") or [""])[0]
+        method = (qs.get("method") or [self.command])[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        post_data = self.rfile.read(length) if length else None
+
+        hit = self.server.archive.lookup(url, method, post_data)
+        if hit is None:
+            self.server.count(False, 0)
+            time.sleep(self.server.delay_s(0))
+            self._send(404, {"content-type": "text/plain"}, b"not archived", False)
+            return
+        status, headers, body = hit
+        self.server.count(True, len(body))
+        time.sleep(self.server.delay_s(len(body)))
+        self._send(status, headers, body, True)
+
+    do_GET = _serve
+    do_POST = _serve
+
+
+# ---------------- benchmark ----------------
+
+def _scrape(capture: str, outdir: pathlib.Path, env: Dict[str, str]) -> bool:
+    cmd = [sys.executable, str(PY_DIR / "pace_scraper.py"),
+           "--url", *capture.split(), "--outdir", str(outdir), "--force"]
+    return subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
+
+
+def bench_once(server: ReplayServer, captures: List[str], workers: int) -> Dict[str, Any]:
+    """Replay all captures with `workers` concurrent scraper processes."""
+    tmp = pathlib.Path(tempfile.mkdtemp(prefix="pace_replay_"))
+    log = tmp / "timing.jsonl"
+    env = {**os.environ, ENV_SERVER: server.base_url, ENV_LOG: str(log)}
+    before = dict(server.stats)
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            ok = list(pool.map(lambda c: _scrape(c, tmp / "out", env), captures))
+        wall = time.perf_counter() - started
+        spans = [s["dur_ms"] for s in load_spans(log) if s.get("stage") == "capture"] if log.exists() else []
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    served = {k: server.stats[k] - before[k] for k in before}
+    return {
+        "workers": workers,
+        "wall_s": wall,
+        "ok": sum(ok),
+        "captures": len(captures),
+        "per_min": len(captures) / wall * 60 if wall else 0.0,
+        "capture_p50": percentile(spans, 50) if spans else None,
+        "capture_p95": percentile(spans, 95) if spans else None,
+        **served,
+    }
+
+
+def print_bench(rows: List[Dict[str, Any]]) -> None:
+    fmt = "{:>7}  {:>8}  {:>7}  {:>9}  {:>10}  {:>10}  {:>8}  {:>6}"
+    print(fmt.format("WORKERS", "WALL_S", "OK", "CAPT/MIN", "P50_MS", "P95_MS", "REQS", "MISS"))
+    print("-" * 80)
+    for r in rows:
+        print(fmt.format(
+            r["workers"], f"{r['wall_s']:.1f}", f"{r['ok']}/{r['captures']}", f"{r['per_min']:.1f}",
+            "-" if r["capture_p50"] is None else f"{r['capture_p50']:.0f}",
+            "-" if r["capture_p95"] is None else f"{r['capture_p95']:.0f}",
+            r["requests"], r["misses"],
+        ))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve a response archive locally and benchmark scrapes against it")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    def _common(p: argparse.ArgumentParser) -> None:
+        p.add_argument("archive", help="pace_archive directory")
+        p.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+        p.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response")
+        p.add_argument("--jitter-ms", type=float, default=0, help="Extra uniform random delay")
+        p.add_argument("--kib-per-s", type=float, default=0, help="Simulated per-response bandwidth")
+
+    serve = sub.add_parser("serve", help="Run the replay server")
+    _common(serve)
+    bench = sub.add_parser("bench", help="Replay every archived capture at several concurrency levels")
+    _common(bench)
+    bench.add_argument("--workers", default="1,2,4", help="Comma-separated scraper concurrency levels")
+    bench.add_argument("--provider", action="append", help="Only captures of this provider (repeatable)")
+    bench.add_argument("--limit", type=int, default=0, help="Only the first N captures")
+    args = ap.parse_args()
+
+    archive = Archive(pathlib.Path(args.archive))
+    port = args.port if args.cmd == "serve" else 0
+    server = ReplayServer(archive, port, args.latency_ms, args.jitter_ms, args.kib_per_s)
+
+    if args.cmd == "serve":
+        print(f"[replay] serving {args.archive} on {server.base_url} "
+              f"(latency {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms)")
+        print(f"[replay] export {ENV_SERVER}={server.base_url}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\n[replay] {server.stats}")
+        return
+
+    captures = archive.captures(args.provider)
+    if args.limit:
+        captures = captures[:args.limit]
+    if not captures:
+        print("[replay] no archived captures")
+        sys.exit(1)
+    server.start()
+    print(f"[replay] {len(captures)} capture(s) via {server.base_url}, latency {args.latency_ms:.0f} ms")
+    rows = []
+    for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+        rows.append(bench_once(server, captures, max(1, workers)))
+        print(f"[replay] workers={workers}: {rows[-1]['wall_s']:.1f}s")
+    print()
+    print_bench(rows)
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
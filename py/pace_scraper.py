@@ -32,46 +32,56 @@ This is intentionally provider-agnostic upstream:
 - It creates stable, predictable JSON bundles that pace_normalize.py can consume.
 
 Requirements:
-  pip install playwright bs4 lxml requests
+  pip install playwright bs4 lxml requests   (lxml parses static pages; bs4 is the fallback)
   python -m playwright install --with-deps chromium
 """
 
 import argparse
 import asyncio
+import hashlib
 import json
+import os
 import pathlib
 import re
 import sys
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import urljoin, urlparse, parse_qs
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+import pace_archive
+import pace_hosts
+from pace_archive import http_get, urlopen_bytes
+from pace_coalesce import Coalescer
+from pace_hosts import HostUnavailable
+from pace_html import html_backend
+from pace_providers import classify_url, fetch_target
+from pace_timing import span
 
 # ---------------- generic helpers ----------------
 
+# (split_report, ind_res_list, logos) for one event
+Bundle = Tuple[Dict[str, Any], Dict[str, Any], Dict[str, str]]
+
 def event_id_from_url(url: str) -> str:
     """Derive a default event ID slug from the URL."""
     u = url.rstrip("/")
     parsed = urlparse(u)
     host = (parsed.netloc or "").lower()
     parts = [p for p in parsed.path.split("/") if p]
+    provider = classify_url(u)
 
-    # PTTiming: xc-ptt.html?mid=8189
-    if "live.pttiming.com" in host:
-        qs = parse_qs(parsed.query)
-        mid = (qs.get("mid") or [""])[0]
-        return mid or pathlib.Path(parsed.path).stem
-
-    # Leone XC: xc.html?mid=8252
-    if "results.leonetiming.com" in host:
+    # PTTiming: xc-ptt.html?mid=8189 / Leone XC: xc.html?mid=8252
+    if provider in ("pttiming", "leone_xc"):
         qs = parse_qs(parsed.query)
         mid = (qs.get("mid") or [""])[0]
         return mid or pathlib.Path(parsed.path).stem
 
     # MileSplit Live: /meets/713752/events/2/results/F/M
-    if "milesplit.live" in host and "meets" in parts and "events" in parts:
+    if provider == "milesplit_live" and "meets" in parts and "events" in parts:
         try:
             meet_idx = parts.index("meets")
             meet_id = parts[meet_idx + 1]
@@ -92,9 +102,7 @@ def event_id_from_url(url: str) -> str:
         return slug
 
     # TrackScoreboard: /meets/{meet_id}/events/{event_id}[/{round}]
-    if ("rt.trackscoreboard.com" in host
-            or "lancer.trackscoreboard.com" in host
-            or "live.halfmiletiming.com" in host):
+    if provider == "trackscoreboard_html":
         try:
             meet_idx = parts.index("meets")
             meet_id = parts[meet_idx + 1]
@@ -117,7 +125,7 @@ def event_id_from_url(url: str) -> str:
         return f"{meet_id}_{ev_id}" if ev_id else meet_id
 
     # FlashResults: /2026_Meets/Indoor/02-26_ACC/025-2_compiled.htm
-    if "flashresults.com" in host:
+    if provider == "flashresults":
         filename = parts[-1] if parts else ""
         meet_dir = parts[-2] if len(parts) >= 2 else "fr"
         if "_compiled" in filename:
@@ -136,49 +144,112 @@ def ensure_dir(p: pathlib.Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
 
+def write_json_atomic(path: pathlib.Path, data: Any, **dump_kwargs: Any) -> None:
+    """Write JSON via a temp file + rename, so concurrent readers never see a partial file."""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(data, **dump_kwargs), encoding="utf-8")
+    tmp.replace(path)
+
+
 def detect_provider(url: str) -> str:
-    u = url.lower()
+    return classify_url(url)
 
-    if ("live.xpresstiming.com" in u
-        or "results.adkinstrak.com" in u
-        or "live.deltatiming.com" in u
-        or "live.rapidresultstiming.com" in u
-        or "athleticlive" in u
-        or "live.athletictiming.net" in u
-        or "live.jdlfasttrack.com" in u
-        or "live.timinginc.com" in u
-        or "blueridgetiming.live" in u
-        or "live.fstiming.com" in u
-        or "live.herostiming.com" in u
-        or "live.athletic.net" in u
-        or "live.dcracetiming.com" in u
-        or "snapresults.snaptiming.com" in u
-        or "armorytrack.live" in u
-        or "results.lakeshoreathleticservices.com" in u):
-        return "legacy_spa"
 
-    if "results.leonetiming.com" in u and "xc.html" in u:
-        return "leone_xc"
+# ---------------- browser resource policy ----------------
+# Captures only need JSON XHRs or table DOM. Images, media, fonts and
+# third-party trackers are aborted; stylesheets still load because tab
+# visibility and scroll-container detection depend on computed styles.
+# Team logos are read from img[src] attributes, so they never need downloading.
 
-    if "results.leonetiming.com" in u and "xc.html" not in u:
-        return "pttiming"
+BLOCKED_RESOURCE_TYPES = frozenset(["image", "media", "font"])
 
-    if "rtspt.com" in u:
-        return "rtspt_html"
+# Requests paced per host and fed back into its health (pace_hosts)
+PACED_RESOURCE_TYPES = frozenset(["document", "xhr", "fetch"])
 
-    if "rt.trackscoreboard.com" in u or "lancer.trackscoreboard.com" in u or "live.halfmiletiming.com" in u:
-        return "trackscoreboard_html"
+# Analytics / ad hosts, matched on hostname or any parent domain
+TRACKER_HOSTS = frozenset([
+    "google-analytics.com", "googletagmanager.com", "googletagservices.com",
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com",
+    "adservice.google.com", "amazon-adsystem.com", "adnxs.com", "criteo.com",
+    "taboola.com", "outbrain.com", "quantserve.com", "scorecardresearch.com",
+    "facebook.net", "connect.facebook.net", "hotjar.com", "clarity.ms",
+    "segment.io", "newrelic.com", "nr-data.net", "pubmatic.com", "rubiconproject.com",
+])
 
-    if "live.pttiming.com" in u:
-        return "pttiming"
 
-    if "milesplit.live" in u:
-        return "milesplit_live"
+def _is_tracker(url: str) -> bool:
+    labels = (urlparse(url).hostname or "").lower().split(".")
+    return any(".".join(labels[i:]) in TRACKER_HOSTS for i in range(len(labels) - 1))
 
-    if "flashresults.com" in u:
-        return "flashresults"
 
-    return "unknown"
+async def apply_resource_policy(target: Any) -> None:
+    """
+    Install the request-routing policy on a Playwright BrowserContext or Page.
+    Requests that are let through go via the raw response archive when one is
+    enabled (recorded, or served from it in replay mode; see pace_archive).
+    Live documents/XHRs are paced per host, their outcomes feed the host's
+    health, and a host with an open circuit gets its requests aborted.
+    """
+    archive = pace_archive.current()
+    live = not pace_archive.replay_server() and (archive is None or not archive.replay)
+    aborted: set = set()
+
+    async def _route(route):
+        req = route.request
+        if req.resource_type in BLOCKED_RESOURCE_TYPES or _is_tracker(req.url):
+            aborted.add(req)
+            await route.abort()
+            return
+        if live and req.resource_type in PACED_RESOURCE_TYPES:
+            try:
+                wait = pace_hosts.gate(req.url).reserve()
+            except HostUnavailable:
+                aborted.add(req)
+                await route.abort()
+                return
+            if wait > 0:
+                await asyncio.sleep(wait)
+        if archive is not None or pace_archive.replay_server():
+            await pace_archive.route_request(route, archive)
+        else:
+            await route.continue_()
+
+    def _on_response(resp):
+        req = resp.request
+        if req.resource_type in PACED_RESOURCE_TYPES:
+            elapsed_s = max(0.0, req.timing.get("responseStart", 0.0)) / 1000
+            pace_hosts.gate(req.url).record(resp.status, elapsed_s, resp.headers)
+
+    def _on_failed(req):
+        if req in aborted:
+            aborted.discard(req)
+        elif req.resource_type in PACED_RESOURCE_TYPES:
+            pace_hosts.gate(req.url).record(None, 0.0)
+
+    await target.route("**/*", _route)
+    if live:
+        target.on("response", _on_response)
+        target.on("requestfailed", _on_failed)
+
+
+async def wait_for_stable_count(page: Any, selector: str, settle_ms: int = 600,
+                                timeout_ms: int = 10000, poll_ms: int = 150) -> int:
+    """
+    Wait until the number of elements matching `selector` stops changing for
+    `settle_ms` (timeout_ms is only a ceiling). Returns the final count.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_ms / 1000
+    count = -1
+    stable_since = loop.time()
+    while loop.time() < deadline:
+        n = await page.locator(selector).count()
+        if n != count:
+            count, stable_since = n, loop.time()
+        elif n > 0 and (loop.time() - stable_since) * 1000 >= settle_ms:
+            break
+        await page.wait_for_timeout(poll_ms)
+    return count
 
 
 # ---------------- team colors helpers ----------------
@@ -204,12 +275,23 @@ def fetch_svg_text(url: str, timeout: int = 20) -> Optional[str]:
     if not url or ".svg" not in url.lower():
         return None
     try:
-        r = requests.get(url, timeout=timeout)
+        r = http_get(url, timeout=timeout)
         r.raise_for_status()
         return r.text
     except Exception:
         return None
 
+def extract_logos(html: str, src_contains: str, src_suffix: str = "", h: Any = None) -> Dict[str, str]:
+    """{team (img alt, else file name): logo URL} for <img> tags whose src matches."""
+    h = h or html_backend()
+    logos: Dict[str, str] = {}
+    for img in h.find_all(h.parse(html), "img"):
+        src = h.attr(img, "src")
+        if src and src_contains in src and src.endswith(src_suffix):
+            alt = h.attr(img, "alt").strip()
+            logos.setdefault(alt or src.split("/")[-1], src)
+    return logos
+
 def build_team_colors_json(logos: Dict[str, str]) -> Dict[str, Any]:
     out: Dict[str, Any] = {}
     for team, url in logos.items():
@@ -275,18 +357,23 @@ async def capture_legacy_spa(url: str, headful: bool) -> Tuple[Dict[str,Any], Di
         except Exception as e:
             print(f"[legacy resp err] {type(e).__name__}")
 
+    tags = {"provider": "legacy_spa", "event_id": event_id_from_url(url)}
+
     async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=not headful,
-            args=["--no-sandbox", "--disable-dev-shm-usage"],
-        )
-        ctx = await browser.new_context(viewport={"width": 1400, "height": 900})
-        page = await ctx.new_page()
+        with span("browser_launch", **tags):
+            browser = await p.chromium.launch(
+                headless=not headful,
+                args=["--no-sandbox", "--disable-dev-shm-usage"],
+            )
+            ctx = await browser.new_context(viewport={"width": 1400, "height": 900})
+            await apply_resource_policy(ctx)
+            page = await ctx.new_page()
         page.on("response", on_response)
 
         print(f"[legacy nav] {url}")
-        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-        await page.wait_for_timeout(800)
+        with span("navigation", **tags):
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            await page.wait_for_timeout(800)
 
         async def scroll_everywhere(total_ms=2400):
             t0 = time.time()
@@ -324,30 +411,26 @@ async def capture_legacy_spa(url: str, headful: bool) -> Tuple[Dict[str,Any], Di
                         continue
             return False
 
-        await click_labels(["Results","Individuals","Athletes"], "results")
-        await scroll_everywhere()
-        await click_labels(["Splits","Split"], "splits")
-        await scroll_everywhere()
-
-        deadline = time.time() + 90
-        toggle = True
-        while (split_report is None or ind_res is None) and time.time() < deadline:
-            if toggle:
-                await click_labels(["Splits","Split"], "splits")
-            else:
-                await click_labels(["Results","Individuals","Athletes"], "results")
-            toggle = not toggle
+        with span("xhr_wait", **tags) as rec:
+            await click_labels(["Results","Individuals","Athletes"], "results")
             await scroll_everywhere()
-            await page.wait_for_timeout(300)
+            await click_labels(["Splits","Split"], "splits")
+            await scroll_everywhere()
+
+            deadline = time.time() + 90
+            toggle = True
+            while (split_report is None or ind_res is None) and time.time() < deadline:
+                if toggle:
+                    await click_labels(["Splits","Split"], "splits")
+                else:
+                    await click_labels(["Results","Individuals","Athletes"], "results")
+                toggle = not toggle
+                await scroll_everywhere()
+                await page.wait_for_timeout(300)
+            rec["ok"] = split_report is not None and ind_res is not None
 
         try:
-            html = await page.content()
-            soup = BeautifulSoup(html, "lxml")
-            for img in soup.select("img[src*='team-images'][src$='.svg']"):
-                src = img.get("src", "")
-                alt = (img.get("alt") or "").strip()
-                if src:
-                    logos.setdefault(alt or src.split("/")[-1], src)
+            logos = extract_logos(await page.content(), "team-images", ".svg")
         except Exception:
             pass
 
@@ -366,42 +449,29 @@ async def capture_legacy_spa(url: str, headful: bool) -> Tuple[Dict[str,Any], Di
 
 # ---------------- RTSpt / Raspy HTML ----------------
 
-def parse_rtspt_html(url: str) -> Tuple[Dict[str,Any], Dict[str,Any]]:
-    print(f"[rtspt] GET {url}")
-    r = requests.get(url, timeout=30)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "lxml")
-
-    table = None
-    for tag in soup.find_all(["h2","h3","h4","h5"]):
-        if "individual results" in tag.get_text(" ", strip=True).lower():
-            table = tag.find_next("table")
-            if table:
-                break
-    if not table:
-        table = soup.find("table")
+def _empty_table_bundle(provider: str) -> Tuple[Dict[str,Any], Dict[str,Any]]:
+    return (
+        {"_source": {"spr": []}, "_provider": provider},
+        {"_source": {"r": []}, "_provider": provider},
+    )
 
-    if not table:
-        print("[rtspt] no table; empty")
-        return (
-            {"_source": {"spr": []}, "_provider": "rtspt_html"},
-            {"_source": {"r": []}, "_provider": "rtspt_html"},
-        )
 
-    headers = [th.get_text(" ", strip=True) for th in table.select("tr th")]
-    hmap = {h.lower(): i for i, h in enumerate(headers)}
+def _parse_results_table(h: Any, table: Any, provider: str) -> Tuple[Dict[str,Any], Dict[str,Any]]:
+    """Pl/Name/Team/Time results table (no splits) -> (split_report, ind_res)."""
+    headers = [h.text(th) for th in h.header_cells(table)]
+    hmap = {hd.lower(): i for i, hd in enumerate(headers)}
 
     def get(cells, key, default=""):
         i = hmap.get(key.lower())
         if i is None or i >= len(cells):
             return default
-        return cells[i].get_text(" ", strip=True)
+        return h.text(cells[i])
 
     spr_rows = []
     res_rows = []
 
-    for tr in table.select("tr")[1:]:
-        tds = tr.select("td")
+    for tr in h.rows(table)[1:]:
+        tds = h.cells(tr, ("td",))
         if not tds:
             continue
 
@@ -414,79 +484,78 @@ def parse_rtspt_html(url: str) -> Tuple[Dict[str,Any], Dict[str,Any]]:
         res_rows.append({"r": {"a": athlete, "p": place, "tm": tm}})
         spr_rows.append({"r": {"a": athlete, "p": place, "tm": tm, "splits": []}})
 
-    split_report = {"_source": {"spr": spr_rows}, "_provider": "rtspt_html"}
-    ind_res = {"_source": {"r": res_rows}, "_provider": "rtspt_html"}
-    print(f"[rtspt] parsed {len(res_rows)} rows")
-
+    split_report = {"_source": {"spr": spr_rows}, "_provider": provider}
+    ind_res = {"_source": {"r": res_rows}, "_provider": provider}
     return split_report, ind_res
 
 
-# ---------------- Leone Timing XC compiled ----------------
+def parse_rtspt_page(html: str, h: Any = None) -> Tuple[Dict[str,Any], Dict[str,Any]]:
+    """Parse an rtspt results page (the table after 'Individual Results', else the first)."""
+    h = h or html_backend()
+    doc = h.parse(html)
 
-def parse_leone_xc(url: str) -> Tuple[Dict[str,Any], Dict[str,Any]]:
-    print(f"[leone] GET {url}")
-    r = requests.get(url, timeout=30)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "lxml")
+    table = None
+    for tag in h.find_all(doc, "h2", "h3", "h4", "h5"):
+        if "individual results" in h.text(tag).lower():
+            table = h.find_next(tag, "table")
+            if table is not None:
+                break
+    if table is None:
+        table = h.find_first(doc, "table")
 
-    compiled_link = None
-    for a in soup.find_all("a"):
-        txt = (a.get_text(" ", strip=True) or "").lower()
-        href = a.get("href") or ""
-        if "compiled" in txt and "html" in txt and href:
-            compiled_link = urljoin(url, href)
-            break
+    if table is None:
+        print("[rtspt] no table; empty")
+        return _empty_table_bundle("rtspt_html")
+    return _parse_results_table(h, table, "rtspt_html")
 
-    if not compiled_link:
-        print("[leone] no compiled link; empty")
-        return (
-            {"_source": {"spr": []}, "_provider": "leone_xc"},
-            {"_source": {"r": []}, "_provider": "leone_xc"},
-        )
 
-    print(f"[leone] compiled -> {compiled_link}")
-    cr = requests.get(compiled_link, timeout=30)
-    cr.raise_for_status()
-    csoup = BeautifulSoup(cr.text, "lxml")
+def parse_rtspt_html(url: str) -> Tuple[Dict[str,Any], Dict[str,Any]]:
+    print(f"[rtspt] GET {url}")
+    r = get_page(url, timeout=30)
+    r.raise_for_status()
+    split_report, ind_res = parse_rtspt_page(r.text)
+    print(f"[rtspt] parsed {len(ind_res['_source']['r'])} rows")
+    return split_report, ind_res
 
-    table = csoup.find("table")
-    if not table:
-        print("[leone] no table; empty")
-        return (
-            {"_source": {"spr": []}, "_provider": "leone_xc"},
-            {"_source": {"r": []}, "_provider": "leone_xc"},
-        )
 
-    headers = [th.get_text(" ", strip=True) for th in table.select("tr th")]
-    hmap = {h.lower(): i for i, h in enumerate(headers)}
+# ---------------- Leone Timing XC compiled ----------------
 
-    def get(cells, key, default=""):
-        i = hmap.get(key.lower())
-        if i is None or i >= len(cells):
-            return default
-        return cells[i].get_text(" ", strip=True)
+def find_leone_compiled_link(html: str, url: str, h: Any = None) -> Optional[str]:
+    """Absolute URL of the 'compiled ... html' results link on a Leone meet page."""
+    h = h or html_backend()
+    for a in h.find_all(h.parse(html), "a"):
+        txt = h.text(a).lower()
+        href = h.attr(a, "href")
+        if "compiled" in txt and "html" in txt and href:
+            return urljoin(url, href)
+    return None
 
-    spr_rows = []
-    res_rows = []
 
-    for tr in table.select("tr")[1:]:
-        tds = tr.select("td")
-        if not tds:
-            continue
+def parse_leone_compiled(html: str, h: Any = None) -> Tuple[Dict[str,Any], Dict[str,Any]]:
+    """Parse the first table of a Leone compiled results page."""
+    h = h or html_backend()
+    table = h.find_first(h.parse(html), "table")
+    if table is None:
+        print("[leone] no table; empty")
+        return _empty_table_bundle("leone_xc")
+    return _parse_results_table(h, table, "leone_xc")
 
-        place = get(tds, "pl", get(tds, "place", ""))
-        name = get(tds, "name", get(tds, "athlete", ""))
-        team = get(tds, "team", "")
-        tm = get(tds, "time", get(tds, "final", ""))
 
-        athlete = {"n": name, "t": {"n": team, "f": team, "lg": ""}}
-        res_rows.append({"r": {"a": athlete, "p": place, "tm": tm}})
-        spr_rows.append({"r": {"a": athlete, "p": place, "tm": tm, "splits": []}})
+def parse_leone_xc(url: str) -> Tuple[Dict[str,Any], Dict[str,Any]]:
+    print(f"[leone] GET {url}")
+    r = get_page(url, timeout=30)
+    r.raise_for_status()
 
-    split_report = {"_source": {"spr": spr_rows}, "_provider": "leone_xc"}
-    ind_res = {"_source": {"r": res_rows}, "_provider": "leone_xc"}
-    print(f"[leone] parsed {len(res_rows)} rows")
+    compiled_link = find_leone_compiled_link(r.text, url)
+    if not compiled_link:
+        print("[leone] no compiled link; empty")
+        return _empty_table_bundle("leone_xc")
 
+    print(f"[leone] compiled -> {compiled_link}")
+    cr = http_get(compiled_link, timeout=30)
+    cr.raise_for_status()
+    split_report, ind_res = parse_leone_compiled(cr.text)
+    print(f"[leone] parsed {len(ind_res['_source']['r'])} rows")
     return split_report, ind_res
 
 
@@ -539,6 +608,7 @@ async def capture_trackscoreboard(url: str, headful: bool) -> Tuple[Dict[str,Any
             args=["--no-sandbox", "--disable-dev-shm-usage"],
         )
         ctx = await browser.new_context(viewport={"width": 1400, "height": 900})
+        await apply_resource_policy(ctx)
         page = await ctx.new_page()
         page.on("response", on_response)
 
@@ -568,109 +638,112 @@ async def capture_trackscoreboard(url: str, headful: bool) -> Tuple[Dict[str,Any
 # Handles lancer.trackscoreboard.com and live.halfmiletiming.com.
 # These SPAs are server-side rendered — all data is in the DOM, no XHR.
 
-async def capture_trackscoreboard_html(url: str, headful: bool) -> Tuple[Dict[str,Any], Dict[str,Any], Dict[str,str]]:
-    from playwright.async_api import async_playwright
+# Active tab body of the event view; the Splits tab is the one with td.split-col.
+# Rows left over from a previous client-side navigation carry data-pace-stale.
+TS_HTML_ACTIVE_ROWS = ".event-tabs mat-tab-body.mat-mdc-tab-body-active tr.mat-mdc-row:not([data-pace-stale])"
+TS_HTML_SPLIT_CELLS = TS_HTML_ACTIVE_ROWS + " td.split-col"
+# Ceilings only; captures continue as soon as the rows settle
+TS_HTML_ROWS_TIMEOUT_MS = 15000
+TS_HTML_SPLITS_TIMEOUT_MS = 8000
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=not headful,
-            args=["--no-sandbox", "--disable-dev-shm-usage"],
-        )
-        ctx = await browser.new_context(viewport={"width": 1400, "height": 900})
-        page = await ctx.new_page()
 
-        print(f"[ts-html nav] {url}")
-        await page.goto(url, wait_until="networkidle")
-        await page.wait_for_timeout(3000)
-
-        # ---- Results tab (default active) ----
-        r_rows = await page.evaluate("""
-            () => {
-                const eventTabs = document.querySelector('.event-tabs');
-                if (!eventTabs) return [];
-                const body = Array.from(eventTabs.querySelectorAll('mat-tab-body'))
-                    .find(b => b.classList.contains('mat-mdc-tab-body-active'));
-                if (!body) return [];
-                const rows = Array.from(body.querySelectorAll('tr.mat-mdc-row'));
-                return rows.map(tr => {
-                    const placeCell  = tr.querySelector('td.place-col');
-                    const nameCell   = tr.querySelector('td.name-col');
-                    const timeCell   = tr.querySelector('td.time-col');
-                    const markSpan   = tr.querySelector('span.mark-value');
-                    const nameLines  = (nameCell?.innerText || '').split('\\n')
-                        .map(s => s.trim()).filter(Boolean);
-                    return { r: {
-                        Name:  nameLines[0] || '',
-                        Team:  nameLines[1] || '',
-                        Year:  nameLines[2] || '',
-                        Place: parseInt((placeCell?.innerText || '').trim()) || null,
-                        Time:  (timeCell?.querySelector('span.mark-value') || markSpan || timeCell)
-                               ?.innerText?.trim() || '',
-                    }};
-                }).filter(row => row.r.Name || row.r.Time);
-            }
-        """)
-        print(f"[ts-html] {len(r_rows)} result rows")
+async def _ts_html_wait_rows(page: Any) -> bool:
+    """Wait for (fresh) result rows in the active tab and for their count to settle."""
+    try:
+        await page.wait_for_selector(TS_HTML_ACTIVE_ROWS, timeout=TS_HTML_ROWS_TIMEOUT_MS)
+    except Exception:
+        print("[ts-html] no result rows rendered before timeout")
+        return False
+    await wait_for_stable_count(page, TS_HTML_ACTIVE_ROWS)
+    return True
+
+
+async def _ts_html_extract(page: Any) -> Tuple[Dict[str,Any], Dict[str,Any], Dict[str,str]]:
+    """Read results, splits and team logos from a rendered event view."""
+    # ---- Results tab (default active) ----
+    r_rows = await page.evaluate("""
+        () => {
+            const eventTabs = document.querySelector('.event-tabs');
+            if (!eventTabs) return [];
+            const body = Array.from(eventTabs.querySelectorAll('mat-tab-body'))
+                .find(b => b.classList.contains('mat-mdc-tab-body-active'));
+            if (!body) return [];
+            const rows = Array.from(body.querySelectorAll('tr.mat-mdc-row'));
+            return rows.map(tr => {
+                const placeCell  = tr.querySelector('td.place-col');
+                const nameCell   = tr.querySelector('td.name-col');
+                const timeCell   = tr.querySelector('td.time-col');
+                const markSpan   = tr.querySelector('span.mark-value');
+                const nameLines  = (nameCell?.innerText || '').split('\\n')
+                    .map(s => s.trim()).filter(Boolean);
+                return { r: {
+                    Name:  nameLines[0] || '',
+                    Team:  nameLines[1] || '',
+                    Year:  nameLines[2] || '',
+                    Place: parseInt((placeCell?.innerText || '').trim()) || null,
+                    Time:  (timeCell?.querySelector('span.mark-value') || markSpan || timeCell)
+                           ?.innerText?.trim() || '',
+                }};
+            }).filter(row => row.r.Name || row.r.Time);
+        }
+    """)
+    print(f"[ts-html] {len(r_rows)} result rows")
 
-        # ---- Splits tab (if present) ----
-        spr_rows: List[Dict[str,Any]] = []
-        try:
-            splits_tab = page.locator('.event-tabs .mdc-tab__text-label', has_text='Splits')
-            if await splits_tab.count() > 0:
-                await splits_tab.first.click(timeout=4000)
-                await page.wait_for_timeout(2500)
-                spr_rows = await page.evaluate("""
-                    () => {
-                        const eventTabs = document.querySelector('.event-tabs');
-                        if (!eventTabs) return [];
-                        const body = Array.from(eventTabs.querySelectorAll('mat-tab-body'))
-                            .find(b => b.classList.contains('mat-mdc-tab-body-active'));
-                        if (!body) return [];
-                        const table = body.querySelector('table');
-                        if (!table) return [];
-
-                        // Build split labels from header cells after TIME
-                        const headers = Array.from(table.querySelectorAll('th'))
-                            .map(th => th.innerText.trim());
-                        const timeIdx = headers.findIndex(h => h === 'TIME');
-                        const splitLabels = headers.slice(timeIdx + 1).filter(h => h);
-
-                        return Array.from(table.querySelectorAll('tr.mat-mdc-row')).map(tr => {
-                            const nameCell  = tr.querySelector('td.name-col');
-                            const nameLines = (nameCell?.innerText || '').split('\\n')
+    # ---- Splits tab (if present) ----
+    spr_rows: List[Dict[str,Any]] = []
+    try:
+        splits_tab = page.locator('.event-tabs .mdc-tab__text-label', has_text='Splits')
+        if await splits_tab.count() > 0:
+            await splits_tab.first.click(timeout=4000)
+            try:
+                await page.wait_for_selector(TS_HTML_SPLIT_CELLS, timeout=TS_HTML_SPLITS_TIMEOUT_MS)
+                await wait_for_stable_count(page, TS_HTML_ACTIVE_ROWS)
+            except Exception:
+                print("[ts-html] split cells did not render before timeout")
+            spr_rows = await page.evaluate("""
+                () => {
+                    const eventTabs = document.querySelector('.event-tabs');
+                    if (!eventTabs) return [];
+                    const body = Array.from(eventTabs.querySelectorAll('mat-tab-body'))
+                        .find(b => b.classList.contains('mat-mdc-tab-body-active'));
+                    if (!body) return [];
+                    const table = body.querySelector('table');
+                    if (!table) return [];
+
+                    // Build split labels from header cells after TIME
+                    const headers = Array.from(table.querySelectorAll('th'))
+                        .map(th => th.innerText.trim());
+                    const timeIdx = headers.findIndex(h => h === 'TIME');
+                    const splitLabels = headers.slice(timeIdx + 1).filter(h => h);
+
+                    return Array.from(table.querySelectorAll('tr.mat-mdc-row')).map(tr => {
+                        const nameCell  = tr.querySelector('td.name-col');
+                        const nameLines = (nameCell?.innerText || '').split('\\n')
+                            .map(s => s.trim()).filter(Boolean);
+                        const splitCells = Array.from(tr.querySelectorAll('td.split-col'));
+                        const splits = splitCells.map((cell, i) => {
+                            // cell text: "cumulative\\nlap" or just "cumulative"
+                            const parts = cell.innerText.trim().split('\\n')
                                 .map(s => s.trim()).filter(Boolean);
-                            const splitCells = Array.from(tr.querySelectorAll('td.split-col'));
-                            const splits = splitCells.map((cell, i) => {
-                                // cell text: "cumulative\\nlap" or just "cumulative"
-                                const parts = cell.innerText.trim().split('\\n')
-                                    .map(s => s.trim()).filter(Boolean);
-                                return { label: splitLabels[i] || ('S' + (i+1)), tm: parts[0] || '' };
-                            }).filter(sp => sp.tm);
-                            if (!nameLines[0] && splits.length === 0) return null;
-                            return { r: { name: nameLines[0] || '', team: nameLines[1] || '', splits } };
-                        }).filter(Boolean);
-                    }
-                """)
-                print(f"[ts-html] {len(spr_rows)} split rows")
-            else:
-                print("[ts-html] no Splits tab")
-        except Exception as e:
-            print(f"[ts-html] splits err: {type(e).__name__}: {e}")
-
-        # ---- Team logos ----
-        logos: Dict[str, str] = {}
-        try:
-            html = await page.content()
-            soup = BeautifulSoup(html, "lxml")
-            for img in soup.select("img[src*='logos']"):
-                src = img.get("src", "")
-                alt = (img.get("alt") or "").strip()
-                if src:
-                    logos.setdefault(alt or src.split("/")[-1], src)
-        except Exception:
-            pass
+                            return { label: splitLabels[i] || ('S' + (i+1)), tm: parts[0] || '' };
+                        }).filter(sp => sp.tm);
+                        if (!nameLines[0] && splits.length === 0) return null;
+                        return { r: { name: nameLines[0] || '', team: nameLines[1] || '', splits } };
+                    }).filter(Boolean);
+                }
+            """)
+            print(f"[ts-html] {len(spr_rows)} split rows")
+        else:
+            print("[ts-html] no Splits tab")
+    except Exception as e:
+        print(f"[ts-html] splits err: {type(e).__name__}: {e}")
 
-        await browser.close()
+    # ---- Team logos ----
+    logos: Dict[str, str] = {}
+    try:
+        logos = extract_logos(await page.content(), "logos")
+    except Exception:
+        pass
 
     split_report: Dict[str, Any] = {"_source": {"spr": spr_rows}, "_provider": "trackscoreboard_html"}
     ind_res: Dict[str, Any] = {"_source": {"r": r_rows}, "_provider": "trackscoreboard_html"}
@@ -683,90 +756,264 @@ async def capture_trackscoreboard_html(url: str, headful: bool) -> Tuple[Dict[st
     return split_report, ind_res, logos
 
 
-# ---------------- PT Timing (Firebase RTDB) ----------------
+async def capture_trackscoreboard_html(url: str, headful: bool) -> Tuple[Dict[str,Any], Dict[str,Any], Dict[str,str]]:
+    from playwright.async_api import async_playwright
+
+    tags = {"provider": "trackscoreboard_html", "event_id": event_id_from_url(url)}
+
+    async with async_playwright() as p:
+        with span("browser_launch", **tags):
+            browser = await p.chromium.launch(
+                headless=not headful,
+                args=["--no-sandbox", "--disable-dev-shm-usage"],
+            )
+            ctx = await browser.new_context(viewport={"width": 1400, "height": 900})
+            await apply_resource_policy(ctx)
+            page = await ctx.new_page()
 
-def capture_pttiming(url: str, headful: bool) -> Dict[str, Tuple[Dict[str,Any], Dict[str,Any], Dict[str,str]]]:
+        print(f"[ts-html nav] {url}")
+        with span("navigation", **tags) as rec:
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+            rec["ok"] = await _ts_html_wait_rows(page)
+        bundle = await _ts_html_extract(page)
+
+        await browser.close()
+
+    return bundle
+
+
+async def _ts_html_client_nav(page: Any, url: str) -> bool:
     """
-    Fetches pttiming data directly from Firebase Realtime Database REST API.
-    pttiming pages use Firebase RTDB (not XHR), so Playwright XHR interception
-    cannot capture the data. The RTDB is publicly readable.
+    Route the already-booted Angular app to another event without a reload:
+    mark the current rows stale, pushState + popstate (the router listens for
+    it), then wait for fresh rows. Returns False if the route didn't render.
+    """
+    target = urlparse(url)
+    path = target.path + (f"?{target.query}" if target.query else "")
+    await page.evaluate("""
+        (path) => {
+            document.querySelectorAll('tr.mat-mdc-row')
+                .forEach(tr => tr.setAttribute('data-pace-stale', '1'));
+            history.pushState({}, '', path);
+            window.dispatchEvent(new PopStateEvent('popstate', {state: {}}));
+        }
+    """, path)
+    if urlparse(page.url).path.rstrip("/") != target.path.rstrip("/"):
+        return False
+    if not await _ts_html_wait_rows(page):
+        return False
+    # A reused tab group may still have Splits selected; go back to Results
+    if await page.locator(TS_HTML_SPLIT_CELLS).count() > 0:
+        await page.locator(".event-tabs .mdc-tab").first.click(timeout=4000)
+        await _ts_html_wait_rows(page)
+    return True
+
+
+async def capture_trackscoreboard_html_meet(urls: List[str], headful: bool) -> Dict[str, Bundle]:
+    """
+    Capture several events of one TrackScoreboard meet in a single page: the
+    first event boots the SPA, later ones navigate client-side so the JS
+    bundle and API caches stay warm. Falls back to a full goto per event if
+    client-side routing doesn't render.
 
     Returns mapping: event_id -> (split_report, ind_res_list, logos)
-    Each event_id corresponds to one race (ENR key from MeetEvents).
     """
-    import urllib.request as _req
+    from playwright.async_api import async_playwright
 
-    def _fb_fetch(fb_url: str) -> Any:
-        try:
-            with _req.urlopen(fb_url, timeout=30) as resp:
-                return json.loads(resp.read().decode())
-        except Exception as e:
-            print(f"[pt] Firebase fetch error {fb_url}: {e}")
-            return None
+    events: Dict[str, Bundle] = {}
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=not headful,
+            args=["--no-sandbox", "--disable-dev-shm-usage"],
+        )
+        ctx = await browser.new_context(viewport={"width": 1400, "height": 900})
+        await apply_resource_policy(ctx)
+        page = await ctx.new_page()
 
-    def _empty_events(note: str) -> Dict[str, Tuple[Dict,Dict,Dict]]:
-        base_id = event_id_from_url(url)
-        return {base_id: (
-            {"_source": {"spr": []}, "_provider": "pttiming", "_note": note},
-            {"_source": {"r": []}, "_provider": "pttiming", "_note": note},
-            {}
-        )}
+        booted = False
+        for url in urls:
+            eid = event_id_from_url(url)
+            try:
+                with span("navigation", provider="trackscoreboard_html", event_id=eid) as rec:
+                    rec["client_side"] = booted and await _ts_html_client_nav(page, url)
+                    if rec["client_side"]:
+                        print(f"[ts-html nav] {url} (client-side)")
+                    else:
+                        print(f"[ts-html nav] {url}")
+                        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+                        rec["ok"] = await _ts_html_wait_rows(page)
+                        booted = True
+                events[eid] = await _ts_html_extract(page)
+            except Exception as e:
+                print(f"[ts-html] error on {url}: {type(e).__name__}: {e}")
+
+        await browser.close()
+
+    return events
+
+
+# ---------------- PT Timing (Firebase RTDB) ----------------
+
+PT_DEFAULT_FB_BASE = "https://ptt-franklin.firebaseio.com/"
+
+# Event statuses whose entry data is final enough to ingest
+PT_DONE_STATUSES = ("Complete", "Official")
+
+# Concurrent RTDB requests per meet
+PT_FETCH_WORKERS = 8
+
+
+def _pt_fetch(fb_url: str) -> Any:
+    try:
+        return json.loads(urlopen_bytes(fb_url, timeout=30).decode())
+    except HostUnavailable:
+        raise
+    except Exception as e:
+        print(f"[pt] Firebase fetch error {fb_url}: {e}")
+        return None
+
+
+def _pt_fetch_many(urls: Dict[str, str]) -> Dict[str, Any]:
+    """Fetch {key: fb_url} concurrently; returns {key: decoded JSON or None}."""
+    from concurrent.futures import ThreadPoolExecutor
+    if not urls:
+        return {}
+    keys = list(urls)
+    with ThreadPoolExecutor(max_workers=min(PT_FETCH_WORKERS, len(keys))) as pool:
+        return dict(zip(keys, pool.map(_pt_fetch, [urls[k] for k in keys])))
+
+
+def pttiming_meet_index(url: str) -> Dict[str, Any]:
+    """
+    Resolve a pttiming meet's Firebase base + mid and fetch event metadata only.
+
+    Uses RTDB shallow queries: MeetEvents?shallow=true lists the event keys, and
+    MeetEvents/<enr>?shallow=true returns N/S/SL values with ED truncated to
+    `true`, so no entry data is downloaded here.
+
+    Returns {"mid", "fb_base", "logos", "events": {enr: {N, S, SL, has_ed}}},
+    plus "note" when the meet could not be indexed.
+    """
+    import urllib.request as _req
+
+    index: Dict[str, Any] = {"mid": "", "fb_base": PT_DEFAULT_FB_BASE, "logos": {}, "events": {}}
 
     # Extract meet ID from ?mid=XXXX
     mid_m = re.search(r"mid=(\d+)", url, re.IGNORECASE)
     if not mid_m:
         print(f"[pt] no mid= in URL: {url}")
-        return _empty_events("no_mid_param")
+        index["note"] = "no_mid_param"
+        return index
     mid = mid_m.group(1)
+    index["mid"] = mid
 
     # Get Firebase base URL from page HTML (default to known URL)
-    fb_base = "https://ptt-franklin.firebaseio.com/"
     try:
         page_req = _req.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with _req.urlopen(page_req, timeout=10) as resp:
-            html = resp.read().decode("utf-8", errors="replace")
+        html = urlopen_bytes(page_req, timeout=10).decode("utf-8", errors="replace")
         m = re.search(r'fbURL\s*=\s*["\']([^"\']+)["\']', html)
         if m:
-            fb_base = m.group(1).rstrip("/") + "/"
+            index["fb_base"] = m.group(1).rstrip("/") + "/"
+    except HostUnavailable:
+        raise
     except Exception as e:
         print(f"[pt] HTML fetch failed ({e}); using default fbURL")
 
-    print(f"[pt] Firebase base: {fb_base}  mid: {mid}")
-    fb_data = _fb_fetch(fb_base + mid + ".json")
-    if not isinstance(fb_data, dict):
-        print(f"[pt] Firebase returned no data for mid={mid}")
-        return _empty_events("firebase_null")
-
-    # Extract meet logo
-    logos: Dict[str, str] = {}
-    meta = fb_data.get("Meta") or {}
-    logo_file = meta.get("logo") if isinstance(meta, dict) else None
-    if logo_file:
-        logos["primary"] = f"https://live.pttiming.com/img/{logo_file}"
+    meet_root = index["fb_base"] + mid
+    print(f"[pt] Firebase base: {index['fb_base']}  mid: {mid}")
 
-    meet_events = fb_data.get("MeetEvents") or {}
-    if not isinstance(meet_events, dict):
+    keys = _pt_fetch(meet_root + "/MeetEvents.json?shallow=true")
+    if not isinstance(keys, dict) or not keys:
         print(f"[pt] no MeetEvents in Firebase data for mid={mid}")
-        return _empty_events("no_meet_events")
+        index["note"] = "no_meet_events"
+        return index
+
+    logo_file = _pt_fetch(meet_root + "/Meta/logo.json")
+    if isinstance(logo_file, str) and logo_file:
+        index["logos"]["primary"] = f"https://live.pttiming.com/img/{logo_file}"
+
+    # Per-event metadata, shallow, fetched concurrently
+    fetched = _pt_fetch_many({
+        enr: f"{meet_root}/MeetEvents/{quote(enr, safe='')}.json?shallow=true"
+        for enr in keys
+    })
+    for enr, evt in fetched.items():
+        if not isinstance(evt, dict):
+            continue
+        index["events"][enr] = {
+            "N": evt.get("N", ""),
+            "S": evt.get("S", ""),
+            "SL": evt.get("SL") or "",
+            "has_ed": bool(evt.get("ED")),
+        }
+    return index
+
+
+def pttiming_selected_events(index: Dict[str, Any]) -> List[str]:
+    """Event keys worth fetching: completed distance events that have entry data."""
+    from pace_discover import classify_event
+    return [
+        enr for enr, evt in index["events"].items()
+        if evt["has_ed"]
+        and evt["S"] in PT_DONE_STATUSES
+        and classify_event(str(evt["N"]))["category"] == "distance"
+    ]
+
+
+def capture_pttiming(url: str, headful: bool,
+                     enrs: Optional[List[str]] = None) -> Dict[str, Tuple[Dict[str,Any], Dict[str,Any], Dict[str,str]]]:
+    """
+    Fetches pttiming data directly from Firebase Realtime Database REST API.
+    pttiming pages use Firebase RTDB (not XHR), so Playwright XHR interception
+    cannot capture the data. The RTDB is publicly readable.
+
+    Event metadata is indexed first with shallow queries; entry data (ED) is
+    then fetched concurrently for the selected events only (completed distance
+    events by default, or the given `enrs`).
+
+    Returns mapping: event_id -> (split_report, ind_res_list, logos)
+    Each event_id corresponds to one race (ENR key from MeetEvents).
+    """
+    def _empty_events(note: str) -> Dict[str, Tuple[Dict,Dict,Dict]]:
+        base_id = event_id_from_url(url)
+        return {base_id: (
+            {"_source": {"spr": []}, "_provider": "pttiming", "_note": note},
+            {"_source": {"r": []}, "_provider": "pttiming", "_note": note},
+            {}
+        )}
+
+    tags = {"provider": "pttiming", "event_id": event_id_from_url(url)}
+    with span("pt_index", **tags) as rec:
+        index = pttiming_meet_index(url)
+        rec["ok"] = not index.get("note")
+        rec["events"] = len(index["events"])
+    if index.get("note"):
+        return _empty_events(index["note"])
+    mid = index["mid"]
+    logos: Dict[str, str] = index["logos"]
+
+    selected = enrs if enrs is not None else pttiming_selected_events(index)
+    selected = [enr for enr in selected if enr in index["events"]]
+    print(f"[pt] {len(selected)}/{len(index['events'])} events selected for entry data")
+
+    meet_root = index["fb_base"] + mid
+    with span("pt_entry_data", events=len(selected), **tags):
+        ed_by_enr = _pt_fetch_many({
+            enr: f"{meet_root}/MeetEvents/{quote(enr, safe='')}/ED.json" for enr in selected
+        })
 
     events: Dict[str, Tuple[Dict,Dict,Dict]] = {}
 
-    for enr, evt in meet_events.items():
-        if not isinstance(evt, dict):
-            continue
-        # Skip events with no entry data
-        ed = evt.get("ED") or {}
+    for enr in selected:
+        evt = index["events"][enr]
+        ed = ed_by_enr.get(enr)
         if not isinstance(ed, dict) or not ed:
             continue
-        # Only include completed/official events
-        status = evt.get("S", "")
-        if status not in ("Complete", "Official", "InProgress"):
-            continue
 
         entries = list(ed.values())
 
         # Split distance labels from SL (comma-sep meters, e.g. "209,409,609,809,1009,1209,1409,1609")
-        sl_raw = evt.get("SL") or ""
+        sl_raw = evt["SL"]
         sl_labels = [s.strip() + "m" for s in str(sl_raw).split(",") if s.strip()] if sl_raw else []
 
         eid = f"{mid}_{enr.replace('-', '_')}"
@@ -776,17 +1023,17 @@ def capture_pttiming(url: str, headful: bool) -> Dict[str, Tuple[Dict[str,Any],
                 "sl": sl_labels,
             },
             "_provider": "pttiming",
-            "_event_name": evt.get("N", ""),
+            "_event_name": evt["N"],
             "_enr": enr,
         }
         ind_res = {
             "_source": {"r": entries},
             "_provider": "pttiming",
-            "_event_name": evt.get("N", ""),
+            "_event_name": evt["N"],
         }
         events[eid] = (split_report, ind_res, logos)
         has_spd = any(isinstance(e, dict) and isinstance(e.get("SPD"), list) for e in entries)
-        print(f"[pt] {eid} -> {evt.get('N','')} ({len(entries)} athletes, has_spd={has_spd})")
+        print(f"[pt] {eid} -> {evt['N']} ({len(entries)} athletes, has_spd={has_spd})")
 
     if not events:
         print(f"[pt] no complete events found for mid={mid}")
@@ -797,11 +1044,17 @@ def capture_pttiming(url: str, headful: bool) -> Dict[str, Tuple[Dict[str,Any],
 
 # ---------------- MileSplit Live ----------------
 
-async def capture_milesplit_live(url: str, headful: bool) -> Dict[str, Tuple[Dict[str,Any], Dict[str,Any], Dict[str,str]]]:
+# Concurrent tabs per meet (each waits on its own Firestore render)
+MS_TABS = 4
+
+async def capture_milesplit_live(url: str, headful: bool,
+                                 tabs: int = MS_TABS) -> Dict[str, Tuple[Dict[str,Any], Dict[str,Any], Dict[str,str]]]:
     """
     DOM-based scraper for milesplit.live. Uses Playwright to render the Angular
     SPA, then clicks each distance event to load Firestore data and extracts
-    athlete names/times/splits from the rendered table DOM.
+    athlete names/times/splits from the rendered table DOM. Events are spread
+    over up to `tabs` pages in one browser context, each working through a
+    shared queue.
 
     milesplit.live uses Firebase Firestore (authenticated) for data, so XHR
     interception cannot capture it. Instead we extract from the rendered DOM
@@ -903,82 +1156,133 @@ async def capture_milesplit_live(url: str, headful: bool) -> Dict[str, Tuple[Dic
     }
     """
 
+    async def _list_events(page) -> List[Tuple[int, str]]:
+        """
+        Load the events list and return (position among li.pointer items, label)
+        for completed distance events. Labels repeat (e.g. two "Men 800m" heats),
+        so tabs dispatch on the position.
+        """
+        await page.goto(events_url, wait_until="domcontentloaded", timeout=60000)
+        # Sidebar renders once Firestore answers; wait for it rather than a fixed delay
+        try:
+            await page.wait_for_selector("li.pointer", timeout=30000)
+        except Exception:
+            print(f"[ms] events list did not render: {events_url}")
+        await wait_for_stable_count(page, "li.pointer")
+        found: List[Tuple[int, str]] = []
+        for pos, item in enumerate(await page.query_selector_all("li.pointer")):
+            txt = await item.inner_text()
+            clean = " ".join(txt.strip().split())
+            if "Completed" in clean and _is_distance_event(clean):
+                found.append((pos, clean))
+        return found
+
+    async def _scrape_event(page, item: Any, evt_name: str) -> None:
+        print(f"[ms] scraping: {evt_name[:60]}")
+        prev_url = page.url
+        await item.click()
+        # The tab may still show the previous event's table; wait for the route to change
+        try:
+            await page.wait_for_function("(u) => location.href !== u", arg=prev_url, timeout=10000)
+        except Exception:
+            pass
+        # Wait up to 25s for split cells to appear; fall back to 5s delay
+        try:
+            await page.wait_for_function(
+                "() => document.querySelectorAll('td.split .split-right-content .time').length > 3",
+                timeout=25000,
+            )
+        except Exception:
+            await page.wait_for_timeout(5000)
+
+        current_url = page.url
+        evt_id_m = re.search(r"/events/(\d+)/results/([A-Z])/([MF])", current_url)
+        if evt_id_m:
+            raw_id = f"{meet_id}_{evt_id_m.group(1)}_{evt_id_m.group(2)}_{evt_id_m.group(3)}"
+        else:
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", evt_name.split("•")[0].strip())
+            raw_id = f"{meet_id}_{slug[:40]}"
+
+        data = await page.evaluate(_EXTRACT_JS)
+        headers: List[str] = data.get("headers", [])
+        athletes: List[Dict[str, Any]] = data.get("athletes", [])
+
+        if not athletes:
+            print(f"[ms] no athletes for {evt_name[:40]}")
+            return
+
+        # Attach split distance labels from table headers
+        for ath in athletes:
+            for i, sp in enumerate(ath.get("splits", [])):
+                lbl = headers[i] if i < len(headers) else f"S{i+1}"
+                sp["label"] = lbl
+
+        sl_labels = list(headers)
+        split_report = {
+            "_source": {"spr": athletes, "sl": sl_labels},
+            "_provider": "milesplit_live",
+            "_event_name": evt_name,
+        }
+        ind_res = {
+            "_source": {"r": athletes},
+            "_provider": "milesplit_live",
+            "_event_name": evt_name,
+        }
+        has_spd = any(a.get("splits") for a in athletes)
+        all_events[raw_id] = (split_report, ind_res, {})
+        print(f"[ms] {raw_id}: {len(athletes)} athletes, has_splits={has_spd}")
+
+    async def _worker(ctx, first_page, queue: "asyncio.Queue[Tuple[int, str]]") -> None:
+        """One tab: pull (position, label) entries off the shared queue and scrape them in turn."""
+        page = first_page or await ctx.new_page()
+        loaded = first_page is not None
+        while True:
+            try:
+                pos, evt_name = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            try:
+                if not loaded:
+                    await _list_events(page)
+                    loaded = True
+                # Re-resolve the sidebar item in this tab; handles from other tabs don't transfer
+                items = await page.query_selector_all("li.pointer")
+                item = items[pos] if pos < len(items) else None
+                if item is None or " ".join((await item.inner_text()).strip().split()) != evt_name:
+                    print(f"[ms] event #{pos} not found in tab: {evt_name[:40]}")
+                    continue
+                with span("event_render", provider="milesplit_live", event_id=f"{meet_id}_{pos}", event=evt_name[:60]):
+                    await _scrape_event(page, item, evt_name)
+            except Exception as e:
+                print(f"[ms] error on {evt_name[:40]}: {type(e).__name__}: {e}")
+        if first_page is None:
+            await page.close()
+
     async with async_playwright() as p:
         browser = await p.chromium.launch(
             headless=not headful,
             args=["--no-sandbox", "--disable-dev-shm-usage"],
         )
         ctx = await browser.new_context(viewport={"width": 1400, "height": 900})
+        await apply_resource_policy(ctx)
         page = await ctx.new_page()
 
         print(f"[ms nav] {events_url}")
-        await page.goto(events_url, wait_until="domcontentloaded", timeout=60000)
-        await page.wait_for_timeout(10000)
-
-        # Collect sidebar items (li.pointer) and filter to completed distance events
-        items = await page.query_selector_all("li.pointer")
-        event_list: List[Tuple[Any, str]] = []
-        for item in items:
-            txt = await item.inner_text()
-            clean = " ".join(txt.strip().split())
-            if "Completed" in clean and _is_distance_event(clean):
-                event_list.append((item, clean))
-
+        with span("navigation", provider="milesplit_live", event_id=meet_id) as rec:
+            event_list = await _list_events(page)
+            rec["events"] = len(event_list)
         print(f"[ms] {len(event_list)} distance events to scrape from {events_url}")
 
-        for item, evt_name in event_list:
-            print(f"[ms] scraping: {evt_name[:60]}")
-            try:
-                await item.click()
-                # Wait up to 25s for split cells to appear; fall back to 5s delay
-                try:
-                    await page.wait_for_function(
-                        "() => document.querySelectorAll('td.split .split-right-content .time').length > 3",
-                        timeout=25000,
-                    )
-                except Exception:
-                    await page.wait_for_timeout(5000)
-
-                current_url = page.url
-                evt_id_m = re.search(r"/events/(\d+)/results/([A-Z])/([MF])", current_url)
-                if evt_id_m:
-                    raw_id = f"{meet_id}_{evt_id_m.group(1)}_{evt_id_m.group(2)}_{evt_id_m.group(3)}"
-                else:
-                    slug = re.sub(r"[^A-Za-z0-9]+", "_", evt_name.split("•")[0].strip())
-                    raw_id = f"{meet_id}_{slug[:40]}"
-
-                data = await page.evaluate(_EXTRACT_JS)
-                headers: List[str] = data.get("headers", [])
-                athletes: List[Dict[str, Any]] = data.get("athletes", [])
-
-                if not athletes:
-                    print(f"[ms] no athletes for {evt_name[:40]}")
-                    continue
-
-                # Attach split distance labels from table headers
-                for ath in athletes:
-                    for i, sp in enumerate(ath.get("splits", [])):
-                        lbl = headers[i] if i < len(headers) else f"S{i+1}"
-                        sp["label"] = lbl
-
-                sl_labels = list(headers)
-                split_report = {
-                    "_source": {"spr": athletes, "sl": sl_labels},
-                    "_provider": "milesplit_live",
-                    "_event_name": evt_name,
-                }
-                ind_res = {
-                    "_source": {"r": athletes},
-                    "_provider": "milesplit_live",
-                    "_event_name": evt_name,
-                }
-                has_spd = any(a.get("splits") for a in athletes)
-                all_events[raw_id] = (split_report, ind_res, {})
-                print(f"[ms] {raw_id}: {len(athletes)} athletes, has_splits={has_spd}")
-
-            except Exception as e:
-                print(f"[ms] error on {evt_name[:40]}: {type(e).__name__}: {e}")
-                continue
+        # Fan the events out over a bounded number of tabs in the same context
+        queue: "asyncio.Queue[Tuple[int, str]]" = asyncio.Queue()
+        for entry in event_list:
+            queue.put_nowait(entry)
+        n_tabs = max(1, min(tabs, len(event_list)))
+        if n_tabs > 1:
+            print(f"[ms] using {n_tabs} tabs")
+        await asyncio.gather(*[
+            _worker(ctx, page if i == 0 else None, queue) for i in range(n_tabs)
+        ])
 
         await browser.close()
 
@@ -1054,18 +1358,124 @@ def _parse_fr_split_cell(cell: str) -> str:
     return m.group(1) if m else ""
 
 
-def _find_fr_results_table(soup: BeautifulSoup) -> Optional[Any]:
+def _find_fr_results_table(h: Any, doc: Any) -> Optional[Any]:
     """Find the results table (has Pl + Athlete or Team headers)."""
-    for table in soup.find_all("table"):
-        first_tr = table.find("tr")
-        if not first_tr:
+    for table in h.find_all(doc, "table"):
+        first_tr = h.find_first(table, "tr")
+        if first_tr is None:
             continue
-        cells = [c.get_text(" ", strip=True).lower() for c in first_tr.find_all(["td", "th"])]
+        cells = [h.text(c).lower() for c in h.cells(first_tr)]
         if "pl" in cells and ("athlete" in cells or "team" in cells):
             return table
     return None
 
 
+def _fr_split_links(h: Any, doc: Any, url: str) -> List[str]:
+    """Section splits pages linked from a compiled page (single "Splits" or "Sect N View Splits")."""
+    splits_urls: List[str] = []
+    seen_split_hrefs: set = set()
+    for a in h.find_all(doc, "a"):
+        href = h.attr(a, "href")
+        txt = h.text(a, "").lower()
+        if "split" in txt and href and href not in seen_split_hrefs:
+            # Only follow links that look like section split pages (e.g. 026-1-01.htm)
+            if re.search(r"-0\d+\.htm", href, re.IGNORECASE):
+                seen_split_hrefs.add(href)
+                splits_urls.append(urljoin(url, href))
+    return splits_urls
+
+
+def _parse_fr_rows(h: Any, table: Any, with_splits: bool) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Rows of a FlashResults results table -> (spr_rows, res_rows); split columns only if with_splits."""
+    spr_rows: List[Dict[str, Any]] = []
+    res_rows: List[Dict[str, Any]] = []
+    rows = h.rows(table)
+    if not rows:
+        return spr_rows, res_rows
+    headers = [h.text(c) for c in h.cells(rows[0])]
+    hlow = [hd.lower() for hd in headers]
+
+    pl_idx = next((i for i, hd in enumerate(hlow) if hd == "pl"), None)
+    athlete_idx = next(
+        (i for i, hd in enumerate(hlow) if hd in ("athlete", "team")), None
+    )
+    time_idx = next((i for i, hd in enumerate(hlow) if hd == "time"), None)
+
+    split_labels: List[str] = []
+    split_col_idxs: List[int] = []
+    if with_splits and time_idx is not None:
+        for i in range(time_idx + 1, len(headers)):
+            lbl = headers[i].strip()
+            if lbl and re.match(r"^\d", lbl):
+                split_labels.append(lbl)
+                split_col_idxs.append(i)
+            elif lbl.lower() == "mile":
+                split_labels.append("Mile")
+                split_col_idxs.append(i)
+
+    for tr in rows[1:]:
+        tds = h.cells(tr)
+        if len(tds) < 2:
+            continue
+
+        def cell(idx: Optional[int], _tds: Any = tds) -> str:
+            if idx is None or idx >= len(_tds):
+                return ""
+            return h.text(_tds[idx])
+
+        place_raw = cell(pl_idx)
+        athlete_raw = cell(athlete_idx)
+        time_raw = cell(time_idx)
+        if not athlete_raw or not place_raw:
+            continue
+        try:
+            place = int(place_raw.strip())
+        except ValueError:
+            place = None
+
+        parsed = _parse_fr_athlete(athlete_raw)
+        time_str, flags = _parse_fr_time(time_raw)
+
+        splits: List[Dict[str, Any]] = []
+        for lbl, col_i in zip(split_labels, split_col_idxs):
+            elapsed = _parse_fr_split_cell(cell(col_i))
+            if elapsed:
+                splits.append({"label": lbl, "tm": elapsed})
+
+        athlete_node: Dict[str, Any] = {
+            "n": parsed["name"],
+            "t": {"n": parsed["team"], "f": parsed["team"], "lg": ""},
+        }
+        if parsed["bib"]:
+            athlete_node["b"] = parsed["bib"]
+
+        spr_rows.append({
+            "r": {"a": athlete_node, "p": place, "tm": time_str, "splits": splits, "fl": flags}
+        })
+        res_rows.append({
+            "r": {"a": athlete_node, "p": place, "tm": time_str, "fl": flags}
+        })
+    return spr_rows, res_rows
+
+
+def parse_fr_splits_page(html: str, h: Any = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Parse one FlashResults splits page -> (spr_rows, res_rows)."""
+    h = h or html_backend()
+    table = _find_fr_results_table(h, h.parse(html))
+    if table is None:
+        return [], []
+    return _parse_fr_rows(h, table, with_splits=True)
+
+
+def parse_fr_compiled_page(html: str, url: str, h: Any = None) -> Tuple[List[str], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Parse a compiled event page -> (splits page URLs, spr_rows, res_rows of its results table)."""
+    h = h or html_backend()
+    doc = h.parse(html)
+    table = _find_fr_results_table(h, doc)
+    spr_rows, res_rows = _parse_fr_rows(h, table, with_splits=False) if table is not None else ([], [])
+    return _fr_split_links(h, doc, url), spr_rows, res_rows
+
+
 def capture_flashresults(url: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """Scrape a FlashResults compiled event page (static HTML).
 
@@ -1074,8 +1484,10 @@ def capture_flashresults(url: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     """
     print(f"[fr] GET {url}")
     try:
-        resp = requests.get(url, timeout=30)
+        resp = get_page(url, timeout=30)
         resp.raise_for_status()
+    except HostUnavailable:
+        raise
     except Exception as e:
         print(f"[fr] fetch error: {e}")
         return (
@@ -1083,107 +1495,25 @@ def capture_flashresults(url: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
             {"_source": {"r": []}, "_provider": "flashresults", "_note": "fetch_error"},
         )
 
-    soup = BeautifulSoup(resp.text, "lxml")
-
-    # --- Find splits links (handles single-section "Splits" and multi-section "Sect NView Splits") ---
-    splits_urls: List[str] = []
-    seen_split_hrefs: set = set()
-    for a in soup.find_all("a"):
-        href = a.get("href", "")
-        txt = a.get_text(strip=True).lower()
-        if "split" in txt and href and href not in seen_split_hrefs:
-            # Only follow links that look like section split pages (e.g. 026-1-01.htm)
-            if re.search(r"-0\d+\.htm", href, re.IGNORECASE):
-                seen_split_hrefs.add(href)
-                splits_urls.append(urljoin(url, href))
+    h = html_backend()
+    doc = h.parse(resp.text)
+    splits_urls = _fr_split_links(h, doc, url)
 
     # --- Parse splits pages (single-section or multi-section) ---
     spr_rows: List[Dict[str, Any]] = []
     res_rows: List[Dict[str, Any]] = []
 
-    def _parse_splits_table(ssoup: BeautifulSoup) -> int:
-        """Parse one splits page and append rows to spr_rows/res_rows. Returns row count added."""
-        stable = _find_fr_results_table(ssoup)
-        if not stable:
-            return 0
-        rows = stable.select("tr")
-        if not rows:
-            return 0
-        header_row = rows[0]
-        headers = [c.get_text(" ", strip=True) for c in header_row.find_all(["td", "th"])]
-        hlow = [h.lower() for h in headers]
-
-        pl_idx = next((i for i, h in enumerate(hlow) if h == "pl"), None)
-        athlete_idx = next(
-            (i for i, h in enumerate(hlow) if h in ("athlete", "team")), None
-        )
-        time_idx = next((i for i, h in enumerate(hlow) if h == "time"), None)
-
-        split_labels: List[str] = []
-        split_col_idxs: List[int] = []
-        if time_idx is not None:
-            for i in range(time_idx + 1, len(headers)):
-                lbl = headers[i].strip()
-                if lbl and re.match(r"^\d", lbl):
-                    split_labels.append(lbl)
-                    split_col_idxs.append(i)
-                elif lbl.lower() == "mile":
-                    split_labels.append("Mile")
-                    split_col_idxs.append(i)
-
-        added = 0
-        for tr in rows[1:]:
-            tds = tr.find_all(["td", "th"])
-            if len(tds) < 2:
-                continue
-
-            def cell(idx: Optional[int], _tds: Any = tds) -> str:
-                if idx is None or idx >= len(_tds):
-                    return ""
-                return _tds[idx].get_text(" ", strip=True)
-
-            place_raw = cell(pl_idx)
-            athlete_raw = cell(athlete_idx)
-            time_raw = cell(time_idx)
-            if not athlete_raw or not place_raw:
-                continue
-            try:
-                place = int(place_raw.strip())
-            except ValueError:
-                place = None
-
-            parsed = _parse_fr_athlete(athlete_raw)
-            time_str, flags = _parse_fr_time(time_raw)
-
-            splits: List[Dict[str, Any]] = []
-            for lbl, col_i in zip(split_labels, split_col_idxs):
-                elapsed = _parse_fr_split_cell(cell(col_i))
-                if elapsed:
-                    splits.append({"label": lbl, "tm": elapsed})
-
-            athlete_node: Dict[str, Any] = {
-                "n": parsed["name"],
-                "t": {"n": parsed["team"], "f": parsed["team"], "lg": ""},
-            }
-            if parsed["bib"]:
-                athlete_node["b"] = parsed["bib"]
-
-            spr_rows.append({
-                "r": {"a": athlete_node, "p": place, "tm": time_str, "splits": splits, "fl": flags}
-            })
-            res_rows.append({
-                "r": {"a": athlete_node, "p": place, "tm": time_str, "fl": flags}
-            })
-            added += 1
-        return added
-
     for splits_url in splits_urls:
         print(f"[fr] splits -> {splits_url}")
         try:
-            sresp = requests.get(splits_url, timeout=30)
+            sresp = http_get(splits_url, timeout=30)
             sresp.raise_for_status()
-            n = _parse_splits_table(BeautifulSoup(sresp.text, "lxml"))
-            print(f"[fr] +{n} rows from section")
+            section_spr, section_res = parse_fr_splits_page(sresp.text, h)
+            spr_rows.extend(section_spr)
+            res_rows.extend(section_res)
+            print(f"[fr] +{len(section_spr)} rows from section")
+        except HostUnavailable:
+            raise
         except Exception as e:
             print(f"[fr] splits parse error: {type(e).__name__}: {e}")
 
@@ -1193,49 +1523,9 @@ def capture_flashresults(url: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     # --- If no splits page or it failed, fall back to compiled results table ---
     if not res_rows:
         print("[fr] falling back to compiled results table")
-        ctable = _find_fr_results_table(soup)
-        if ctable:
-            rows = ctable.select("tr")
-            header_row = rows[0]
-            headers = [c.get_text(" ", strip=True) for c in header_row.find_all(["td", "th"])]
-            hlow = [h.lower() for h in headers]
-            pl_idx = next((i for i, h in enumerate(hlow) if h == "pl"), None)
-            athlete_idx = next(
-                (i for i, h in enumerate(hlow) if h in ("athlete", "team")), None
-            )
-            time_idx = next((i for i, h in enumerate(hlow) if h == "time"), None)
-
-            for tr in rows[1:]:
-                tds = tr.find_all(["td", "th"])
-                if len(tds) < 2:
-                    continue
-                def cell(idx):
-                    if idx is None or idx >= len(tds):
-                        return ""
-                    return tds[idx].get_text(" ", strip=True)
-                place_raw = cell(pl_idx)
-                athlete_raw = cell(athlete_idx)
-                time_raw = cell(time_idx)
-                if not athlete_raw or not place_raw:
-                    continue
-                try:
-                    place = int(place_raw.strip())
-                except ValueError:
-                    place = None
-                parsed = _parse_fr_athlete(athlete_raw)
-                time_str, flags = _parse_fr_time(time_raw)
-                athlete_node = {
-                    "n": parsed["name"],
-                    "t": {"n": parsed["team"], "f": parsed["team"], "lg": ""},
-                }
-                if parsed["bib"]:
-                    athlete_node["b"] = parsed["bib"]
-                res_rows.append({
-                    "r": {"a": athlete_node, "p": place, "tm": time_str, "fl": flags}
-                })
-                spr_rows.append({
-                    "r": {"a": athlete_node, "p": place, "tm": time_str, "splits": [], "fl": flags}
-                })
+        ctable = _find_fr_results_table(h, doc)
+        if ctable is not None:
+            spr_rows, res_rows = _parse_fr_rows(h, ctable, with_splits=False)
             print(f"[fr] compiled fallback: {len(res_rows)} rows")
 
     split_report: Dict[str, Any] = {"_source": {"spr": spr_rows}, "_provider": "flashresults"}
@@ -1245,13 +1535,95 @@ def capture_flashresults(url: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
     return split_report, ind_res
 
 
+# ---------------- fetch metadata (freshness checks) ----------------
+# Each event dir keeps _fetch_meta.json: the digest of the bundle last written
+# plus HTTP validators (ETag / Last-Modified / body hash) for its source URL,
+# so --refresh can make cheap conditional requests and skip unchanged bundles.
+
+FETCH_META_FILE = "_fetch_meta.json"
+
+# Single-page HTTP providers whose source URL can be probed conditionally
+CONDITIONAL_PROVIDERS = frozenset(["flashresults", "rtspt_html", "leone_xc"])
+
+
+def load_fetch_meta(event_dir: pathlib.Path) -> Dict[str, Any]:
+    try:
+        meta = json.loads((event_dir / FETCH_META_FILE).read_text(encoding="utf-8"))
+        return meta if isinstance(meta, dict) else {}
+    except Exception:
+        return {}
+
+
+def save_fetch_meta(event_dir: pathlib.Path, meta: Dict[str, Any]) -> None:
+    ensure_dir(event_dir)
+    write_json_atomic(event_dir / FETCH_META_FILE, meta, indent=2, sort_keys=True)
+
+
+def bundle_digest(split_report: Any, ind_res: Any, logos: Dict[str, str]) -> str:
+    """Content hash of a bundle, independent of key order and formatting."""
+    blob = json.dumps([split_report, ind_res, logos], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def probe_url(url: str, prev: Optional[Dict[str, str]]) -> Tuple[bool, Dict[str, str], Optional[Any]]:
+    """
+    Conditional GET against a source URL. Returns (changed, validators, response).
+    Sends If-None-Match / If-Modified-Since from `prev`; a 304 means unchanged.
+    Servers that ignore validators are compared by body hash instead. The
+    response is the full 200 page (None otherwise), for the capture to reuse.
+    """
+    prev = prev or {}
+    headers: Dict[str, str] = {}
+    if prev.get("etag"):
+        headers["If-None-Match"] = prev["etag"]
+    if prev.get("last_modified"):
+        headers["If-Modified-Since"] = prev["last_modified"]
+    try:
+        r = requests.get(url, headers=headers, timeout=30)
+    except Exception as e:
+        print(f"[refresh] probe error {url}: {e}")
+        return True, {}, None
+    if r.status_code == 304:
+        return False, prev, None
+    if r.status_code >= 400:
+        return True, {}, None
+    validators = {
+        "etag": r.headers.get("ETag", ""),
+        "last_modified": r.headers.get("Last-Modified", ""),
+        "sha256": hashlib.sha256(r.content).hexdigest(),
+    }
+    changed = not prev.get("sha256") or prev["sha256"] != validators["sha256"]
+    return changed, validators, r
+
+
+# Pages a --refresh probe already downloaded, consumed by the capture's first GET
+_PROBED: Dict[str, Any] = {}
+
+
+def get_page(url: str, timeout: float = 30) -> Any:
+    """http_get for a capture's source page, reusing the probe's response when there is one."""
+    resp = _PROBED.pop(url, None)
+    if resp is None:
+        return http_get(url, timeout=timeout)
+    arc = pace_archive.current()
+    if arc is not None and not arc.replay:
+        arc.put(url, resp.content, resp.status_code, dict(resp.headers))
+    return resp
+
+
 # ---------------- write bundle ----------------
 
 def write_event_bundle(outdir: pathlib.Path,
                        event_id: str,
                        split_report: Dict[str,Any],
                        ind_res: Dict[str,Any],
-                       logos: Dict[str,str]) -> None:
+                       logos: Dict[str,str],
+                       logos_pending: bool = False) -> bool:
+    """
+    Write an event bundle; returns False (and writes nothing) if it is unchanged.
+    logos_pending marks a bundle prefilled without team logos (pace_discover),
+    which is_cached then does not count as cached.
+    """
     event_dir = outdir / event_id
     ensure_dir(event_dir)
 
@@ -1264,91 +1636,199 @@ def write_event_bundle(outdir: pathlib.Path,
     if not isinstance(ind_res, dict):
         ind_res = {"_source": {"r": []}, "_note": "invalid_ind_res_list"}
 
-    split_path.write_text(json.dumps(split_report, ensure_ascii=False, indent=2), encoding="utf-8")
-    reslist_path.write_text(json.dumps(ind_res, ensure_ascii=False, indent=2), encoding="utf-8")
-
+    meta = load_fetch_meta(event_dir)
+    digest = bundle_digest(split_report, ind_res, logos)
+    if meta.get("bundle_sha256") == digest and split_path.exists() \
+            and reslist_path.exists() and colors_path.exists():
+        print(f"[write] {event_id} unchanged")
+        if meta.get("logos_pending") and not logos_pending:
+            # The event page was captured and simply has no logos
+            meta.pop("logos_pending")
+            save_fetch_meta(event_dir, meta)
+        return False
+
+    # Other workers (pipeline / job queue normalizers) may be reading the bundle
     colors = build_team_colors_json(logos) if logos else {}
-    colors_path.write_text(json.dumps(colors, ensure_ascii=False, indent=2), encoding="utf-8")
+    write_json_atomic(split_path, split_report, ensure_ascii=False, indent=2)
+    write_json_atomic(reslist_path, ind_res, ensure_ascii=False, indent=2)
+    write_json_atomic(colors_path, colors, ensure_ascii=False, indent=2)
+
+    meta["bundle_sha256"] = digest
+    if logos_pending:
+        meta["logos_pending"] = True
+    else:
+        meta.pop("logos_pending", None)
+    save_fetch_meta(event_dir, meta)
 
     print(f"[write] {event_id} -> {split_path}, {reslist_path}, {colors_path}")
+    return True
 
 
-# ---------------- main CLI ----------------
+# ---------------- provider dispatch ----------------
 
-def main():
-    ap = argparse.ArgumentParser("PACE multi-provider race scraper (pre-normalization)")
-    ap.add_argument("--url", required=True, help="Race URL (Xpress, Raspy, Leone, PT, MileSplit, etc.)")
-    ap.add_argument("--outdir", default="data", help="Root folder to store cached JSON bundles")
-    ap.add_argument("--headful", action="store_true", help="Visible browser (for local debugging)")
-    ap.add_argument("--force", action="store_true", help="Ignore cache if already present")
-    args = ap.parse_args()
 
-    provider = detect_provider(args.url)
-    base_eid = event_id_from_url(args.url)
-    outdir = pathlib.Path(args.outdir)
-    ensure_dir(outdir)
+def _single(url: str, bundle: Tuple[Any, ...]) -> Dict[str, Bundle]:
+    """Wrap a single-event capture result as {event_id: bundle}."""
+    split_report, ind_res = bundle[0], bundle[1]
+    logos = bundle[2] if len(bundle) > 2 else {}
+    return {event_id_from_url(url): (split_report, ind_res, logos)}
+
+
+# provider -> handler(url, headful) -> {event_id: bundle}
+PROVIDER_HANDLERS: Dict[str, Callable[[str, bool], Dict[str, Bundle]]] = {
+    "legacy_spa": lambda url, headful: _single(url, asyncio.run(capture_legacy_spa(url, headful))),
+    "rtspt_html": lambda url, headful: _single(url, parse_rtspt_html(url)),
+    "leone_xc": lambda url, headful: _single(url, parse_leone_xc(url)),
+    "trackscoreboard": lambda url, headful: _single(url, asyncio.run(capture_trackscoreboard(url, headful))),
+    "trackscoreboard_html": lambda url, headful: _single(
+        url, asyncio.run(capture_trackscoreboard_html(url, headful))),
+    "pttiming": capture_pttiming,
+    "milesplit_live": lambda url, headful: asyncio.run(capture_milesplit_live(url, headful)),
+    "flashresults": lambda url, headful: _single(url, capture_flashresults(url)),
+}
 
-    print(f"[meta] provider={provider} base_eid={base_eid} outdir={outdir}")
 
-    if not args.force and provider != "pttiming":
-        event_dir = outdir / base_eid
-        if (event_dir / "split_report.json").exists() and \
+# ---------------- main CLI ----------------
+
+def is_cached(event_dir: pathlib.Path) -> bool:
+    return (event_dir / "split_report.json").exists() and \
            (event_dir / "ind_res_list.json").exists() and \
-           (event_dir / "team_colors.json").exists():
-            print(f"[meta] cache hit -> {event_dir}")
-            return
+           (event_dir / "team_colors.json").exists() and \
+           not load_fetch_meta(event_dir).get("logos_pending")
 
-    if provider == "legacy_spa":
-        split_report, ind_res, logos = asyncio.run(
-            capture_legacy_spa(args.url, headful=args.headful)
-        )
-        write_event_bundle(outdir, base_eid, split_report, ind_res, logos)
 
-    elif provider == "rtspt_html":
-        split_report, ind_res = parse_rtspt_html(args.url)
-        write_event_bundle(outdir, base_eid, split_report, ind_res, {})
+def write_events(outdir: pathlib.Path, events: Dict[str, Bundle]) -> List[str]:
+    """Write every bundle; returns the event ids whose bundle actually changed."""
+    changed = [
+        eid for eid, (split_report, ind_res, logos) in events.items()
+        if write_event_bundle(outdir, eid, split_report, ind_res, logos)
+    ]
+    print(f"[meta] {len(changed)}/{len(events)} bundle(s) written")
+    return changed
 
-    elif provider == "leone_xc":
-        split_report, ind_res = parse_leone_xc(args.url)
-        write_event_bundle(outdir, base_eid, split_report, ind_res, {})
 
-    elif provider == "trackscoreboard":
-        split_report, ind_res, logos = asyncio.run(
-            capture_trackscoreboard(args.url, headful=args.headful)
-        )
-        write_event_bundle(outdir, base_eid, split_report, ind_res, logos)
+# Captures made by this scraper run, keyed by fetch target: several --url
+# links into one pttiming meet download the meet tree once.
+_CAPTURES = Coalescer()
 
-    elif provider == "trackscoreboard_html":
-        split_report, ind_res, logos = asyncio.run(
-            capture_trackscoreboard_html(args.url, headful=args.headful)
-        )
-        write_event_bundle(outdir, base_eid, split_report, ind_res, logos)
 
-    elif provider == "pttiming":
-        events = capture_pttiming(args.url, headful=args.headful)
-        for eid, (split_report, ind_res, logos) in events.items():
-            write_event_bundle(outdir, eid, split_report, ind_res, logos)
+def scrape_url(url: str, outdir: pathlib.Path, headful: bool = False,
+               force: bool = False, refresh: bool = False) -> None:
+    """Scrape one URL with its provider's handler and write the bundle(s)."""
+    provider = detect_provider(url)
+    base_eid = event_id_from_url(url)
+    pace_archive.set_capture(url)
 
-    elif provider == "milesplit_live":
-        events = asyncio.run(
-            capture_milesplit_live(args.url, headful=args.headful)
-        )
-        for eid, (split_report, ind_res, logos) in events.items():
-            write_event_bundle(outdir, eid, split_report, ind_res, logos)
+    print(f"[meta] provider={provider} base_eid={base_eid} outdir={outdir}")
 
-    elif provider == "flashresults":
-        split_report, ind_res = capture_flashresults(args.url)
-        write_event_bundle(outdir, base_eid, split_report, ind_res, {})
+    event_dir = outdir / base_eid
+    validators: Optional[Dict[str, str]] = None
+    if refresh and provider in CONDITIONAL_PROVIDERS and not force:
+        meta = load_fetch_meta(event_dir)
+        prev = meta.get("validators", {}).get(url)
+        changed, validators, probed = probe_url(url, prev)
+        if not changed and (event_dir / "split_report.json").exists():
+            print(f"[refresh] not modified -> {event_dir}")
+            if validators != (prev or {}):
+                # Same body under a new ETag / Last-Modified: keep the next probe conditional
+                meta.setdefault("validators", {})[url] = validators
+                save_fetch_meta(event_dir, meta)
+            return
+        if probed is not None:
+            _PROBED[url] = probed
+    elif not force and not refresh and provider != "pttiming":
+        if is_cached(event_dir):
+            print(f"[meta] cache hit -> {event_dir}")
+            return
 
-    else:
+    handler = PROVIDER_HANDLERS.get(provider)
+    if handler is None:
         print("[warn] unknown provider; writing empty shell")
-        write_event_bundle(
-            outdir,
-            base_eid,
+        events = {base_eid: (
             {"_source": {"spr": []}, "_provider": "unknown"},
             {"_source": {"r": []}, "_provider": "unknown"},
-            {}
-        )
+            {},
+        )}
+    else:
+        pace_hosts.check(url)
+        started = time.time()
+        try:
+            with span("capture", provider=provider, event_id=base_eid) as rec:
+                events = _CAPTURES.run(fetch_target(url), lambda: handler(url, headful))
+                rec["events"] = len(events)
+        finally:
+            _PROBED.pop(url, None)
+        # Captures tolerate failed requests; if any host they used (page or API)
+        # broke meanwhile the bundle is likely partial, so leave the cache alone
+        # and defer instead
+        tripped = pace_hosts.tripped_since(started)
+        if tripped is not None:
+            raise tripped
+
+    write_events(outdir, events)
+
+    # Remember the source URL's validators once its bundle is safely on disk
+    if validators and base_eid in events:
+        meta = load_fetch_meta(event_dir)
+        meta.setdefault("validators", {})[url] = validators
+        save_fetch_meta(event_dir, meta)
+
+
+def scrape_urls(urls: List[str], outdir: pathlib.Path, headful: bool = False,
+                force: bool = False, refresh: bool = False) -> None:
+    """Scrape several URLs; TrackScoreboard SSR events of one meet share a browser page."""
+    ts_urls = [u for u in urls if detect_provider(u) == "trackscoreboard_html"]
+    if len(ts_urls) > 1:
+        todo = [
+            u for u in ts_urls
+            if force or refresh or not is_cached(outdir / event_id_from_url(u))
+        ]
+        print(f"[meta] trackscoreboard_html meet capture: {len(todo)}/{len(ts_urls)} event(s) to fetch")
+        if todo:
+            pace_archive.set_capture(" ".join(todo))
+            started = time.time()
+            with span("capture", provider="trackscoreboard_html", events=len(todo)):
+                events = asyncio.run(capture_trackscoreboard_html_meet(todo, headful))
+            tripped = pace_hosts.tripped_since(started)
+            if tripped is not None:
+                raise tripped
+            write_events(outdir, events)
+        urls = [u for u in urls if u not in ts_urls]
+
+    for url in urls:
+        scrape_url(url, outdir, headful, force, refresh)
+
+
+def main():
+    ap = argparse.ArgumentParser("PACE multi-provider race scraper (pre-normalization)")
+    ap.add_argument("--url", required=True, nargs="+",
+                    help="Race URL(s) (Xpress, Raspy, Leone, PT, MileSplit, etc.); "
+                         "several TrackScoreboard events of one meet share a single page")
+    ap.add_argument("--outdir", default="data", help="Root folder to store cached JSON bundles")
+    ap.add_argument("--headful", action="store_true", help="Visible browser (for local debugging)")
+    ap.add_argument("--force", action="store_true", help="Ignore cache if already present")
+    ap.add_argument("--refresh", action="store_true",
+                    help="Re-check cached events: conditional requests for HTTP providers, "
+                         "bundles rewritten only when upstream data changed")
+    ap.add_argument("--archive", help="Store raw responses in this archive directory (see pace_archive.py)")
+    ap.add_argument("--replay", action="store_true",
+                    help="Serve every fetch from --archive instead of the network")
+    args = ap.parse_args()
+
+    if args.replay and not args.archive:
+        ap.error("--replay needs --archive")
+    if args.archive:
+        pace_archive.enable(pathlib.Path(args.archive), replay=args.replay)
+
+    outdir = pathlib.Path(args.outdir)
+    ensure_dir(outdir)
+    try:
+        scrape_urls(args.url, outdir, args.headful, args.force, args.refresh)
+    except HostUnavailable as e:
+        print(f"[hosts] {e}")
+        pace_hosts.write_report(e)
+        sys.exit(pace_hosts.EXIT_HOST_UNAVAILABLE)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+pace_timing.py
+Per-event, per-stage timing spans written as JSON lines, plus a p50/p95 report.
+
+Spans are only recorded when PACE_TIMING_LOG points at a file; otherwise
+span() is a no-op. The variable is inherited by subprocesses, so scraper runs
+launched from pace_ingest_meet / pace_ingest log into the same file.
+
+Each line: {"ts", "stage", "dur_ms", "ok", "pid", "provider", "event_id", ...}
+
+Usage:
+  python pace_ingest_meet.py --url "..." --auto --timing-log data/timing.jsonl
+  python pace_timing.py data/timing.jsonl            # p50/p95 per provider + stage
+  python pace_timing.py data/timing.jsonl --by event # slowest events
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import pathlib
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+ENV_LOG = "PACE_TIMING_LOG"
+
+_write_lock = threading.Lock()
+
+
+def enable(path: pathlib.Path) -> None:
+    """Turn span logging on for this process and any subprocess it starts."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    os.environ[ENV_LOG] = str(path.resolve())
+
+
+def log_path() -> Optional[str]:
+    return os.environ.get(ENV_LOG) or None
+
+
+def record(rec: Dict[str, Any]) -> None:
+    path = log_path()
+    if not path:
+        return
+    line = json.dumps(rec, ensure_ascii=False, default=str) + "\n"
+    # One short O_APPEND write per span keeps lines intact across processes
+    with _write_lock, open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+@contextlib.contextmanager
+def span(stage: str, **fields: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block as one span. The yielded dict can be updated inside the block
+    (e.g. rec["ok"] = False, rec["rows"] = n). Exceptions mark the span failed
+    and propagate.
+    """
+    rec: Dict[str, Any] = {"stage": stage, "ok": True, **fields}
+    if not log_path():
+        yield rec
+        return
+    start = time.perf_counter()
+    try:
+        yield rec
+    except BaseException as e:
+        rec["ok"] = False
+        rec.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        rec["dur_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        rec["ts"] = time.time()
+        rec["pid"] = os.getpid()
+        record(rec)
+
+
+# ---------------- report ----------------
+
+def load_spans(path: pathlib.Path) -> List[Dict[str, Any]]:
+    spans = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            spans.append(json.loads(line))
+        except ValueError:
+            continue
+    return spans
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an unsorted list (q in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[k]
+
+
+def summarize(spans: List[Dict[str, Any]]) -> List[Tuple[str, str, Dict[str, float]]]:
+    """[(provider, stage, {n, fail, p50, p95, total_s})] sorted by total time."""
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for s in spans:
+        groups.setdefault((s.get("provider") or "-", s["stage"]), []).append(s)
+    rows = []
+    for (provider, stage), items in groups.items():
+        durs = [float(s.get("dur_ms", 0)) for s in items]
+        rows.append((provider, stage, {
+            "n": len(items),
+            "fail": sum(1 for s in items if not s.get("ok", True)),
+            "p50": percentile(durs, 50),
+            "p95": percentile(durs, 95),
+            "total_s": sum(durs) / 1000,
+        }))
+    rows.sort(key=lambda r: -r[2]["total_s"])
+    return rows
+
+
+def print_summary(spans: List[Dict[str, Any]]) -> None:
+    fmt = "{:<22} {:<22} {:>6} {:>5} {:>10} {:>10} {:>10}"
+    print(fmt.format("PROVIDER", "STAGE", "N", "FAIL", "P50_MS", "P95_MS", "TOTAL_S"))
+    print("-" * 91)
+    for provider, stage, st in summarize(spans):
+        print(fmt.format(provider[:22], stage[:22], st["n"], st["fail"],
+                         f"{st['p50']:.0f}", f"{st['p95']:.0f}", f"{st['total_s']:.1f}"))
+
+
+def print_by_event(spans: List[Dict[str, Any]], limit: int = 20) -> None:
+    totals: Dict[str, Dict[str, float]] = {}
+    for s in spans:
+        eid = s.get("event_id")
+        if not eid:
+            continue
+        per = totals.setdefault(eid, {})
+        per[s["stage"]] = per.get(s["stage"], 0.0) + float(s.get("dur_ms", 0))
+    ranked = sorted(totals.items(), key=lambda kv: -sum(kv[1].values()))[:limit]
+    for eid, stages in ranked:
+        parts = ", ".join(f"{k}={v / 1000:.1f}s" for k, v in sorted(stages.items(), key=lambda kv: -kv[1]))
+        print(f"{eid:>24}  {sum(stages.values()) / 1000:7.1f}s  {parts}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Summarize PACE timing spans")
+    ap.add_argument("log", help="JSON lines file written via PACE_TIMING_LOG")
+    ap.add_argument("--by", choices=["stage", "event"], default="stage",
+                    help="Group by provider+stage (default) or list slowest events")
+    args = ap.parse_args()
+
+    spans = load_spans(pathlib.Path(args.log))
+    print(f"{len(spans)} span(s) from {args.log}\n")
+    if args.by == "event":
+        print_by_event(spans)
+    else:
+        print_summary(spans)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,28 @@
 pace_upload.py
 Upload validated pace.v1 JSON into Supabase.
 Handles athlete deduplication and upserts.
+
+Teams and athletes are resolved in bulk: an EntityCache collects every
+distinct team and (athlete, team) of one or more events, looks them up with
+a few IN (...) selects, inserts the missing ones in one request per table,
+and keeps the ids for the rest of the run. pace_ingest_meet resolves a whole
+meet up front, so the per-event result writers only do cache lookups.
 """
 
 import json
 import os
 import pathlib
 import sys
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from dotenv import load_dotenv
 from supabase import create_client
 
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
+from pace_classify import normalize_distance
+from pace_timing import span
+
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL") or os.getenv("VITE_SUPABASE_URL")
@@ -30,47 +41,119 @@ ALLOWED_DISTANCES = frozenset([
     "5K", "8K", "10K", "DMR", "4xMile",
 ])
 
-DISTANCE_NORMALIZE_MAP = {
-    "800": "800m", "800M": "800m",
-    "1500": "1500m", "1500M": "1500m",
-    "mile": "Mile", "MILE": "Mile",
-    "3000": "3000m", "3000M": "3000m",
-    "5000": "5000m", "5,000": "5000m", "5000M": "5000m",
-    "10000": "10,000m", "10,000": "10,000m", "10000m": "10,000m", "10000M": "10,000m",
-    "5k": "5K",
-    "8k": "8K",
-    "10k": "10K",
-}
-
-
-def normalize_distance(distance: str) -> str:
-    """Normalize distance string to canonical form."""
-    return DISTANCE_NORMALIZE_MAP.get(distance, distance)
-
-
-def get_or_create_team(name: str) -> str:
-    """Return team UUID, creating if needed."""
-    result = sb.table("teams").select("id").eq("name", name).limit(1).execute()
-    if result.data:
-        return result.data[0]["id"]
-    insert = sb.table("teams").insert({"name": name}).execute()
-    return insert.data[0]["id"]
-
-
-def get_or_create_athlete(name: str, team_id: str) -> str:
-    """Return athlete UUID, deduplicating on (name, team_id)."""
-    result = (
-        sb.table("athletes")
-        .select("id")
-        .eq("name", name)
-        .eq("team_id", team_id)
-        .limit(1)
-        .execute()
-    )
-    if result.data:
-        return result.data[0]["id"]
-    insert = sb.table("athletes").insert({"name": name, "team_id": team_id}).execute()
-    return insert.data[0]["id"]
+# Values per IN (...) filter; keeps GET URLs well under proxy limits
+IN_CHUNK = 100
+
+# (athlete name, team name) exactly as uploaded; team is "" when unknown
+AthleteKey = Tuple[str, str]
+
+
+def in_scope(event_meta: Dict[str, str]) -> bool:
+    """Whether upload_event would write this event (its distance is one we track)."""
+    return normalize_distance(event_meta.get("distance", "")) in ALLOWED_DISTANCES
+
+
+def athlete_key(a: Dict[str, Any]) -> Optional[AthleteKey]:
+    """Cleaned (name, team) for a pace.v1 athlete, or None if it has no name."""
+    name = a.get("name", "").strip()
+    # Title-case ALL CAPS names
+    if name == name.upper() and len(name) > 1:
+        name = name.title()
+    if not name:
+        return None
+    return name, a.get("team", "").strip()
+
+
+def _chunks(values: List[Any], size: int = IN_CHUNK) -> Iterable[List[Any]]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+class EntityCache:
+    """
+    Team and athlete ids resolved so far in this run.
+
+    resolve() is serialized, so concurrent uploads of events that share new
+    teams or athletes never insert the same row twice.
+    """
+
+    def __init__(self) -> None:
+        self.teams: Dict[str, str] = {}
+        self.athletes: Dict[AthleteKey, str] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.teams.clear()
+            self.athletes.clear()
+
+    def resolve(self, events: Iterable[Dict[str, Any]]) -> Dict[AthleteKey, str]:
+        """Make sure every athlete of the given pace.v1 events has an id; returns {key: athlete_id}."""
+        keys = {k for data in events for k in map(athlete_key, data.get("athletes", [])) if k}
+        with self._lock:
+            teams = {team for _, team in keys if team and team not in self.teams}
+            missing = keys - self.athletes.keys()
+            if teams or missing:
+                with span("upload.resolve", teams=len(teams), athletes=len(missing)):
+                    self._resolve_teams(teams)
+                    self._resolve_athletes(missing)
+            return {k: self.athletes[k] for k in keys}
+
+    def _resolve_teams(self, names: Set[str]) -> None:
+        for chunk in _chunks(sorted(names)):
+            rows = sb.table("teams").select("id,name").in_("name", chunk).execute().data or []
+            self.teams.update((r["name"], r["id"]) for r in rows)
+        new = sorted(names - self.teams.keys())
+        if new:
+            rows = sb.table("teams").upsert([{"name": n} for n in new], on_conflict="name").execute().data
+            self.teams.update((r["name"], r["id"]) for r in rows)
+
+    def _resolve_athletes(self, keys: Set[AthleteKey]) -> None:
+        team_names = {tid: name for name, tid in self.teams.items()}
+        teamed = sorted(k for k in keys if k[1])
+        for chunk in _chunks(teamed):
+            # The name x team filter can over-match; only wanted pairs are kept
+            rows = (
+                sb.table("athletes")
+                .select("id,name,team_id")
+                .in_("name", sorted({name for name, _ in chunk}))
+                .in_("team_id", sorted({self.teams[team] for _, team in chunk}))
+                .execute()
+                .data
+            ) or []
+            for r in rows:
+                key = (r["name"], team_names.get(r["team_id"], ""))
+                if key in keys:
+                    self.athletes[key] = r["id"]
+        teamless = sorted(name for name, team in keys if not team)
+        for chunk in _chunks(teamless):
+            rows = (
+                sb.table("athletes").select("id,name").is_("team_id", "null").in_("name", chunk).execute().data
+            ) or []
+            for r in rows:
+                self.athletes.setdefault((r["name"], ""), r["id"])
+
+        new = sorted(keys - self.athletes.keys())
+        with_team = [{"name": name, "team_id": self.teams[team]} for name, team in new if team]
+        if with_team:
+            rows = sb.table("athletes").upsert(with_team, on_conflict="name,team_id").execute().data
+            for r in rows:
+                self.athletes[(r["name"], team_names[r["team_id"]])] = r["id"]
+        # NULL team_ids never conflict, so these are plain inserts
+        without_team = [{"name": name, "team_id": None} for name, team in new if not team]
+        if without_team:
+            rows = sb.table("athletes").insert(without_team).execute().data
+            for r in rows:
+                self.athletes[(r["name"], "")] = r["id"]
+
+
+# Ids resolved this run, shared by every upload in the process
+ENTITIES = EntityCache()
+
+
+def resolve_entities(events: Iterable[Dict[str, Any]]) -> Dict[AthleteKey, str]:
+    """Resolve all teams and athletes of several events (e.g. a whole meet) at once."""
+    return ENTITIES.resolve(events)
 
 
 def upload_event(data: Dict[str, Any], event_meta: Optional[Dict[str, str]] = None) -> None:
@@ -100,25 +183,24 @@ def upload_event(data: Dict[str, Any], event_meta: Optional[Dict[str, str]] = No
         "source_url": meta.get("source_url") or None,
     }
 
-    result = (
-        sb.table("events")
-        .upsert(event_row, on_conflict="source_id")
-        .execute()
-    )
+    tags = {"provider": ev.get("provider"), "event_id": source_id}
+    with span("upload.event_row", **tags):
+        result = (
+            sb.table("events")
+            .upsert(event_row, on_conflict="source_id")
+            .execute()
+        )
     event_id = result.data[0]["id"]
     print(f"[upload] event {source_id} -> {event_id}")
 
+    # Cache hits only if the meet was resolved up front
+    athlete_ids = ENTITIES.resolve([data])
+
     for a in athletes:
-        name = a.get("name", "").strip()
-        # Title-case ALL CAPS names
-        if name == name.upper() and len(name) > 1:
-            name = name.title()
-        team_name = a.get("team", "").strip()
-        if not name:
+        key = athlete_key(a)
+        if key is None:
             continue
-
-        team_id = get_or_create_team(team_name) if team_name else None
-        athlete_id = get_or_create_athlete(name, team_id)
+        athlete_id = athlete_ids[key]
 
         # Upsert result
         result_row = {
@@ -128,15 +210,17 @@ def upload_event(data: Dict[str, Any], event_meta: Optional[Dict[str, str]] = No
             "time_s": a.get("time_s"),
             "time_str": a.get("time_str"),
         }
-        res = (
-            sb.table("results")
-            .upsert(result_row, on_conflict="event_id,athlete_id")
-            .execute()
-        )
+        with span("upload.result", **tags):
+            res = (
+                sb.table("results")
+                .upsert(result_row, on_conflict="event_id,athlete_id")
+                .execute()
+            )
         result_id = res.data[0]["id"]
 
         # Delete existing splits for this result (full replace)
-        sb.table("splits").delete().eq("result_id", result_id).execute()
+        with span("upload.splits_delete", **tags):
+            sb.table("splits").delete().eq("result_id", result_id).execute()
 
         # Insert splits
         splits_rows = []
@@ -152,7 +236,8 @@ def upload_event(data: Dict[str, Any], event_meta: Optional[Dict[str, str]] = No
             })
 
         if splits_rows:
-            sb.table("splits").insert(splits_rows).execute()
+            with span("upload.splits_insert", rows=len(splits_rows), **tags):
+                sb.table("splits").insert(splits_rows).execute()
 
     print(f"[upload] {len(athletes)} athletes uploaded for event {source_id}")
 
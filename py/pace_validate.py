@@ -3,12 +3,19 @@
 pace_validate.py
 Validate pace.v1 JSON before uploading to Supabase.
 Blocks upload on any critical error. Outputs clear report.
+
+Usage:
+  python pace_validate.py data/2149044/pace_normalized.json [...]
+  python pace_validate.py --root data            # every */pace_normalized.json
+  python pace_validate.py --root data --json     # machine-readable report
 """
 
+import argparse
 import json
+import math
 import pathlib
 import sys
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 # Plausible time bounds per distance (seconds): (min, max)
 DISTANCE_BOUNDS: Dict[str, Tuple[float, float]] = {
@@ -30,6 +37,18 @@ DISTANCE_BOUNDS: Dict[str, Tuple[float, float]] = {
 # World-record-ish minimum lap pace per km (seconds)
 MIN_LAP_PACE_PER_KM = 145  # ~2:25/km, faster than any human
 
+# Absolute lap floor: 10s covers sprint splits like 200m ~21s
+MIN_LAP_S = 10.0
+
+# Lowercased bounds keys in DISTANCE_BOUNDS order; first substring match wins
+_BOUNDS_LOWER: List[Tuple[str, Tuple[float, float]]] = [
+    (k.lower(), b) for k, b in DISTANCE_BOUNDS.items()
+]
+_BOUNDS_CACHE: Dict[str, Optional[Tuple[float, float]]] = {}
+
+# Split position for per-athlete checks reported after all split checks
+AFTER_LAST_SPLIT = 1 << 30
+
 
 class ValidationError:
     def __init__(self, athlete: str, team: str, message: str, severity: str = "BLOCK"):
@@ -41,113 +60,165 @@ class ValidationError:
     def __str__(self):
         return f"  [{self.severity}] {self.athlete} ({self.team}): {self.message}"
 
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "severity": self.severity,
+            "athlete": self.athlete,
+            "team": self.team,
+            "message": self.message,
+        }
+
+
+def distance_bounds(distance: str) -> Optional[Tuple[float, float]]:
+    """Resolve DISTANCE_BOUNDS for an event distance or name (memoized per string)."""
+    key = distance.lower()
+    if key not in _BOUNDS_CACHE:
+        _BOUNDS_CACHE[key] = next((b for k, b in _BOUNDS_LOWER if k in key), None)
+    return _BOUNDS_CACHE[key]
+
+
+def _num(value: Optional[float]) -> float:
+    """Column value for an optional number: NaN when missing (NaN never compares true)."""
+    return math.nan if value is None else float(value)
+
+
+def validate_batch(events: Sequence[Dict[str, Any]]) -> List[List[ValidationError]]:
+    """Validate many pace.v1 events at once; returns one error list per event.
+
+    Athletes and splits of every event are flattened into parallel columns and
+    each check runs as a single pass over those columns. Errors are then
+    ordered per event exactly as a per-athlete walk would report them.
+    """
+    # (event, athlete, split position, check rank) -> error
+    tagged: List[Tuple[Tuple[int, int, int, int], ValidationError]] = []
+
+    # Athlete columns
+    a_ev: List[int] = []
+    a_name: List[str] = []
+    a_team: List[str] = []
+    a_time: List[float] = []
+    a_nsplits: List[int] = []
+    ev_lo: List[float] = []
+    ev_hi: List[float] = []
+    ev_distance: List[str] = []
+    ev_median: List[int] = []
+
+    # Split columns (only for athletes with a name)
+    s_ath: List[int] = []
+    s_pos: List[int] = []
+    s_elapsed: List[float] = []
+    s_lap: List[float] = []
+    s_label: List[str] = []
+
+    for ei, data in enumerate(events):
+        distance = ""
+        if data.get("schema") != "pace.v1":
+            tagged.append(((ei, -1, 0, 0), ValidationError(
+                "", "", f"Invalid schema: {data.get('schema')}", "BLOCK")))
+            athletes: List[Dict[str, Any]] = []
+        else:
+            event = data.get("event", {})
+            athletes = data.get("athletes", [])
+            distance = event.get("distance") or event.get("name") or ""
+            if not athletes:
+                tagged.append(((ei, -1, 0, 0), ValidationError("", "", "No athletes in data", "BLOCK")))
+        ev_distance.append(distance)
+        lo, hi = (distance_bounds(distance) if distance else None) or (math.nan, math.nan)
+        ev_lo.append(lo)
+        ev_hi.append(hi)
+
+        counts = sorted(len(a.get("splits", [])) for a in athletes if a.get("splits"))
+        ev_median.append(counts[len(counts) // 2] if counts else 0)
+
+        for a in athletes:
+            ai = len(a_ev)
+            name = (a.get("name") or "").strip()
+            splits = a.get("splits", [])
+            a_ev.append(ei)
+            a_name.append(name)
+            a_team.append((a.get("team") or "").strip())
+            a_time.append(_num(a.get("time_s")))
+            a_nsplits.append(len(splits))
+            if not name:
+                continue
+            for i, sp in enumerate(splits):
+                s_ath.append(ai)
+                s_pos.append(i)
+                s_elapsed.append(_num(sp.get("elapsed_s")))
+                s_lap.append(_num(sp.get("lap_s")))
+                s_label.append(sp.get("label", f"S{i+1}"))
+
+    named = [bool(n) for n in a_name]
+
+    # Name quality
+    for ai in (i for i, ok in enumerate(named) if not ok):
+        tagged.append(((a_ev[ai], ai, -1, 0), ValidationError(
+            "???", a_team[ai], "Empty athlete name", "BLOCK")))
+    for ai in (i for i, n in enumerate(a_name) if n and n.isdigit()):
+        tagged.append(((a_ev[ai], ai, -1, 1), ValidationError(
+            a_name[ai], a_team[ai], f"Name is just a number: '{a_name[ai]}'", "BLOCK")))
+
+    # Duplicates within an event: every occurrence after the first
+    first_seen: Dict[Tuple[int, str, str], int] = {}
+    for ai in (i for i, ok in enumerate(named) if ok):
+        key = (a_ev[ai], a_name[ai].lower(), a_team[ai].lower())
+        if first_seen.setdefault(key, ai) != ai:
+            tagged.append(((a_ev[ai], ai, -1, 2), ValidationError(
+                a_name[ai], a_team[ai], "Duplicate athlete in event", "BLOCK")))
+
+    # Finish-time bounds
+    for ai in (i for i, ok in enumerate(named)
+               if ok and not math.isnan(a_time[i]) and not math.isnan(ev_lo[a_ev[i]])):
+        lo, hi = ev_lo[a_ev[ai]], ev_hi[a_ev[ai]]
+        t = a_time[ai]
+        dist = ev_distance[a_ev[ai]]
+        if t < lo:
+            tagged.append(((a_ev[ai], ai, -1, 3), ValidationError(
+                a_name[ai], a_team[ai], f"Finish time {t:.1f}s below minimum {lo:.0f}s for {dist}", "BLOCK")))
+        if t > hi:
+            tagged.append(((a_ev[ai], ai, -1, 4), ValidationError(
+                a_name[ai], a_team[ai], f"Finish time {t:.1f}s above maximum {hi:.0f}s for {dist}", "BLOCK")))
+
+    # Monotonic elapsed: compare each timed split with the athlete's previous timed split
+    timed = [j for j, e in enumerate(s_elapsed) if not math.isnan(e)]
+    for prev_j, j in zip(timed, timed[1:]):
+        ai = s_ath[j]
+        prev, cur = s_elapsed[prev_j], s_elapsed[j]
+        if s_ath[prev_j] == ai and prev > 0 and cur <= prev:
+            tagged.append(((a_ev[ai], ai, s_pos[j], 0), ValidationError(
+                a_name[ai], a_team[ai],
+                f"Non-monotonic elapsed at {s_label[j]}: {cur:.1f}s <= {prev:.1f}s", "BLOCK")))
+
+    # Lap floor: negative and impossibly fast laps
+    for j in (j for j, lap in enumerate(s_lap) if not math.isnan(lap) and lap < MIN_LAP_S):
+        ai, lap = s_ath[j], s_lap[j]
+        if lap < 0:
+            tagged.append(((a_ev[ai], ai, s_pos[j], 1), ValidationError(
+                a_name[ai], a_team[ai], f"Negative lap at {s_label[j]}: {lap:.1f}s", "BLOCK")))
+        tagged.append(((a_ev[ai], ai, s_pos[j], 2), ValidationError(
+            a_name[ai], a_team[ai], f"Impossibly fast lap at {s_label[j]}: {lap:.1f}s", "BLOCK")))
+
+    # Split completeness vs. the event's median split count
+    for ai in (i for i, ok in enumerate(named)
+               if ok and ev_median[a_ev[i]] > 0 and a_nsplits[i] < ev_median[a_ev[i]] * 0.5):
+        tagged.append(((a_ev[ai], ai, AFTER_LAST_SPLIT, 0), ValidationError(
+            a_name[ai], a_team[ai],
+            f"Missing splits: {a_nsplits[ai]} of {ev_median[a_ev[ai]]} expected", "WARN")))
+
+    tagged.sort(key=lambda t: t[0])
+    out: List[List[ValidationError]] = [[] for _ in events]
+    for (ei, _, _, _), err in tagged:
+        out[ei].append(err)
+    return out
+
 
 def validate_pace_v1(data: Dict[str, Any]) -> List[ValidationError]:
-    errors: List[ValidationError] = []
+    return validate_batch([data])[0]
 
-    # Schema check
-    if data.get("schema") != "pace.v1":
-        errors.append(ValidationError("", "", f"Invalid schema: {data.get('schema')}", "BLOCK"))
-        return errors
 
-    event = data.get("event", {})
-    athletes = data.get("athletes", [])
-
-    if not athletes:
-        errors.append(ValidationError("", "", "No athletes in data", "BLOCK"))
-        return errors
-
-    distance = event.get("distance") or event.get("name") or ""
-
-    # Infer distance bounds
-    bounds = None
-    for key, b in DISTANCE_BOUNDS.items():
-        if key.lower() in distance.lower():
-            bounds = b
-            break
-
-    # Count splits per athlete for completeness check
-    split_counts = [len(a.get("splits", [])) for a in athletes if a.get("splits")]
-    median_splits = sorted(split_counts)[len(split_counts) // 2] if split_counts else 0
-
-    seen_keys: set = set()
-
-    for a in athletes:
-        name = a.get("name", "").strip()
-        team = a.get("team", "").strip()
-        time_s = a.get("time_s")
-        splits = a.get("splits", [])
-
-        # Name quality
-        if not name:
-            errors.append(ValidationError(name or "???", team, "Empty athlete name", "BLOCK"))
-            continue
-
-        if name.isdigit():
-            errors.append(ValidationError(name, team, f"Name is just a number: '{name}'", "BLOCK"))
-
-        # Duplicate check
-        key = (name.lower(), team.lower())
-        if key in seen_keys:
-            errors.append(ValidationError(name, team, "Duplicate athlete in event", "BLOCK"))
-        seen_keys.add(key)
-
-        # Time bounds
-        if time_s is not None and bounds:
-            if time_s < bounds[0]:
-                errors.append(ValidationError(name, team, f"Finish time {time_s:.1f}s below minimum {bounds[0]:.0f}s for {distance}", "BLOCK"))
-            if time_s > bounds[1]:
-                errors.append(ValidationError(name, team, f"Finish time {time_s:.1f}s above maximum {bounds[1]:.0f}s for {distance}", "BLOCK"))
-
-        # Split validation
-        prev_elapsed = 0.0
-        for i, sp in enumerate(splits):
-            elapsed = sp.get("elapsed_s")
-            lap = sp.get("lap_s")
-            label = sp.get("label", f"S{i+1}")
-
-            if elapsed is not None:
-                # Monotonic check
-                if elapsed <= prev_elapsed and prev_elapsed > 0:
-                    errors.append(ValidationError(
-                        name, team,
-                        f"Non-monotonic elapsed at {label}: {elapsed:.1f}s <= {prev_elapsed:.1f}s",
-                        "BLOCK"
-                    ))
-                prev_elapsed = elapsed
-
-            if lap is not None:
-                # Negative lap
-                if lap < 0:
-                    errors.append(ValidationError(name, team, f"Negative lap at {label}: {lap:.1f}s", "BLOCK"))
-
-                # Impossibly fast lap (absolute minimum: 10s covers sprint splits like 200m ~21s)
-                if lap < 10.0:
-                    errors.append(ValidationError(
-                        name, team,
-                        f"Impossibly fast lap at {label}: {lap:.1f}s",
-                        "BLOCK"
-                    ))
-
-        # Split completeness
-        if median_splits > 0 and len(splits) < median_splits * 0.5:
-            errors.append(ValidationError(
-                name, team,
-                f"Missing splits: {len(splits)} of {median_splits} expected",
-                "WARN"
-            ))
-
-    return errors
-
-
-def validate_file(path: pathlib.Path) -> Tuple[bool, str]:
-    """Validate a pace.v1 JSON file. Returns (passed, report)."""
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except Exception as e:
-        return False, f"Failed to read/parse {path}: {e}"
-
-    errors = validate_pace_v1(data)
+def format_report(data: Dict[str, Any], errors: List[ValidationError],
+                  path: pathlib.Path) -> Tuple[bool, str]:
+    """Render the human-readable report for one validated event. Returns (passed, report)."""
     event = data.get("event", {})
     athletes = data.get("athletes", [])
 
@@ -182,16 +253,93 @@ def validate_file(path: pathlib.Path) -> Tuple[bool, str]:
     return True, "\n".join(lines)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python pace_validate.py <path_to_pace_normalized.json> [...]")
+def validate_file(path: pathlib.Path) -> Tuple[bool, str]:
+    """Validate a pace.v1 JSON file. Returns (passed, report)."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as e:
+        return False, f"Failed to read/parse {path}: {e}"
+
+    return format_report(data, validate_pace_v1(data), path)
+
+
+def batch_report(events: Sequence[Dict[str, Any]], sources: Sequence[str],
+                 errors: Sequence[List[ValidationError]]) -> Dict[str, Any]:
+    """Build a machine-readable report for a validated batch."""
+    rows = []
+    for data, source, errs in zip(events, sources, errors):
+        event = data.get("event", {}) if isinstance(data, dict) else {}
+        blocks = [e.to_dict() for e in errs if e.severity == "BLOCK"]
+        warns = [e.to_dict() for e in errs if e.severity == "WARN"]
+        rows.append({
+            "source": source,
+            "event_id": event.get("id"),
+            "provider": event.get("provider", "unknown"),
+            "athletes": len(data.get("athletes", [])) if isinstance(data, dict) else 0,
+            "passed": not blocks,
+            "blocks": blocks,
+            "warnings": warns,
+        })
+    return {
+        "summary": {
+            "events": len(rows),
+            "passed": sum(1 for r in rows if r["passed"]),
+            "failed": sum(1 for r in rows if not r["passed"]),
+            "blocks": sum(len(r["blocks"]) for r in rows),
+            "warnings": sum(len(r["warnings"]) for r in rows),
+        },
+        "events": rows,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Validate pace.v1 JSON files")
+    ap.add_argument("files", nargs="*", help="Paths to pace_normalized.json")
+    ap.add_argument("--root", help="Validate every <root>/*/pace_normalized.json")
+    ap.add_argument("--json", dest="as_json", action="store_true", help="Print a machine-readable report")
+    args = ap.parse_args()
+
+    paths = [pathlib.Path(f) for f in args.files]
+    if args.root:
+        paths += sorted(pathlib.Path(args.root).glob("*/pace_normalized.json"))
+    if not paths:
+        ap.print_usage()
         sys.exit(1)
 
-    all_passed = True
-    for fpath in sys.argv[1:]:
-        passed, report = validate_file(pathlib.Path(fpath))
-        print(report)
-        if not passed:
-            all_passed = False
+    events: List[Dict[str, Any]] = []
+    sources: List[pathlib.Path] = []
+    unreadable: List[Tuple[pathlib.Path, str]] = []
+    for path in paths:
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except Exception as e:
+            unreadable.append((path, str(e)))
+            continue
+        if not isinstance(data, dict):
+            unreadable.append((path, "top-level JSON is not an object"))
+            continue
+        events.append(data)
+        sources.append(path)
+
+    errors = validate_batch(events)
+
+    if args.as_json:
+        report = batch_report(events, [str(p) for p in sources], errors)
+        report["unreadable"] = [{"source": str(p), "error": msg} for p, msg in unreadable]
+        print(json.dumps(report, indent=2))
+        all_passed = report["summary"]["failed"] == 0 and not unreadable
+    else:
+        all_passed = not unreadable
+        for path, msg in unreadable:
+            print(f"Failed to read/parse {path}: {msg}")
+        for data, path, errs in zip(events, sources, errors):
+            passed, report = format_report(data, errs, path)
+            print(report)
+            if not passed:
+                all_passed = False
 
     sys.exit(0 if all_passed else 1)
+
+
+if __name__ == "__main__":
+    main()
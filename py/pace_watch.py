@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+pace_watch.py
+Live-meet polling: re-check a meet on a schedule and push only newly finished
+or changed distance events through normalize -> validate -> upload.
+
+pttiming meets are polled through the shallow Firebase index: only events whose
+status moved (e.g. InProgress -> Complete -> Official) get their entry data
+fetched. Other providers are re-discovered each cycle; an event is re-scraped
+when it is new, its status badge changed, it has no status badge at all (so a
+race in progress keeps being refreshed), or its provider supports cheap
+conditional requests. Finished events are also re-captured every --recheck
+seconds so results corrected after "Official" are picked up. Uploads happen
+only when the bundle digest differs from the one last pushed.
+
+State lives in <data-root>/_watch/<meet>.json so a restarted watcher resumes
+without re-uploading finished events.
+
+Usage:
+  python pace_watch.py --url "https://live.pttiming.com/?mid=8123" \\
+      --meet-name "2026 Big East Indoor" --date 2026-02-27 --season indoor
+  python pace_watch.py --url "https://live.xpresstiming.com/meets/60861" --interval 300
+  python pace_watch.py --url "..." --once     # single poll, e.g. from cron
+"""
+
+import argparse
+import datetime as dt
+import json
+import pathlib
+import re
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+PY_DIR = pathlib.Path(__file__).parent
+sys.path.insert(0, str(PY_DIR))
+
+import pace_hosts
+from pace_discover import classify_event, discover_meet
+from pace_hosts import HostUnavailable
+from pace_ingest_meet import build_event_meta, find_event_dir, process_event_dir, scrape_stage, start_run
+from pace_providers import classify_url
+from pace_scraper import (
+    CONDITIONAL_PROVIDERS,
+    PT_DONE_STATUSES,
+    capture_pttiming,
+    load_fetch_meta,
+    pttiming_meet_index,
+    pttiming_selected_events,
+    write_event_bundle,
+)
+
+DEFAULT_INTERVAL_S = 120
+DEFAULT_RECHECK_S = 900  # finished events are re-captured this often
+
+# Status badges that mean results are final enough to publish
+DONE_STATUSES = tuple(s.lower() for s in PT_DONE_STATUSES)
+
+
+# ---------------- state ----------------
+
+def state_path(data_root: pathlib.Path, url: str) -> pathlib.Path:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", url.split("://", 1)[-1]).strip("_")
+    return data_root / "_watch" / f"{slug[:120]}.json"
+
+
+def load_state(path: pathlib.Path) -> Dict[str, Any]:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(state, dict) and isinstance(state.get("events"), dict):
+            return state
+    except Exception:
+        pass
+    return {"events": {}}
+
+
+def save_state(path: pathlib.Path, state: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def record_push(state: Dict[str, Any], key: str, status: str, digest: str) -> None:
+    state["events"][key] = {
+        "status": status,
+        "digest": digest,
+        "pushed_at": dt.datetime.now().isoformat(timespec="seconds"),
+        "checked_at": time.time(),
+    }
+
+
+def due_for_recheck(state: Dict[str, Any], key: str, recheck_s: float) -> bool:
+    """Whether a pushed event was last captured at least recheck_s ago."""
+    prev = state["events"].get(key) or {}
+    return time.time() - float(prev.get("checked_at", 0)) >= recheck_s
+
+
+def push_if_changed(state: Dict[str, Any], key: str, status: str,
+                    event_dir: pathlib.Path, event_meta: dict) -> Optional[bool]:
+    """
+    Run normalize -> validate -> upload when the event's bundle differs from the
+    last pushed one. Returns True/False for a push attempt, None if unchanged.
+    """
+    digest = load_fetch_meta(event_dir).get("bundle_sha256", "")
+    prev = state["events"].get(key)
+    if prev and digest and prev.get("digest") == digest:
+        prev["status"] = status
+        prev["checked_at"] = time.time()
+        return None
+    ok = process_event_dir(event_dir, event_meta)
+    if ok:
+        record_push(state, key, status, digest)
+    return ok
+
+
+# ---------------- pttiming ----------------
+
+def poll_pttiming(url: str, data_root: pathlib.Path, state: Dict[str, Any],
+                  extra_meta: dict, recheck_s: float = DEFAULT_RECHECK_S) -> List[bool]:
+    index = pttiming_meet_index(url)
+    if index.get("note"):
+        print(f"[watch] pttiming index unavailable: {index['note']}")
+        return []
+
+    done = pttiming_selected_events(index)
+    changed = [
+        enr for enr in done
+        if state["events"].get(enr, {}).get("status") != index["events"][enr]["S"]
+    ]
+    # The status stays "Official" when results are corrected, so re-read those now and then
+    recheck = [enr for enr in done if enr not in changed and due_for_recheck(state, enr, recheck_s)]
+    print(f"[watch] {len(done)} finished distance event(s), {len(changed)} new/changed, "
+          f"{len(recheck)} due for recheck")
+    changed += recheck
+    if not changed:
+        return []
+
+    results: List[bool] = []
+    for eid, (split_report, ind_res, logos) in capture_pttiming(url, False, enrs=changed).items():
+        enr = split_report.get("_enr")
+        if enr is None:
+            continue
+        write_event_bundle(data_root, eid, split_report, ind_res, logos)
+        name = str(index["events"][enr]["N"])
+        event = {"id": eid, "name": name, "href": url, **classify_event(name)}
+        ok = push_if_changed(state, enr, index["events"][enr]["S"], data_root / eid,
+                             build_event_meta(event, extra_meta))
+        if ok is not None:
+            results.append(ok)
+    return results
+
+
+# ---------------- discovery-based providers ----------------
+
+def needs_check(event: dict, state: Dict[str, Any], recheck_s: float = DEFAULT_RECHECK_S) -> bool:
+    """
+    New events, status changes, badge-less events (their progress is only
+    visible in the bundle) and cheap-to-probe providers are re-checked every
+    poll; other finished events every recheck_s.
+    """
+    prev = state["events"].get(event["id"])
+    if prev is None:
+        return True
+    if prev.get("status") != event.get("status", ""):
+        return True
+    if not event.get("status"):
+        return True
+    if classify_url(event["href"]) in CONDITIONAL_PROVIDERS:
+        return True
+    return due_for_recheck(state, event["id"], recheck_s)
+
+
+def poll_discovered(url: str, data_root: pathlib.Path, state: Dict[str, Any],
+                    extra_meta: dict, recheck_s: float = DEFAULT_RECHECK_S) -> List[bool]:
+    # TTL 0: every poll revalidates, but an unchanged event-list probe skips the browser
+    events = [
+        e for e in discover_meet(url, data_root / "_discover", max_age_s=0)
+        if e["category"] == "distance"
+    ]
+    # Events that show a status badge are only scraped once it reads as finished
+    ready = [
+        e for e in events
+        if not e.get("status") or e["status"].lower() in DONE_STATUSES
+    ]
+    todo = [e for e in ready if needs_check(e, state, recheck_s)]
+    print(f"[watch] {len(events)} distance event(s), {len(ready)} ready, {len(todo)} to check")
+
+    results: List[bool] = []
+    for event in todo:
+        status = event.get("status", "")
+        try:
+            scraped = scrape_stage(event["href"], data_root, refresh=True)
+        except HostUnavailable as e:
+            # Not checked_at: the event is picked up again on a later poll
+            print(f"[watch] {e}; {event['id']} deferred")
+            continue
+        if not scraped:
+            print(f"[FAIL] Scraping failed for {event['href']}")
+            results.append(False)
+            continue
+        event_dir = find_event_dir(data_root, event)
+        if event_dir is None:
+            print(f"[FAIL] No scraped bundle found for event {event['id']}")
+            results.append(False)
+            continue
+        ok = push_if_changed(state, event["id"], status, event_dir,
+                             build_event_meta(event, extra_meta))
+        if ok is not None:
+            results.append(ok)
+    return results
+
+
+# ---------------- main loop ----------------
+
+def poll_once(url: str, data_root: pathlib.Path, state_file: pathlib.Path,
+              extra_meta: dict, recheck_s: float = DEFAULT_RECHECK_S) -> List[bool]:
+    state = load_state(state_file)
+    # Each poll is a new run: scrapes and ids from the previous poll must not be reused
+    start_run()
+    try:
+        if classify_url(url) == "pttiming":
+            return poll_pttiming(url, data_root, state, extra_meta, recheck_s)
+        return poll_discovered(url, data_root, state, extra_meta, recheck_s)
+    finally:
+        save_state(state_file, state)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Poll a live meet and ingest newly finished events")
+    ap.add_argument("--url", required=True, help="Meet URL")
+    ap.add_argument("--interval", type=int, default=DEFAULT_INTERVAL_S,
+                    help=f"Seconds between polls (default {DEFAULT_INTERVAL_S})")
+    ap.add_argument("--recheck", type=int, default=DEFAULT_RECHECK_S,
+                    help=f"Seconds between re-captures of finished events (default {DEFAULT_RECHECK_S})")
+    ap.add_argument("--once", action="store_true", help="Poll once and exit")
+    ap.add_argument("--meet-name", default="", help="Meet name prefix for event names")
+    ap.add_argument("--date", default="", help="Event date (YYYY-MM-DD)")
+    ap.add_argument("--season", default="indoor", choices=["indoor", "outdoor", "xc"], help="Season")
+    ap.add_argument("--location", default="", help="Meet location")
+    ap.add_argument("--data-root", default="data", help="Root data directory")
+    args = ap.parse_args()
+
+    extra_meta = {
+        "meet_name": args.meet_name,
+        "date": args.date,
+        "season": args.season,
+        "location": args.location,
+    }
+    data_root = pathlib.Path(args.data_root)
+    data_root.mkdir(parents=True, exist_ok=True)
+    pace_hosts.enable_default(data_root)
+    state_file = state_path(data_root, args.url)
+    print(f"[watch] {args.url} (state: {state_file})")
+
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                results = poll_once(args.url, data_root, state_file, extra_meta, args.recheck)
+            except Exception as e:
+                print(f"[watch] poll error: {type(e).__name__}: {e}")
+                results = []
+            stamp = dt.datetime.now().strftime("%H:%M:%S")
+            print(f"[watch] {stamp} pushed {sum(results)}/{len(results)} event(s)")
+            if args.once:
+                sys.exit(1 if not all(results) else 0)
+            time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        print("\n[watch] stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,15 @@
 # D1 Indoor Conference Championships 2026 — Batch Ingest
 # Usage: cd pace/ && bash scripts/ingest_d1_indoor_2026.sh
 #
-# Runs each conference sequentially. Scraper caches are automatic —
-# re-running skips already-scraped events.
+# Enqueues each conference into the persistent job queue (py/data/pace_jobs.sqlite),
+# then drains it with a worker pool. Interrupted or partially failed runs resume
+# where they stopped: re-run the script (enqueueing is idempotent), or use
+#   python3 py/pace_jobs.py --db py/data/pace_jobs.sqlite status|retry-failed
+#
+# The same meets are listed in docs/meets/2026_indoor.csv; to plan them in one
+# concurrent pass instead:
+#   python3 py/pace_catalogue.py --catalogue docs/meets/2026_indoor.csv --division D1 \
+#       --data-root py/data --enqueue --db py/data/pace_jobs.sqlite
 #
 # Provider support (all splits now working except MAC/Big South):
 #   21 conferences: full pipeline (legacy_spa, trackscoreboard_html, flashresults)
@@ -15,15 +22,12 @@
 cd "$(dirname "$0")/.."
 
 PYTHON=/usr/bin/python3
-INGEST="$PYTHON py/pace_ingest_meet.py --auto --season indoor --data-root py/data"
-FAILURES=0
+JOBS="$PYTHON py/pace_jobs.py --db py/data/pace_jobs.sqlite"
+WORKERS=${WORKERS:-4}
 
-# Wrapper: continues on failure, tracks count
+# Wrapper: queue one conference (discover job); no-op if already queued
 ingest() {
-  if ! $INGEST "$@"; then
-    echo "  ^^^ FAILED ^^^"
-    FAILURES=$((FAILURES + 1))
-  fi
+  $JOBS add --season indoor "$@"
 }
 
 echo "=== D1 Indoor 2026 Ingestion ==="
@@ -153,10 +157,14 @@ ingest --url "https://www.milesplit.live/meets/731447/events" \
 # Find the correct /meets/{id}/events URL and add it here.
 
 echo ""
-echo "=== Done! ($FAILURES failures) ==="
-echo ""
-if [ "$FAILURES" -gt 0 ]; then
-  echo "Re-run the script to retry failed conferences (cache makes completed ones instant)."
+echo "=== Running queue ($WORKERS workers) ==="
+if $JOBS run --workers "$WORKERS" --data-root py/data; then
+  echo ""
+  echo "=== Done! (no failed jobs) ==="
+else
+  echo ""
+  echo "=== Done with failed jobs (see status above) ==="
+  echo "Run '$JOBS retry-failed' then re-run the script to retry them."
 fi
 echo ""
 echo "NOT INGESTED (need URL research):"